@@ -3,6 +3,7 @@ import os
 
 from qibo.backends.abstract import Backend
 from qibo.backends.matrices import Matrices
+from qibo.backends.memmap import MemmapBackend
 from qibo.backends.numpy import NumpyBackend
 from qibo.backends.tensorflow import TensorflowBackend
 from qibo.config import log, raise_error
@@ -30,6 +31,9 @@ def construct_backend(backend, platform=None, runcard=None):
     elif backend == "numpy":
         return NumpyBackend()
 
+    elif backend == "memmap":
+        return MemmapBackend()
+
     elif backend == "qibolab":  # pragma: no cover
         from qibolab.backends import QibolabBackend  # pylint: disable=E0401
 
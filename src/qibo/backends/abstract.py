@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 import abc
 
+import numpy as np
+
 from qibo.config import raise_error
 
 
@@ -121,13 +123,25 @@ class Backend(abc.ABC):
         raise_error(NotImplementedError)
 
     @abc.abstractmethod
-    def apply_gate(self, gate, state, nqubits):  # pragma: no cover
-        """Apply a gate to state vector."""
+    def apply_gate(self, gate, state, nqubits, inplace=False):  # pragma: no cover
+        """Apply a gate to state vector.
+
+        ``state`` is overwritten only if ``inplace`` is ``True``.
+        """
         raise_error(NotImplementedError)
 
+    def apply_gate_batched(self, gate, state, nqubits, matrix=None):  # pragma: no cover
+        """Apply a gate to a batch of state vectors."""
+        raise_error(NotImplementedError, f"{self} does not support batched execution.")
+
     @abc.abstractmethod
-    def apply_gate_density_matrix(self, gate, state, nqubits):  # pragma: no cover
-        """Apply a gate to density matrix."""
+    def apply_gate_density_matrix(
+        self, gate, state, nqubits, inplace=False
+    ):  # pragma: no cover
+        """Apply a gate to density matrix.
+
+        ``state`` is overwritten only if ``inplace`` is ``True``.
+        """
         raise_error(NotImplementedError)
 
     @abc.abstractmethod
@@ -187,6 +201,12 @@ class Backend(abc.ABC):
         """
         raise_error(NotImplementedError)
 
+    def execute_circuit_batched(
+        self, circuit, initial_states=None, parameters=None, nshots=None
+    ):  # pragma: no cover
+        """Execute a :class:`qibo.models.circuit.Circuit` on a batch of states or parameters."""
+        raise_error(NotImplementedError, f"{self} does not support batched execution.")
+
     @abc.abstractmethod
     def execute_distributed_circuit(
         self, circuit, initial_state=None, nshots=None
@@ -225,6 +245,23 @@ class Backend(abc.ABC):
         """
         raise_error(NotImplementedError)
 
+    def calculate_marginal_probabilities(self, probabilities, qubits, marginal_qubits):
+        """Calculates the marginal of a probability distribution over qubits.
+
+        Args:
+            probabilities: Probabilities of the outcomes of ``qubits``, with
+                the first qubit of ``qubits`` being the most significant.
+            qubits (tuple): Qubits that ``probabilities`` refer to.
+            marginal_qubits (tuple): Qubits of the marginal distribution, in
+                the order of their significance. They must be contained in
+                ``qubits``.
+        """
+        # the amplitudes of a state with the given probabilities have the
+        # same marginals
+        amplitudes = self.cast(np.sqrt(self.to_numpy(probabilities)))
+        positions = [qubits.index(q) for q in marginal_qubits]
+        return self.calculate_probabilities(amplitudes, positions, len(qubits))
+
     @abc.abstractmethod
     def calculate_symbolic(
         self, state, nqubits, decimals=5, cutoff=1e-10, max_terms=20
@@ -244,6 +281,12 @@ class Backend(abc.ABC):
         """Calculate probabilities given a state vector."""
         raise_error(NotImplementedError)
 
+    def calculate_probabilities_batched(
+        self, states, qubits, nqubits
+    ):  # pragma: no cover
+        """Calculate measurement probabilities for a batch of state vectors."""
+        raise_error(NotImplementedError, f"{self} does not support batched execution.")
+
     @abc.abstractmethod
     def calculate_probabilities_density_matrix(
         self, state, qubits, nqubits
@@ -256,6 +299,12 @@ class Backend(abc.ABC):
         """Set the seed of the random number generator."""
         raise_error(NotImplementedError)
 
+    def sampler(self, probabilities):  # pragma: no cover
+        """Create a :class:`qibo.backends.sampling.Sampler` for a probability distribution."""
+        from qibo.backends.sampling import Sampler
+
+        return Sampler(self.to_numpy(probabilities))
+
     @abc.abstractmethod
     def sample_shots(self, probabilities, nshots):  # pragma: no cover
         """Sample measurement shots according to a probability distribution."""
@@ -348,6 +397,13 @@ class Backend(abc.ABC):
         """
         raise_error(NotImplementedError)
 
+    def calculate_matrix_exp_product(self, a, matrix, state):
+        """Calculate the product of ``exp(-1j * a * matrix)`` with a state.
+
+        Backends can override this to avoid constructing the exponential.
+        """
+        return self.calculate_matrix_exp(a, matrix) @ state
+
     @abc.abstractmethod
     def calculate_expectation_state(
         self, hamiltonian, state, normalize
@@ -374,6 +430,31 @@ class Backend(abc.ABC):
         """Multiply a matrix to a state vector or density matrix."""
         raise_error(NotImplementedError)
 
+    def calculate_hamiltonian_terms_product(
+        self, terms, state, nqubits, constant=0, density_matrix=False
+    ):
+        """Multiply a sum of local matrices to a state vector or density matrix.
+
+        Args:
+            terms (list): Tuples ``(targets, matrix, structure)`` with the
+                qubits that each matrix acts on and the structure of the matrix.
+            state: State vector or density matrix, which is not modified.
+            nqubits (int): Total number of qubits.
+            constant (complex): Multiple of the identity added to the sum.
+            density_matrix (bool): If ``True`` the density matrix is
+                multiplied from the left.
+        """
+        from qibo import gates
+
+        total = constant * state
+        for targets, matrix, _ in terms:
+            gate = gates.Unitary(matrix, *targets)
+            if density_matrix:
+                total += self.apply_gate_half_density_matrix(gate, state, nqubits)
+            else:
+                total += self.apply_gate(gate, state, nqubits)
+        return total
+
     @abc.abstractmethod
     def assert_allclose(self, value, target, rtol=1e-7, atol=0.0):  # pragma: no cover
         raise_error(NotImplementedError)
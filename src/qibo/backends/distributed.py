@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+Execution of distributed circuits on CPU with a pool of worker processes.
+
+The state vector is split to the pieces defined by
+:class:`qibo.models.distcircuit.DistributedQueues`, which are kept in a
+single shared memory block. Worker processes attach to this block and update
+their pieces in place, so that state pieces are never pickled or copied
+between processes. The gate queues of the pieces are applied in parallel,
+with one task per piece, and SWAPs between global and local qubits exchange
+the corresponding halves of each pair of pieces directly in shared memory.
+"""
+import concurrent.futures
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from qibo.backends import kernels
+
+
+def _attach(key):
+    """Attaches a worker process to the shared memory block of the state pieces.
+
+    Returns:
+        The shared memory block and a view of the pieces as an array of shape
+        ``(ndevices, 2 ** nlocal)``.
+    """
+    name, shape, dtype = key
+    memory = shared_memory.SharedMemory(name=name)
+    return memory, np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+
+
+def _apply_operations(key, index, operations, nlocal):
+    """Applies gate matrices to a state piece in a worker process."""
+    memory, pieces = _attach(key)
+    piece = pieces[index]
+    scratch = kernels.Scratch()
+    for matrix, targets, controls, structure in operations:
+        kernels.apply(piece, matrix, targets, controls, nlocal, structure, scratch)
+    # views of the buffer should be released before closing the block
+    del piece, pieces
+    memory.close()
+
+
+def _swap_pieces(key, i, j, qubit, nlocal):
+    """Exchanges the amplitudes of two pieces in a worker process.
+
+    The amplitudes of piece ``i`` in which the local ``qubit`` is 1 are
+    exchanged with the amplitudes of piece ``j`` in which it is 0.
+    """
+    memory, pieces = _attach(key)
+    shape, axes = kernels.merged_shape((qubit,), nlocal)
+    piece0 = pieces[i].reshape(shape)
+    piece1 = pieces[j].reshape(shape)
+    index0 = len(shape) * [slice(None)]
+    index1 = list(index0)
+    index0[axes[qubit]], index1[axes[qubit]] = 0, 1
+    index0, index1 = tuple(index0), tuple(index1)
+    # exchange in chunks of the leading axis to bound the temporary buffer
+    step = max(1, 2 * kernels.CHUNK_SIZE // piece0[0].size)
+    for start in range(0, shape[0], step):
+        chunk = slice(start, start + step)
+        half = np.copy(piece0[chunk][index1])
+        piece0[chunk][index1] = piece1[chunk][index0]
+        piece1[chunk][index0] = half
+    del half, piece0, piece1, pieces
+    memory.close()
+
+
+class SharedPieces:
+    """State pieces of a distributed circuit kept in shared memory.
+
+    Args:
+        ndevices (int): Number of state pieces.
+        nlocal (int): Number of local qubits, so that each piece has
+            ``2 ** nlocal`` amplitudes.
+        dtype: Data type of the state.
+    """
+
+    def __init__(self, ndevices, nlocal, dtype):
+        self.shape = (ndevices, 2**nlocal)
+        self.dtype = np.dtype(dtype)
+        size = ndevices * 2**nlocal * self.dtype.itemsize
+        self.memory = shared_memory.SharedMemory(create=True, size=size)
+        self.pieces = np.ndarray(self.shape, dtype=self.dtype, buffer=self.memory.buf)
+
+    @property
+    def key(self):
+        """Arguments that worker processes use to attach to the pieces."""
+        return (self.memory.name, self.shape, self.dtype.str)
+
+    def from_tensor(self, state, qubits):
+        """Splits a full state vector to the pieces.
+
+        Args:
+            state (np.ndarray): State vector of shape ``(2 ** nqubits,)``.
+            qubits (:class:`qibo.models.distcircuit.DistributedQubits`):
+                Global qubits of the circuit.
+        """
+        nqubits = len(qubits.transpose_order)
+        state = np.reshape(state, nqubits * (2,))
+        state = np.transpose(state, qubits.transpose_order)
+        self.pieces[:] = np.reshape(state, self.shape)
+
+    def to_tensor(self, qubits):
+        """Merges the pieces to a new full state vector."""
+        nqubits = len(qubits.transpose_order)
+        state = np.reshape(self.pieces, nqubits * (2,))
+        # ``flatten`` copies so that the state outlives the shared memory
+        return np.transpose(state, qubits.reverse_transpose_order).flatten()
+
+    def close(self):
+        """Releases the shared memory block."""
+        del self.pieces
+        self.memory.close()
+        self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class WorkerPool:
+    """Pool of worker processes that update state pieces in shared memory.
+
+    Processes are started when they are first needed and are reused for
+    subsequent executions. The pool is not pickled with the backend that
+    holds it, a new one is started after unpickling.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._nworkers = 0
+
+    def __getstate__(self):
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__()
+
+    def executor(self, ntasks):
+        """Returns an executor with enough processes for the given number of parallel tasks."""
+        nworkers = min(ntasks, os.cpu_count() or 1)
+        if self._executor is None or self._nworkers < nworkers:
+            self.shutdown()
+            self._executor = concurrent.futures.ProcessPoolExecutor(nworkers)
+            self._nworkers = nworkers
+        return self._executor
+
+    def shutdown(self):
+        """Stops all worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            self._nworkers = 0
+
+    def run(self, function, tasks):
+        """Runs tasks in parallel and waits until all of them are completed.
+
+        Args:
+            function (callable): Function executed by the worker processes.
+            tasks (list): Tuples with the arguments of each task.
+        """
+        if not tasks:
+            return
+        executor = self.executor(len(tasks))
+        futures = [executor.submit(function, *args) for args in tasks]
+        for future in futures:
+            # raises the exceptions of the workers in the parent process
+            future.result()
+
+    def apply_operations(self, pieces, operations, nlocal):
+        """Applies the gate matrices of each piece in parallel.
+
+        Args:
+            pieces (:class:`qibo.backends.distributed.SharedPieces`): State pieces.
+            operations (list): List with the ``(matrix, targets, controls,
+                structure)`` tuples to apply to each piece.
+            nlocal (int): Number of local qubits.
+        """
+        tasks = [
+            (pieces.key, i, ops, nlocal) for i, ops in enumerate(operations) if ops
+        ]
+        self.run(_apply_operations, tasks)
+
+    def swap(self, pieces, qubits, global_qubit, local_qubit):
+        """Swaps a global with a local qubit by exchanging halves of the pieces.
+
+        Args:
+            pieces (:class:`qibo.backends.distributed.SharedPieces`): State pieces.
+            qubits (:class:`qibo.models.distcircuit.DistributedQubits`):
+                Global qubits of the circuit.
+            global_qubit (int): Global qubit to swap.
+            local_qubit (int): Local qubit to swap.
+        """
+        ndevices, nlocal = pieces.shape[0], len(qubits.local)
+        nglobal = len(qubits.list)
+        m = nglobal - qubits.reduced_global[global_qubit] - 1
+        t = 1 << m
+        qubit = qubits.reduced_local[local_qubit]
+        tasks = []
+        for g in range(ndevices // 2):
+            i = ((g >> m) << (m + 1)) + (g & (t - 1))
+            tasks.append((pieces.key, i, i + t, qubit, nlocal))
+        self.run(_swap_pieces, tasks)
+
+    def revert_swaps(self, pieces, qubits, swap_pairs):
+        """Applies the given global-local SWAPs to the pieces."""
+        for q1, q2 in swap_pairs:
+            if q1 not in qubits.set:
+                q1, q2 = q2, q1
+            self.swap(pieces, qubits, q1, q2)
@@ -4,6 +4,8 @@ Gates use ``einsum`` to apply gates to state vectors. The einsum string that
 specifies the contraction indices is created using the following methods and
 used by :meth:`qibo.backends.numpy.NumpyEngine.apply_gate`.
 """
+import collections
+
 from qibo.config import EINSUM_CHARS, raise_error
 
 
@@ -30,6 +32,23 @@ def apply_gate_string(qubits, nqubits):
     return f"{inp},{trans}->{out}"
 
 
+def apply_gate_batched_string(qubits, nqubits, batched_matrix=False):
+    """Einsum string for applying a gate to a batch of state vectors.
+
+    The batch index is the first index of the state. If ``batched_matrix`` is
+    ``True`` the gate matrix also carries a batch index so that each state
+    in the batch is multiplied by a different matrix.
+    """
+    inp, out, trans, rest = prepare_strings(qubits, nqubits)
+    if not rest:  # pragma: no cover
+        raise_error(NotImplementedError, "Not enough einsum characters.")
+
+    b = rest[0]
+    if batched_matrix:
+        return f"{b}{inp},{b}{trans}->{b}{out}"
+    return f"{b}{inp},{trans}->{b}{out}"
+
+
 def apply_gate_density_matrix_string(qubits, nqubits):
     inp, out, trans, rest = prepare_strings(qubits, nqubits)
     if nqubits > len(rest):  # pragma: no cover
@@ -86,3 +105,147 @@ def reverse_order(order):
     for i, r in enumerate(order):
         rorder[r] = i
     return rorder
+
+
+class EinsumPlan:
+    """Precomputed data for applying a gate on given qubits with ``einsum``.
+
+    Holds the einsum strings, the transpose orders used for controlled gates
+    and the shape that the gate matrix and state are reshaped to, so that
+    these do not need to be recalculated every time a gate acting on the
+    same qubits is applied. The contraction path of each einsum string is
+    calculated with ``np.einsum_path`` the first time it is used.
+
+    Args:
+        targets (tuple): Target qubit ids of the gate.
+        controls (tuple): Control qubit ids of the gate.
+        nqubits (int): Total number of qubits in the state.
+        density_matrix (bool): If ``True`` the plan is prepared for gate
+            application on density matrices.
+    """
+
+    # minimum number of state indices for using explicit contraction paths
+    PATH_THRESHOLD = 16
+
+    def __init__(self, targets, controls, nqubits, density_matrix=False):
+        self.targets = tuple(targets)
+        self.controls = tuple(controls)
+        self.nqubits = nqubits
+        self.density_matrix = density_matrix
+        self.ncontrol = len(controls)
+        self.nactive = nqubits - self.ncontrol
+        self.paths = {}
+
+        if controls:
+            self.matrix_shape = 2 * len(targets) * (2,)
+            gate = _QubitsView(targets, controls)
+            if density_matrix:
+                self.order, reduced = control_order_density_matrix(gate, nqubits)
+                n = 2**self.ncontrol
+                self.state_shape = 2 * (n,) + 2 * self.nactive * (2,)
+                self.leftc, self.rightc = apply_gate_density_matrix_controlled_string(
+                    reduced, self.nactive
+                )
+                self.left, self.right = apply_gate_density_matrix_string(
+                    reduced, self.nactive
+                )
+            else:
+                self.order, reduced = control_order(gate, nqubits)
+                self.state_shape = (2**self.ncontrol,) + self.nactive * (2,)
+                self.opstring = apply_gate_string(reduced, self.nactive)
+            self.reduced_targets = tuple(reduced)
+            self.reverse_order = reverse_order(self.order)
+        else:
+            # gate matrices of uncontrolled gates (such as ``CNOT``) act on all
+            # qubits and ``targets`` should be given as ``gate.qubits``
+            self.matrix_shape = 2 * len(targets) * (2,)
+            if density_matrix:
+                self.left, self.right = apply_gate_density_matrix_string(
+                    targets, nqubits
+                )
+            else:
+                self.opstring = apply_gate_string(targets, nqubits)
+
+    def path(self, opstring, *operands):
+        """Contraction path to be passed as the ``optimize`` argument of ``einsum``.
+
+        The path is calculated with ``np.einsum_path`` the first time it is
+        requested. It is used only for large states when the contracted
+        indices are the first or last indices of the state, as in this case
+        ``einsum`` can dispatch to BLAS without transposing the state.
+        Otherwise ``False`` is returned so that the default ``einsum``
+        implementation is used.
+        """
+        if opstring not in self.paths:
+            inp, trans = opstring.split("->")[0].split(",")
+            ntargets = len(trans) // 2
+            axes = [inp.index(c) for c in trans[ntargets:]]
+            n = len(inp)
+            edge = all(a < ntargets or a >= n - ntargets for a in axes)
+            if edge and n >= self.PATH_THRESHOLD:
+                import numpy as np
+
+                self.paths[opstring] = np.einsum_path(
+                    opstring, *operands, optimize="greedy"
+                )[0]
+            else:
+                self.paths[opstring] = False
+        return self.paths.get(opstring)
+
+
+class _QubitsView:
+    """Minimal gate-like object used by ``control_order`` when creating plans."""
+
+    def __init__(self, targets, controls):
+        self.target_qubits = tuple(targets)
+        self.control_qubits = tuple(sorted(controls))
+
+
+class EinsumPlanCache:
+    """Bounded least recently used cache of :class:`qibo.backends.einsum_utils.EinsumPlan`.
+
+    Plans are identified by the target and control qubits of the gate, the
+    total number of qubits and whether they are used for density matrices.
+    When the cache is full the plan that was used least recently is removed.
+
+    Args:
+        maxsize (int): Maximum number of plans kept in memory.
+            If ``None`` the value of ``qibo.config.EINSUM_PLAN_CACHE_SIZE``
+            is used.
+    """
+
+    def __init__(self, maxsize=None):
+        if maxsize is None:
+            from qibo.config import EINSUM_PLAN_CACHE_SIZE
+
+            maxsize = EINSUM_PLAN_CACHE_SIZE
+        if maxsize < 1:
+            raise_error(ValueError, "Einsum plan cache size must be positive.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._plans = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._plans)
+
+    def get(self, targets, controls, nqubits, density_matrix=False):
+        """Returns the plan for the given qubits creating it if it is not cached."""
+        key = (tuple(targets), tuple(controls), nqubits, density_matrix)
+        plan = self._plans.get(key)
+        if plan is None:
+            self.misses += 1
+            plan = EinsumPlan(targets, controls, nqubits, density_matrix)
+            self._plans[key] = plan
+            if len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+        else:
+            self.hits += 1
+            self._plans.move_to_end(key)
+        return plan
+
+    def clear(self):
+        """Removes all plans from the cache and resets the hit/miss counters."""
+        self._plans.clear()
+        self.hits = 0
+        self.misses = 0
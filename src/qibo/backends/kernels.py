@@ -0,0 +1,395 @@
+# -*- coding: utf-8 -*-
+"""
+In-place kernels used by :class:`qibo.backends.numpy.NumpyBackend` for applying
+gates to state vectors.
+
+The state vector is viewed as a tensor in which the target and control qubits
+have their own index while all other qubits are merged to as few indices as
+possible. Gates are then applied by updating strided views of this tensor
+directly, so that no new array of the size of the state is allocated.
+Dense matrices are applied in blocks of at most ``CHUNK_SIZE`` amplitudes
+per target configuration using a reusable scratch buffer.
+"""
+import functools
+import itertools
+import math
+import threading
+
+import numpy as np
+
+# minimum number of qubits for which the kernels are used by the numpy backend
+# for dense and permutation gates, smaller states are updated with ``einsum``
+# which has less overhead. Diagonal gates always use the kernels.
+MIN_QUBITS = 12
+MIN_QUBITS_PERMUTATION = 8
+
+# maximum number of amplitudes per target configuration that are copied to
+# the scratch buffer in every step of the dense kernel
+CHUNK_SIZE = 2**16
+
+
+class Scratch:
+    """Reusable buffers for the dense kernels.
+
+    A single flat buffer is kept for each dtype and grows when a larger one
+    is requested, so that repeated gate applications do not allocate memory.
+    Buffers are local to each thread so that circuits can be executed
+    concurrently with the same backend.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    @property
+    def _buffers(self):
+        buffers = getattr(self._local, "buffers", None)
+        if buffers is None:
+            buffers = self._local.buffers = {}
+        return buffers
+
+    def __getstate__(self):
+        # buffers are not pickled, they are allocated again when needed
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__()
+
+    def get(self, shape, dtype):
+        """Returns a pair of arrays with the given shape backed by the same buffer."""
+        size = math.prod(shape)
+        buffer = self._buffers.get(dtype)
+        if buffer is None or len(buffer) < 2 * size:
+            buffer = np.empty(2 * size, dtype=dtype)
+            self._buffers[dtype] = buffer
+        return (
+            buffer[:size].reshape(shape),
+            buffer[size : 2 * size].reshape(shape),
+        )
+
+    def clear(self):
+        """Releases all buffers."""
+        self._buffers.clear()
+
+
+def merged_shape(qubits, nqubits):
+    """Shape of the state tensor in which ``qubits`` have their own index.
+
+    Consecutive qubits that do not belong to ``qubits`` are merged to a single
+    index. Reshaping a contiguous state vector to this shape gives a view.
+
+    Args:
+        qubits (list): Qubits that will be accessed individually.
+        nqubits (int): Total number of qubits.
+
+    Returns:
+        The shape as a list and a dictionary that maps each of the ``qubits``
+        to its index in the tensor.
+    """
+    shape, axes = [], {}
+    last = -1
+    for q in sorted(qubits):
+        shape.append(2 ** (q - last - 1))
+        axes[q] = len(shape)
+        shape.append(2)
+        last = q
+    shape.append(2 ** (nqubits - last - 1))
+    return shape, axes
+
+
+def _configurations(targets, axes, controls, ndim):
+    """Index lists of the tensor slices for all target qubit configurations.
+
+    Control indices are fixed to 1 and all other indices are left as slices.
+    Target configurations follow the big-endian order of gate matrices.
+    """
+    index = ndim * [slice(None)]
+    for q in controls:
+        index[axes[q]] = 1
+    configurations = []
+    for bits in itertools.product((0, 1), repeat=len(targets)):
+        for q, b in zip(targets, bits):
+            index[axes[q]] = b
+        configurations.append(list(index))
+    return configurations
+
+
+@functools.lru_cache(maxsize=1024)
+def plan(targets, controls, nqubits):
+    """Prepares the views used by the kernels for a gate acting on the given qubits.
+
+    Args:
+        targets (tuple): Qubits that the gate matrix acts on.
+        controls (tuple): Control qubits of the gate.
+        nqubits (int): Total number of qubits.
+
+    Returns:
+        Tuple with the shape of the merged state tensor, the shape of the
+        blocks processed in each step of the dense kernel (including the
+        configurations index) and a list that contains the index tuples
+        of all target configurations for every block. The first element of
+        this list corresponds to the full slices and is used by the diagonal
+        kernel.
+    """
+    shape, axes = merged_shape(tuple(targets) + tuple(controls), nqubits)
+    configurations = _configurations(targets, axes, controls, len(shape))
+    used = set(axes.values())
+    free = [i for i in range(len(shape)) if i not in used]
+
+    lengths = {}
+    size = CHUNK_SIZE
+    for i in reversed(free):
+        lengths[i] = min(shape[i], size)
+        size //= lengths[i]
+    ranges = [range(0, shape[i], lengths[i]) for i in free]
+
+    blocks = [[tuple(index) for index in configurations]]
+    for starts in itertools.product(*ranges):
+        views = []
+        for index in configurations:
+            for i, start in zip(free, starts):
+                index[i] = slice(start, start + lengths[i])
+            views.append(tuple(index))
+        blocks.append(views)
+    block_shape = (len(configurations),) + tuple(lengths[i] for i in free)
+    return tuple(shape), block_shape, blocks
+
+
+def apply_matrix(state, matrix, targets, controls, nqubits, scratch):
+    """Applies a dense matrix to the state vector in place.
+
+    Args:
+        state (np.ndarray): Contiguous state vector of shape ``(2 ** nqubits,)``.
+        matrix (np.ndarray): Gate matrix of shape
+            ``(2 ** len(targets), 2 ** len(targets))``.
+        targets (tuple): Qubits that the matrix acts on.
+        controls (tuple): Control qubits. The matrix is applied only to the
+            part of the state where all controls are in the 1 state.
+        nqubits (int): Total number of qubits.
+        scratch (:class:`qibo.backends.kernels.Scratch`): Buffers used for the
+            intermediate results.
+
+    Returns:
+        The updated state vector.
+    """
+    shape, block_shape, blocks = plan(tuple(targets), tuple(controls), nqubits)
+    tensor = np.reshape(state, shape)
+    buffer_in, buffer_out = scratch.get(block_shape, state.dtype)
+    flat_in = buffer_in.reshape(block_shape[0], -1)
+    flat_out = buffer_out.reshape(block_shape[0], -1)
+    for views in blocks[1:]:
+        for i, index in enumerate(views):
+            buffer_in[i] = tensor[index]
+        np.matmul(matrix, flat_in, out=flat_out)
+        for i, index in enumerate(views):
+            tensor[index] = buffer_out[i]
+    return state
+
+
+def apply_diagonal(state, diagonal, targets, controls, nqubits):
+    """Multiplies the state vector in place with a diagonal matrix.
+
+    Args:
+        state (np.ndarray): Contiguous state vector of shape ``(2 ** nqubits,)``.
+        diagonal (np.ndarray): Diagonal of the gate matrix with shape
+            ``(2 ** len(targets),)``.
+        targets (tuple): Qubits that the matrix acts on.
+        controls (tuple): Control qubits.
+        nqubits (int): Total number of qubits.
+
+    Returns:
+        The updated state vector.
+    """
+    shape, _, blocks = plan(tuple(targets), tuple(controls), nqubits)
+    tensor = np.reshape(state, shape)
+    for index, phase in zip(blocks[0], diagonal):
+        if phase != 1:
+            tensor[index] *= phase
+    return state
+
+
+def apply_permutation(state, permutation, phases, targets, controls, nqubits, scratch):
+    """Applies a permutation matrix, up to phases, to the state vector in place.
+
+    The matrix element in row ``i`` and column ``permutation[i]`` is
+    ``phases[i]`` and all other elements vanish, so that the amplitudes of
+    each target configuration ``i`` are replaced by the amplitudes of
+    configuration ``permutation[i]`` multiplied by ``phases[i]``.
+
+    Args:
+        state (np.ndarray): Contiguous state vector of shape ``(2 ** nqubits,)``.
+        permutation (list): Column of the non-zero element of each matrix row.
+        phases (np.ndarray): Values of the non-zero matrix elements.
+        targets (tuple): Qubits that the matrix acts on.
+        controls (tuple): Control qubits.
+        nqubits (int): Total number of qubits.
+        scratch (:class:`qibo.backends.kernels.Scratch`): Buffers used for
+            the amplitudes that are moved.
+
+    Returns:
+        The updated state vector.
+    """
+    shape, block_shape, blocks = plan(tuple(targets), tuple(controls), nqubits)
+    tensor = np.reshape(state, shape)
+    moved = [i for i, j in enumerate(permutation) if i != j]
+    for i, (index, phase) in enumerate(zip(blocks[0], phases)):
+        if permutation[i] == i and phase != 1:
+            tensor[index] *= phase
+    if not moved:
+        return state
+    buffer, _ = scratch.get(block_shape, state.dtype)
+    for views in blocks[1:]:
+        for i in moved:
+            buffer[i] = tensor[views[i]]
+        for i in moved:
+            np.multiply(buffer[permutation[i]], phases[i], out=tensor[views[i]])
+    return state
+
+
+def permutation(matrix):
+    """Column and value of the non-zero element in every row of a permutation matrix.
+
+    Args:
+        matrix (np.ndarray): Matrix with a single non-zero element in each
+            row and column.
+
+    Returns:
+        A list with the column index and an array with the value of the
+        non-zero element of each row.
+    """
+    rows, columns = np.nonzero(matrix)
+    return columns.tolist(), matrix[rows, columns]
+
+
+def apply(state, matrix, targets, controls, nqubits, structure, scratch):
+    """Applies a gate matrix to the state vector in place using the kernel
+    that corresponds to the structure of the matrix.
+
+    Args:
+        state (np.ndarray): Contiguous state vector of shape ``(2 ** nqubits,)``.
+        matrix (np.ndarray): Gate matrix.
+        targets (tuple): Qubits that the matrix acts on.
+        controls (tuple): Control qubits.
+        nqubits (int): Total number of qubits.
+        structure (str): Structure of the matrix, as in
+            :attr:`qibo.gates.abstract.Gate.structure`.
+        scratch (:class:`qibo.backends.kernels.Scratch`): Buffers used for
+            the intermediate results.
+
+    Returns:
+        The updated state vector.
+    """
+    if structure == "diagonal":
+        return apply_diagonal(state, np.diagonal(matrix), targets, controls, nqubits)
+    if structure == "permutation":
+        columns, phases = permutation(matrix)
+        return apply_permutation(
+            state, columns, phases, targets, controls, nqubits, scratch
+        )
+    return apply_matrix(state, matrix, targets, controls, nqubits, scratch)
+
+
+def matrix_structure(matrix):
+    """Structure of a matrix, as in :attr:`qibo.gates.abstract.Gate.structure`.
+
+    Returns:
+        ``"diagonal"`` if all off-diagonal elements vanish, ``"permutation"``
+        if every row and column has a single non-zero element and
+        ``"dense"`` otherwise.
+    """
+    nonzero = matrix != 0
+    if not np.any(nonzero[~np.eye(len(matrix), dtype=bool)]):
+        return "diagonal"
+    if np.all(nonzero.sum(axis=0) == 1) and np.all(nonzero.sum(axis=1) == 1):
+        return "permutation"
+    return "dense"
+
+
+def _broadcast(values, targets, axes, ndim):
+    """Reshapes values of target configurations to broadcast with the merged state."""
+    k = len(targets)
+    order = sorted(range(k), key=lambda i: targets[i])
+    values = np.transpose(np.reshape(values, k * (2,)), order)
+    shape = ndim * [1]
+    for q in targets:
+        shape[axes[q]] = 2
+    return np.reshape(values, shape)
+
+
+def accumulate(result, state, matrix, targets, nqubits, structure, scratch):
+    """Adds the product of a matrix acting on some qubits with the state to ``result``.
+
+    The state is not modified and no new array of the size of the state is
+    allocated, intermediate products are written to the scratch buffers.
+    Diagonal matrices and permutations of the form ``i -> i ^ x``, such as
+    Pauli strings, are applied with products of blocks of the state tensor,
+    with the axes of the flipped qubits reversed, with the broadcasted
+    matrix elements.
+
+    Args:
+        result (np.ndarray): Contiguous vector of shape ``(2 ** nqubits,)``
+            that is updated in place.
+        state (np.ndarray): Contiguous state vector of shape ``(2 ** nqubits,)``.
+        matrix (np.ndarray): Matrix of shape
+            ``(2 ** len(targets), 2 ** len(targets))``.
+        targets (tuple): Qubits that the matrix acts on.
+        nqubits (int): Total number of qubits.
+        structure (str): Structure of the matrix, see
+            :func:`qibo.backends.kernels.matrix_structure`.
+        scratch (:class:`qibo.backends.kernels.Scratch`): Buffers used for
+            the intermediate results.
+
+    Returns:
+        The updated ``result``.
+    """
+    targets = tuple(targets)
+    shape, block_shape, blocks = plan(targets, (), nqubits)
+    tensor = np.reshape(state, shape)
+    output = np.reshape(result, shape)
+    if structure == "diagonal":
+        columns, phases = list(range(len(matrix))), np.diagonal(matrix)
+    elif structure == "permutation":
+        columns, phases = permutation(matrix)
+    else:
+        columns = None
+
+    if columns is not None and all(j == i ^ columns[0] for i, j in enumerate(columns)):
+        x = columns[0]
+        _, axes = merged_shape(targets, nqubits)
+        flipped = [
+            axes[q] for b, q in enumerate(targets) if (x >> (len(targets) - b - 1)) & 1
+        ]
+        # blocks contain all target configurations and the same slices of
+        # the other indices as the blocks of the dense kernel
+        free = [i for i in range(len(shape)) if i not in axes.values()]
+        chunk_shape = len(shape) * [2]
+        for i, length in zip(free, block_shape[1:]):
+            chunk_shape[i] = length
+        buffer, _ = scratch.get(chunk_shape, state.dtype)
+        values = _broadcast(phases, targets, axes, len(shape))
+        for views in blocks[1:]:
+            index = list(views[0])
+            for q in targets:
+                index[axes[q]] = slice(None)
+            source = list(index)
+            for i in flipped:
+                source[i] = slice(None, None, -1)
+            np.multiply(tensor[tuple(source)], values, out=buffer)
+            output[tuple(index)] += buffer
+        return result
+
+    buffer_in, buffer_out = scratch.get(block_shape, state.dtype)
+    if columns is not None:
+        for views in blocks[1:]:
+            for i, index in enumerate(views):
+                np.multiply(tensor[views[columns[i]]], phases[i], out=buffer_in[i])
+                output[index] += buffer_in[i]
+    else:
+        flat_in = buffer_in.reshape(block_shape[0], -1)
+        flat_out = buffer_out.reshape(block_shape[0], -1)
+        for views in blocks[1:]:
+            for i, index in enumerate(views):
+                buffer_in[i] = tensor[index]
+            np.matmul(matrix, flat_in, out=flat_out)
+            for i, index in enumerate(views):
+                output[index] += buffer_out[i]
+    return result
@@ -26,6 +26,10 @@ class Matrices:
         self.dtype = dtype
         self.np = np
 
+    def __reduce__(self):
+        # matrices are calculated again after unpickling
+        return (self.__class__, (self.dtype,))
+
     @cached_property
     def H(self):
         return self.np.array([[1, 1], [1, -1]], dtype=self.dtype) / self.np.sqrt(2)
@@ -108,6 +112,34 @@ class Matrices:
             dtype=self.dtype,
         )
 
+    def batched(self, name, parameters):
+        """Matrices of a parametrized gate for a batch of parameter values.
+
+        The matrices of the ``RX``, ``RY``, ``RZ``, ``U2`` and ``U3`` gates
+        are calculated with vectorized operations, the matrices of other
+        gates are calculated for each parameter set separately.
+
+        Args:
+            name (str): Name of the gate class.
+            parameters (np.ndarray): Array of shape ``(batch, nparams)``.
+
+        Returns:
+            Array of shape ``(batch, d, d)``, where ``d`` is the dimension of
+            the gate matrix.
+        """
+        if name == "RZ":
+            phase = self.np.exp(0.5j * parameters[:, 0])
+            matrices = self.np.zeros((len(parameters), 2, 2), dtype=self.dtype)
+            matrices[:, 0, 0] = self.np.conj(phase)
+            matrices[:, 1, 1] = phase
+            return matrices
+        if name in ("RX", "RY", "U2", "U3"):
+            # all elements of these matrices depend on the parameters, so
+            # the single gate methods work with arrays of parameters
+            matrices = getattr(self, name)(*parameters.T)
+            return self.np.ascontiguousarray(self.np.moveaxis(matrices, -1, 0))
+        return self.np.stack([getattr(self, name)(*params) for params in parameters])
+
     @cached_property
     def CNOT(self):
         return self.np.array(
@@ -0,0 +1,422 @@
+# -*- coding: utf-8 -*-
+import tempfile
+
+import numpy as np
+
+from qibo import gates
+from qibo.backends import kernels
+from qibo.backends.numpy import NumpyBackend
+from qibo.config import MEMMAP_MEMORY, raise_error
+from qibo.states import CircuitResult
+
+
+class StateMemmap(np.memmap):
+    """``numpy.memmap`` that is pickled as a regular array."""
+
+    def __reduce_ex__(self, protocol):
+        return np.asarray(self).__reduce_ex__(protocol)
+
+
+class BlockedState:
+    """State vector stored in a file that is updated block by block.
+
+    The qubits of the stored state are split to global and local. Each block
+    is a contiguous part of the file that contains all configurations of the
+    ``nlocal`` local qubits, which are the least significant, for a fixed
+    configuration of the global qubits. Gates that target only local qubits
+    are applied by loading each block to memory, while global qubits are
+    first swapped with local ones by exchanging parts of the blocks.
+    The position of each qubit in the stored state is tracked in ``layout``.
+
+    Args:
+        state (np.memmap): Flat array that holds the state.
+        nqubits (int): Number of qubits of the state. For density matrices
+            this is twice the number of qubits.
+        nlocal (int): Number of local qubits.
+        scratch (:class:`qibo.backends.kernels.Scratch`): Buffers used by
+            the kernels.
+    """
+
+    def __init__(self, state, nqubits, nlocal, scratch):
+        self.state = state
+        self.nqubits = nqubits
+        self.nlocal = nlocal
+        self.nglobal = nqubits - nlocal
+        self.size = 2**nlocal
+        self.scratch = scratch
+        # ``layout[q]`` is the position of qubit ``q`` in the stored state
+        self.layout = list(range(nqubits))
+        self.buffers = (
+            np.empty(self.size, dtype=state.dtype),
+            np.empty(self.size, dtype=state.dtype),
+        )
+
+    def block(self, i):
+        """View of the ``i``-th block in the file."""
+        return self.state[i * self.size : (i + 1) * self.size]
+
+    def is_local(self, position):
+        return position >= self.nglobal
+
+    def mask(self, position):
+        """Bit of the block index that corresponds to a global position."""
+        return 1 << (self.nglobal - position - 1)
+
+    def apply(self, operations):
+        """Applies a list of gate matrices to the state.
+
+        Consecutive operations that target only local qubits are applied with
+        a single pass over the file. The original order of qubits is restored
+        after all operations are applied.
+
+        Args:
+            operations (list): Tuples with the matrix, target qubits, control
+                qubits and structure of each operation.
+        """
+        i = 0
+        while i < len(operations):
+            self.localize(operations, i)
+            j = i + 1
+            while j < len(operations) and all(
+                self.is_local(self.layout[q]) for q in operations[j][1]
+            ):
+                j += 1
+            self.apply_local(
+                [
+                    (matrix, self.positions(targets), self.positions(controls), s)
+                    for matrix, targets, controls, s in operations[i:j]
+                ]
+            )
+            i = j
+        self.restore()
+
+    def positions(self, qubits):
+        return tuple(self.layout[q] for q in qubits)
+
+    def localize(self, operations, i):
+        """Swaps the global target qubits of the ``i``-th operation with local qubits.
+
+        The local qubits that are swapped out are those whose next use as
+        targets by the following operations is the latest.
+        """
+        targets = operations[i][1]
+        used = set(self.positions(targets))
+        for q in targets:
+            position = self.layout[q]
+            if not self.is_local(position):
+                qubits = {p: q for q, p in enumerate(self.layout)}
+                candidates = (
+                    p for p in range(self.nglobal, self.nqubits) if p not in used
+                )
+                local = max(
+                    candidates, key=lambda p: self.next_use(operations, i, qubits[p])
+                )
+                self.swap(position, local)
+                used.add(local)
+
+    @staticmethod
+    def next_use(operations, i, qubit):
+        """Index of the first operation after ``i`` that targets ``qubit``."""
+        for j in range(i + 1, len(operations)):
+            if qubit in operations[j][1]:
+                return j
+        return len(operations)
+
+    def apply_local(self, operations):
+        """Applies operations that target local positions with a pass over the file.
+
+        Controls on global positions are handled by skipping the blocks in
+        which they are not in the 1 state.
+        """
+        local = []
+        for matrix, targets, controls, structure in operations:
+            targets = tuple(p - self.nglobal for p in targets)
+            mask = sum(self.mask(p) for p in controls if not self.is_local(p))
+            controls = tuple(p - self.nglobal for p in controls if self.is_local(p))
+            local.append((matrix, targets, controls, structure, mask))
+
+        buffer, _ = self.buffers
+        for i in range(2**self.nglobal):
+            active = [op for op in local if i & op[4] == op[4]]
+            if active:
+                block = self.block(i)
+                buffer[:] = block
+                for matrix, targets, controls, structure, _ in active:
+                    kernels.apply(
+                        buffer,
+                        matrix,
+                        targets,
+                        controls,
+                        self.nlocal,
+                        structure,
+                        self.scratch,
+                    )
+                block[:] = buffer
+
+    def swap(self, position1, position2):
+        """Swaps the qubits stored in two positions."""
+        position1, position2 = sorted((position1, position2))
+        if self.is_local(position1):
+            matrix = np.eye(4, dtype=self.state.dtype)[[0, 2, 1, 3]]
+            self.apply_local([(matrix, (position1, position2), (), "permutation")])
+
+        elif self.is_local(position2):
+            # exchange the part of each block with the local qubit in the 1
+            # state with the part of its partner block with the local qubit
+            # in the 0 state, where partners differ in the global qubit
+            mask = self.mask(position1)
+            axis = position2 - self.nglobal
+            shape, axes = kernels.merged_shape([axis], self.nlocal)
+            index = axes[axis] * (slice(None),)
+            buffer0, buffer1 = self.buffers
+            for i in range(2**self.nglobal):
+                if not i & mask:
+                    block0, block1 = self.block(i), self.block(i | mask)
+                    buffer0[:] = block0
+                    buffer1[:] = block1
+                    block0 = np.reshape(block0, shape)
+                    block1 = np.reshape(block1, shape)
+                    block0[index + (1,)] = np.reshape(buffer1, shape)[index + (0,)]
+                    block1[index + (0,)] = np.reshape(buffer0, shape)[index + (1,)]
+
+        else:
+            # exchange the blocks in which the two global qubits differ
+            mask1, mask2 = self.mask(position1), self.mask(position2)
+            buffer, _ = self.buffers
+            for i in range(2**self.nglobal):
+                if i & mask1 and not i & mask2:
+                    block1, block2 = self.block(i), self.block(i ^ mask1 ^ mask2)
+                    buffer[:] = block1
+                    block1[:] = block2
+                    block2[:] = buffer
+
+        qubit1 = self.layout.index(position1)
+        qubit2 = self.layout.index(position2)
+        self.layout[qubit1], self.layout[qubit2] = position2, position1
+
+    def restore(self):
+        """Swaps qubits so that they are stored in their original order."""
+        for q in range(self.nqubits):
+            if self.layout[q] != q:
+                self.swap(self.layout[q], q)
+
+
+class MemmapBackend(NumpyBackend):
+    """Backend that stores state vectors in memory-mapped files.
+
+    The state is kept in a ``numpy.memmap`` file created in ``directory``
+    and only the blocks of it that fit the memory budget are loaded to
+    memory during gate application. Consecutive gates that act on the local
+    qubits of the blocks are applied with a single pass over the file using
+    the in-place kernels of the numpy backend, while global qubits are first
+    swapped with local ones by exchanging parts of the blocks in the file
+    (see :class:`qibo.backends.memmap.BlockedState`). This allows the
+    simulation of states that do not fit in memory at the cost of reading
+    and writing the file in every pass.
+
+    Gates without a matrix, such as channels and callbacks, are applied to
+    the full state as in :class:`qibo.backends.numpy.NumpyBackend`.
+
+    Args:
+        directory (str): Directory in which the state files are created.
+            If ``None`` the default directory for temporary files is used.
+        memory (int): Memory budget in bytes for the blocks of the state
+            that are loaded during gate application. If ``None`` the value
+            of ``qibo.config.MEMMAP_MEMORY`` is used. The budget is increased
+            if it does not fit the qubits of the largest gate.
+    """
+
+    def __init__(self, directory=None, memory=None):
+        super().__init__()
+        self.name = "memmap"
+        if memory is None:
+            memory = MEMMAP_MEMORY
+        if memory < 1:
+            raise_error(ValueError, "Memory budget must be positive.")
+        self.directory = directory
+        self.memory = memory
+        # raised when the state file cannot be created
+        self.oom_error = (MemoryError, OSError)
+
+    def memmap(self, shape, dtype=None):
+        """Creates an array of zeros that is stored in a temporary file.
+
+        The file is deleted when the array is garbage collected.
+        """
+        if dtype is None:
+            dtype = self.dtype
+        with tempfile.TemporaryFile(dir=self.directory) as file:
+            return StateMemmap(file, dtype=dtype, mode="w+", shape=shape)
+
+    def local_qubits(self, nqubits, width=1):
+        """Number of local qubits of the blocks loaded during gate application.
+
+        Two blocks are kept in memory when global qubits are swapped.
+
+        Args:
+            nqubits (int): Total number of qubits of the state.
+            width (int): Maximum number of target qubits of the gates.
+        """
+        amplitudes = self.memory // (2 * np.dtype(self.dtype).itemsize)
+        nlocal = max(amplitudes, 1).bit_length() - 1
+        return min(nqubits, max(nlocal, width))
+
+    def zero_state(self, nqubits):
+        state = self.memmap((2**nqubits,))
+        state[0] = 1
+        return state
+
+    def zero_density_matrix(self, nqubits):
+        state = self.memmap(2 * (2**nqubits,))
+        state[0, 0] = 1
+        return state
+
+    def plus_state(self, nqubits):
+        state = self.memmap((2**nqubits,))
+        state[:] = 1 / np.sqrt(2**nqubits)
+        return state
+
+    def plus_density_matrix(self, nqubits):
+        state = self.memmap(2 * (2**nqubits,))
+        state[:] = 1 / 2**nqubits
+        return state
+
+    def copy_state(self, state):
+        """Copies a state to a new array stored in a temporary file."""
+        state = self.to_numpy(state)
+        new_state = self.memmap(tuple(state.shape))
+        new_state[...] = state
+        return new_state
+
+    @staticmethod
+    def has_matrix(gate):
+        """Checks if a gate is applied by :class:`qibo.backends.memmap.BlockedState`."""
+        if isinstance(gate, gates.FusedGate):
+            return True
+        return not isinstance(gate, (gates.SpecialGate, gates.Channel, gates.M))
+
+    def operations(self, queue, nqubits, density_matrix=False):
+        """Matrices and qubits of the gates in a queue.
+
+        For density matrices the conjugate of each matrix is also applied to
+        the column indices, which correspond to qubits ``nqubits`` to
+        ``2 * nqubits - 1``.
+        """
+        operations = []
+        for gate in queue:
+            matrix = np.asarray(self.to_numpy(gate.asmatrix(self)), dtype=self.dtype)
+            if gate.is_controlled_by:
+                targets, controls = gate.target_qubits, gate.control_qubits
+            else:
+                targets, controls = gate.qubits, ()
+            operations.append((matrix, targets, controls, gate.structure))
+            if density_matrix:
+                targets = tuple(q + nqubits for q in targets)
+                controls = tuple(q + nqubits for q in controls)
+                operations.append((np.conj(matrix), targets, controls, gate.structure))
+        return operations
+
+    def apply_gates(self, queue, state, nqubits, density_matrix=False):
+        """Applies gates to a state stored in a file block by block.
+
+        Args:
+            queue (list): Gates to apply. They should all have a matrix.
+            state (np.memmap): State vector or density matrix.
+            nqubits (int): Number of qubits of the state.
+            density_matrix (bool): If ``True`` the state is a density matrix.
+
+        Returns:
+            The updated state.
+        """
+        operations = self.operations(queue, nqubits, density_matrix)
+        if not operations:
+            return state
+        nstates = 2 * nqubits if density_matrix else nqubits
+        width = max(len(targets) for _, targets, _, _ in operations)
+        nlocal = self.local_qubits(nstates, width)
+        blocked = BlockedState(state.reshape(-1), nstates, nlocal, self.scratch)
+        blocked.apply(operations)
+        return state
+
+    def execute_circuit(
+        self, circuit, initial_state=None, nshots=None, return_array=False
+    ):
+        if circuit.repeated_execution or circuit.accelerators:
+            return super().execute_circuit(circuit, initial_state, nshots, return_array)
+
+        nqubits = circuit.nqubits
+        density_matrix = circuit.density_matrix
+        if isinstance(initial_state, CircuitResult):
+            initial_state = initial_state.state()
+        if self.planner is None:
+            queue = circuit.queue
+        else:
+            queue = circuit.plan(self.planner)
+
+        try:
+            if initial_state is not None:
+                state = self.copy_state(self.cast(initial_state))
+            elif density_matrix:
+                state = self.zero_density_matrix(nqubits)
+            else:
+                state = self.zero_state(nqubits)
+
+            # consecutive gates with matrices are applied together and other
+            # gates are applied to the full state
+            segment = []
+            for gate in queue:
+                if self.has_matrix(gate):
+                    segment.append(gate)
+                    continue
+                state = self.apply_gates(segment, state, nqubits, density_matrix)
+                segment = []
+                if density_matrix:
+                    new_state = gate.apply_density_matrix(self, state, nqubits)
+                else:
+                    new_state = gate.apply(self, state, nqubits)
+                if new_state is not state:
+                    state[...] = new_state
+            state = self.apply_gates(segment, state, nqubits, density_matrix)
+
+            if return_array:
+                return state
+            circuit._final_state = CircuitResult(self, circuit, state, nshots)
+            return circuit._final_state
+
+        except self.oom_error:
+            raise_error(
+                RuntimeError,
+                "State does not fit in the memory budget or the disk space "
+                "available for the memmap backend.",
+            )
+
+    def calculate_probabilities(self, state, qubits, nqubits):
+        if not isinstance(state, np.memmap):
+            return super().calculate_probabilities(state, qubits, nqubits)
+
+        # probabilities are accumulated block by block to avoid loading
+        # the full state to memory
+        rtype = np.real(state).dtype
+        measured = sorted(qubits)
+        nlocal = self.local_qubits(nqubits)
+        nglobal = nqubits - nlocal
+        size = 2**nlocal
+        if len(measured) == nqubits:
+            probs = self.memmap((2**nqubits,), dtype=rtype)
+            for i in range(0, 2**nqubits, size):
+                probs[i : i + size] = np.abs(state[i : i + size]) ** 2
+        else:
+            gmeasured = [q for q in measured if q < nglobal]
+            lmeasured = [q - nglobal for q in measured if q >= nglobal]
+            probs = np.zeros((2 ** len(gmeasured), 2 ** len(lmeasured)), dtype=rtype)
+            for i in range(2**nglobal):
+                bits = [(i >> (nglobal - q - 1)) & 1 for q in gmeasured]
+                index = int("".join(str(b) for b in bits) or "0", 2)
+                block = np.asarray(state[i * size : (i + 1) * size])
+                probs[index] += super().calculate_probabilities(
+                    block, lmeasured, nlocal
+                )
+        probs = np.reshape(probs, len(measured) * (2,))
+        if list(qubits) == measured:
+            return probs.ravel()
+        return self._order_probabilities(probs, qubits, nqubits).ravel()
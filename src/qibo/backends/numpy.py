@@ -4,13 +4,15 @@ import collections
 import numpy as np
 
 from qibo import __version__
-from qibo.backends import einsum_utils
+from qibo import gates as gate_module
+from qibo.backends import distributed, einsum_utils, kernels, sampling
 from qibo.backends.abstract import Backend
 from qibo.backends.matrices import Matrices
-from qibo.config import log, raise_error
+from qibo.config import raise_error
 from qibo.gates import FusedGate
 from qibo.gates.abstract import ParametrizedGate, SpecialGate
-from qibo.states import CircuitResult
+from qibo.gates.special import fused_structure
+from qibo.states import BatchedCircuitResult, CircuitResult
 
 
 class NumpyBackend(Backend):
@@ -20,6 +22,18 @@ class NumpyBackend(Backend):
         self.name = "numpy"
         self.matrices = Matrices(self.dtype)
         self.tensor_types = np.ndarray
+        self.einsum_plans = einsum_utils.EinsumPlanCache()
+        self.scratch = kernels.Scratch()
+        # ``(probabilities, sampler)`` of the last sampled distribution
+        self._sampler = None
+        # distributed circuits are executed with one worker process per piece
+        self.supports_multigpu = True
+        self.workers = distributed.WorkerPool()
+        from qibo.models.planner import ExecutionPlanner
+
+        # fuses gates automatically during circuit execution,
+        # set to ``None`` to execute the circuit queue as given
+        self.planner = ExecutionPlanner()
         self.versions = {"qibo": __version__, "numpy": self.np.__version__}
         self.numeric_types = (
             int,
@@ -33,6 +47,18 @@ class NumpyBackend(Backend):
             np.complex128,
         )
 
+    def __getstate__(self):
+        # modules and the cached sampler are not pickled, for example when
+        # the backend is sent to the processes of parallel executions
+        state = dict(self.__dict__)
+        del state["np"]
+        state["_sampler"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.np = np
+
     def set_precision(self, precision):
         if precision != self.precision:
             if precision == "single":
@@ -105,34 +131,66 @@ class NumpyBackend(Backend):
 
     def asmatrix_parametrized(self, gate):
         """Convert a parametrized gate to its matrix representation in the computational basis."""
+        if gate.cached_matrix is not None:
+            version, matrix = gate.cached_matrix
+            if version == gate.parameters_version:
+                return self.cast(matrix)
         name = gate.__class__.__name__
         return getattr(self.matrices, name)(*gate.parameters)
 
     def asmatrix_fused(self, fgate):
+        # the matrix is calculated again only if the parameters of
+        # one of the fused gates were updated
+        key = (self.name, self.dtype, fgate.parameters_versions)
+        if fgate.cached_matrix is not None and fgate.cached_matrix[0] == key:
+            return fgate.cached_matrix[1]
+        matrix = self._asmatrix_fused(fgate)
+        fgate.cached_matrix = (key, matrix)
+        return matrix
+
+    def _asmatrix_fused(self, fgate):
+        # the fused matrix is calculated by applying the gates to the
+        # identity, which is treated as a state of ``2 * rank`` qubits
         rank = len(fgate.target_qubits)
+        qubit_map = {q: i for i, q in enumerate(fgate.target_qubits)}
         matrix = np.eye(2**rank, dtype=self.dtype)
+        state = np.reshape(matrix, (4**rank,))
+        for targets, controls, structure, gmatrix in self._fused_blocks(fgate):
+            targets = tuple(qubit_map.get(q) for q in targets)
+            controls = tuple(qubit_map.get(q) for q in controls)
+            kernels.apply(
+                state, gmatrix, targets, controls, 2 * rank, structure, self.scratch
+            )
+        return matrix
+
+    def _fused_blocks(self, fgate):
+        """Groups consecutive gates of a fused gate that act on the same qubits.
+
+        Helper method for ``_asmatrix_fused``. The matrices of the gates in
+        each group are multiplied before they are applied to the fused matrix.
+
+        Yields:
+            The target and control qubits, the structure and the matrix of
+            each group.
+        """
+        block = None
         for gate in fgate.gates:
             # transfer gate matrix to numpy as it is more efficient for
             # small tensor calculations
-            gmatrix = gate.asmatrix(self)
-            # Kronecker product with identity is needed to make the
-            # original matrix have shape (2**rank x 2**rank)
-            eye = np.eye(2 ** (rank - len(gate.qubits)), dtype=self.dtype)
-            gmatrix = np.kron(gmatrix, eye)
-            # Transpose the new matrix indices so that it targets the
-            # target qubits of the original gate
-            original_shape = gmatrix.shape
-            gmatrix = np.reshape(gmatrix, 2 * rank * (2,))
-            qubits = list(gate.qubits)
-            indices = qubits + [q for q in fgate.target_qubits if q not in qubits]
-            indices = np.argsort(indices)
-            transpose_indices = list(indices)
-            transpose_indices.extend(indices + rank)
-            gmatrix = np.transpose(gmatrix, transpose_indices)
-            gmatrix = np.reshape(gmatrix, original_shape)
-            # fuse the individual gate matrix to the total ``FusedGate`` matrix
-            matrix = gmatrix @ matrix
-        return matrix
+            gmatrix = np.asarray(self.to_numpy(gate.asmatrix(self)), dtype=self.dtype)
+            if gate.is_controlled_by:
+                qubits = (gate.target_qubits, gate.control_qubits)
+            else:
+                qubits = (gate.qubits, ())
+            if block is not None and block[0] == qubits:
+                structure = fused_structure(block[1], gate.structure)
+                block = (qubits, structure, gmatrix @ block[2])
+            else:
+                if block is not None:
+                    yield block[0] + block[1:]
+                block = (qubits, gate.structure, gmatrix)
+        if block is not None:
+            yield block[0] + block[1:]
 
     def control_matrix(self, gate):
         if len(gate.control_qubits) > 1:
@@ -155,62 +213,155 @@ class NumpyBackend(Backend):
         part2 = self.np.concatenate([zeros, matrix], axis=0)
         return self.np.concatenate([part1, part2], axis=1)
 
-    def apply_gate(self, gate, state, nqubits):
+    def _einsum(self, plan, opstring, *operands):
+        """Calls ``einsum`` using the contraction path cached in the plan."""
+        path = plan.path(opstring, *operands)
+        return self.np.einsum(opstring, *operands, optimize=path)
+
+    def _apply_matrix(self, state, matrix, targets, controls, nqubits, structure):
+        """Applies a gate matrix to a state vector in place using the kernels.
+
+        Helper method for the ``apply_gate`` methods. The kernel is selected
+        according to the ``structure`` of the gate. Density matrices are
+        updated by treating them as state vectors of ``2 * nqubits`` qubits.
+        """
+        shape = state.shape
+        state = self.np.ascontiguousarray(state).ravel()
+        matrix = self.to_numpy(matrix)
+        kernels.apply(
+            state, matrix, targets, controls, nqubits, structure, self.scratch
+        )
+        return self.np.reshape(state, shape)
+
+    @staticmethod
+    def _use_kernels(gate, nqubits):
+        """Checks if the kernels should be used for applying ``gate`` to ``nqubits``."""
+        if gate.structure == "diagonal":
+            return True
+        if gate.structure == "permutation":
+            return nqubits >= kernels.MIN_QUBITS_PERMUTATION
+        return nqubits >= kernels.MIN_QUBITS
+
+    def apply_gate(self, gate, state, nqubits, inplace=False):
+        if not self._use_kernels(gate, nqubits):
+            return self._apply_gate_einsum(gate, state, nqubits)
+        # the kernels update the state in place
+        state = self.cast(state, copy=not inplace)
+        matrix = gate.asmatrix(self)
+        if gate.is_controlled_by:
+            targets, controls = gate.target_qubits, gate.control_qubits
+        else:
+            targets, controls = gate.qubits, ()
+        return self._apply_matrix(
+            state, matrix, targets, controls, nqubits, gate.structure
+        )
+
+    def _apply_gate_einsum(self, gate, state, nqubits):
         state = self.cast(state)
         state = self.np.reshape(state, nqubits * (2,))
         matrix = gate.asmatrix(self)
         if gate.is_controlled_by:
-            matrix = self.np.reshape(matrix, 2 * len(gate.target_qubits) * (2,))
-            ncontrol = len(gate.control_qubits)
-            nactive = nqubits - ncontrol
-            order, targets = einsum_utils.control_order(gate, nqubits)
-            state = self.np.transpose(state, order)
+            plan = self.einsum_plans.get(
+                gate.target_qubits, gate.control_qubits, nqubits
+            )
+            matrix = self.np.reshape(matrix, plan.matrix_shape)
+            state = self.np.transpose(state, plan.order)
             # Apply `einsum` only to the part of the state where all controls
             # are active. This should be `state[-1]`
-            state = self.np.reshape(state, (2**ncontrol,) + nactive * (2,))
-            opstring = einsum_utils.apply_gate_string(targets, nactive)
-            updates = self.np.einsum(opstring, state[-1], matrix)
+            state = self.np.reshape(state, plan.state_shape)
+            updates = self._einsum(plan, plan.opstring, state[-1], matrix)
             # Concatenate the updated part of the state `updates` with the
             # part of of the state that remained unaffected `state[:-1]`.
             state = self.np.concatenate([state[:-1], updates[self.np.newaxis]], axis=0)
             state = self.np.reshape(state, nqubits * (2,))
             # Put qubit indices back to their proper places
+            state = self.np.transpose(state, plan.reverse_order)
+        else:
+            plan = self.einsum_plans.get(gate.qubits, (), nqubits)
+            matrix = self.np.reshape(matrix, plan.matrix_shape)
+            state = self._einsum(plan, plan.opstring, state, matrix)
+        return self.np.reshape(state, (2**nqubits,))
+
+    def apply_gate_batched(self, gate, state, nqubits, matrix=None):
+        batch = int(state.shape[0])
+        state = self.np.reshape(state, (batch,) + nqubits * (2,))
+        if matrix is None:
+            matrix = gate.asmatrix(self)
+        batched_matrix = len(tuple(matrix.shape)) == 3
+        mshape = (batch,) if batched_matrix else ()
+        if gate.is_controlled_by:
+            ntargets = len(gate.target_qubits)
+            matrix = self.np.reshape(matrix, mshape + 2 * ntargets * (2,))
+            ncontrol = len(gate.control_qubits)
+            nactive = nqubits - ncontrol
+            order, targets = einsum_utils.control_order(gate, nqubits)
+            order = [0] + [i + 1 for i in order]
+            state = self.np.transpose(state, order)
+            # Apply `einsum` only to the part of each state where all controls
+            # are active. This should be `state[:, -1]`
+            state = self.np.reshape(state, (batch, 2**ncontrol) + nactive * (2,))
+            opstring = einsum_utils.apply_gate_batched_string(
+                targets, nactive, batched_matrix
+            )
+            updates = self.np.einsum(opstring, state[:, -1], matrix)
+            state = self.np.concatenate(
+                [state[:, :-1], updates[:, self.np.newaxis]], axis=1
+            )
+            state = self.np.reshape(state, (batch,) + nqubits * (2,))
             state = self.np.transpose(state, einsum_utils.reverse_order(order))
         else:
-            matrix = self.np.reshape(matrix, 2 * len(gate.qubits) * (2,))
-            opstring = einsum_utils.apply_gate_string(gate.qubits, nqubits)
+            matrix = self.np.reshape(matrix, mshape + 2 * len(gate.qubits) * (2,))
+            opstring = einsum_utils.apply_gate_batched_string(
+                gate.qubits, nqubits, batched_matrix
+            )
             state = self.np.einsum(opstring, state, matrix)
-        return self.np.reshape(state, (2**nqubits,))
+        return self.np.reshape(state, (batch, 2**nqubits))
+
+    def apply_gate_density_matrix(self, gate, state, nqubits, inplace=False):
+        if not self._use_kernels(gate, 2 * nqubits):
+            return self._apply_gate_density_matrix_einsum(gate, state, nqubits)
+        # the kernels update the state in place
+        state = self.cast(state, copy=not inplace)
+        matrix = gate.asmatrix(self)
+        if gate.is_controlled_by:
+            targets, controls = gate.target_qubits, gate.control_qubits
+        else:
+            targets, controls = gate.qubits, ()
+        # apply the gate to the row indices and its conjugate to the column
+        # indices of the density matrix
+        state = self._apply_matrix(
+            state, matrix, targets, controls, 2 * nqubits, gate.structure
+        )
+        targets = tuple(q + nqubits for q in targets)
+        controls = tuple(q + nqubits for q in controls)
+        matrixc = self.np.conj(matrix)
+        return self._apply_matrix(
+            state, matrixc, targets, controls, 2 * nqubits, gate.structure
+        )
 
-    def apply_gate_density_matrix(self, gate, state, nqubits):
+    def _apply_gate_density_matrix_einsum(self, gate, state, nqubits):
         state = self.cast(state)
         state = self.np.reshape(state, 2 * nqubits * (2,))
         matrix = gate.asmatrix(self)
         if gate.is_controlled_by:
-            matrix = self.np.reshape(matrix, 2 * len(gate.target_qubits) * (2,))
+            plan = self.einsum_plans.get(
+                gate.target_qubits, gate.control_qubits, nqubits, density_matrix=True
+            )
+            matrix = self.np.reshape(matrix, plan.matrix_shape)
             matrixc = self.np.conj(matrix)
-            ncontrol = len(gate.control_qubits)
-            nactive = nqubits - ncontrol
-            n = 2**ncontrol
+            n = 2**plan.ncontrol
 
-            order, targets = einsum_utils.control_order_density_matrix(gate, nqubits)
-            state = self.np.transpose(state, order)
-            state = self.np.reshape(state, 2 * (n,) + 2 * nactive * (2,))
+            state = self.np.transpose(state, plan.order)
+            state = self.np.reshape(state, plan.state_shape)
 
-            leftc, rightc = einsum_utils.apply_gate_density_matrix_controlled_string(
-                targets, nactive
-            )
             state01 = state[: n - 1, n - 1]
-            state01 = self.np.einsum(rightc, state01, matrixc)
+            state01 = self._einsum(plan, plan.rightc, state01, matrixc)
             state10 = state[n - 1, : n - 1]
-            state10 = self.np.einsum(leftc, state10, matrix)
+            state10 = self._einsum(plan, plan.leftc, state10, matrix)
 
-            left, right = einsum_utils.apply_gate_density_matrix_string(
-                targets, nactive
-            )
             state11 = state[n - 1, n - 1]
-            state11 = self.np.einsum(right, state11, matrixc)
-            state11 = self.np.einsum(left, state11, matrix)
+            state11 = self._einsum(plan, plan.right, state11, matrixc)
+            state11 = self._einsum(plan, plan.left, state11, matrix)
 
             state00 = state[range(n - 1)]
             state00 = state00[:, range(n - 1)]
@@ -220,20 +371,17 @@ class NumpyBackend(Backend):
             state10 = self.np.concatenate([state10, state11[self.np.newaxis]], axis=0)
             state = self.np.concatenate([state01, state10[self.np.newaxis]], axis=0)
             state = self.np.reshape(state, 2 * nqubits * (2,))
-            state = self.np.transpose(state, einsum_utils.reverse_order(order))
+            state = self.np.transpose(state, plan.reverse_order)
         else:
-            matrix = self.np.reshape(matrix, 2 * len(gate.qubits) * (2,))
+            plan = self.einsum_plans.get(gate.qubits, (), nqubits, density_matrix=True)
+            matrix = self.np.reshape(matrix, plan.matrix_shape)
             matrixc = self.np.conj(matrix)
-            left, right = einsum_utils.apply_gate_density_matrix_string(
-                gate.qubits, nqubits
-            )
-            state = self.np.einsum(right, state, matrixc)
-            state = self.np.einsum(left, state, matrix)
+            state = self._einsum(plan, plan.right, state, matrixc)
+            state = self._einsum(plan, plan.left, state, matrix)
         return self.np.reshape(state, 2 * (2**nqubits,))
 
     def apply_gate_half_density_matrix(self, gate, state, nqubits):
         state = self.cast(state)
-        state = np.reshape(state, 2 * nqubits * (2,))
         matrix = gate.asmatrix(self)
         if gate.is_controlled_by:  # pragma: no cover
             raise_error(
@@ -242,12 +390,17 @@ class NumpyBackend(Backend):
                 "not implemented for ``controlled_by``"
                 "gates.",
             )
-        else:
-            matrix = np.reshape(matrix, 2 * len(gate.qubits) * (2,))
-            left, _ = einsum_utils.apply_gate_density_matrix_string(
-                gate.qubits, nqubits
+        elif self._use_kernels(gate, 2 * nqubits):
+            # the kernels update the state in place
+            state = self.cast(state, copy=True)
+            return self._apply_matrix(
+                state, matrix, gate.qubits, (), 2 * nqubits, gate.structure
             )
-            state = np.einsum(left, state, matrix)
+        else:
+            state = np.reshape(state, 2 * nqubits * (2,))
+            plan = self.einsum_plans.get(gate.qubits, (), nqubits, density_matrix=True)
+            matrix = np.reshape(matrix, plan.matrix_shape)
+            state = self._einsum(plan, plan.left, state, matrix)
         return np.reshape(state, 2 * (2**nqubits,))
 
     def apply_channel(self, channel, state, nqubits):
@@ -344,26 +497,37 @@ class NumpyBackend(Backend):
             nqubits = circuit.nqubits
             if isinstance(initial_state, CircuitResult):
                 initial_state = initial_state.state()
+            if self.planner is None:
+                queue = circuit.queue
+            else:
+                queue = circuit.plan(self.planner)
 
-            if circuit.density_matrix:
+            if circuit.checkpoints is not None and initial_state is None:
+                state = circuit.checkpoints.execute(self, circuit)
+
+            elif circuit.density_matrix:
                 if initial_state is None:
                     state = self.zero_density_matrix(nqubits)
                 else:
-                    # cast to proper complex type
-                    state = self.cast(initial_state)
+                    # cast to proper complex type and copy because gates
+                    # may update the state in place
+                    state = self.cast(initial_state, copy=True)
 
-                for gate in circuit.queue:
-                    state = gate.apply_density_matrix(self, state, nqubits)
+                for gate in queue:
+                    state = gate.apply_density_matrix(
+                        self, state, nqubits, inplace=True
+                    )
 
             else:
                 if initial_state is None:
                     state = self.zero_state(nqubits)
                 else:
-                    # cast to proper complex type
-                    state = self.cast(initial_state)
+                    # cast to proper complex type and copy because gates
+                    # may update the state in place
+                    state = self.cast(initial_state, copy=True)
 
-                for gate in circuit.queue:
-                    state = gate.apply(self, state, nqubits)
+                for gate in queue:
+                    state = gate.apply(self, state, nqubits, inplace=True)
 
             if return_array:
                 return state
@@ -395,7 +559,9 @@ class NumpyBackend(Backend):
                 for gate in circuit.queue:
                     if gate.symbolic_parameters:
                         gate.substitute_symbols()
-                    state = gate.apply_density_matrix(self, state, nqubits)
+                    state = gate.apply_density_matrix(
+                        self, state, nqubits, inplace=True
+                    )
 
             else:
                 if circuit.accelerators:  # pragma: no cover
@@ -411,7 +577,7 @@ class NumpyBackend(Backend):
                     for gate in circuit.queue:
                         if gate.symbolic_parameters:
                             gate.substitute_symbols()
-                        state = gate.apply(self, state, nqubits)
+                        state = gate.apply(self, state, nqubits, inplace=True)
 
             if circuit.measurement_gate:
                 result = CircuitResult(self, circuit, state, 1)
@@ -428,12 +594,211 @@ class NumpyBackend(Backend):
             circuit._final_state = CircuitResult(self, circuit, results[-1], nshots)
             return results
 
+    def _batched_matrices(self, circuit, parameters):
+        """Stacks the matrices of parametrized gates for each parameter set.
+
+        Helper method for ``execute_circuit_batched``. If the parameters are
+        given as an array of shape ``(batch, nparams)``, the matrices of the
+        parametrized gates of the queue are calculated for all parameter sets
+        with :meth:`qibo.backends.matrices.Matrices.batched`, without updating
+        the circuit. The matrices of other gates, such as fused gates, are
+        calculated after setting the parameters of the circuit to each
+        parameter set and the original circuit parameters are then restored.
+        """
+        trainable = circuit.trainable_gates
+        queue = set(circuit.queue)
+        vectorized = (
+            isinstance(parameters, self.tensor_types)
+            and len(tuple(parameters.shape)) == 2
+            and int(parameters.shape[1]) == trainable.nparams
+        )
+        matrices = {}
+        for gate, start, stop, direct, _, _ in trainable.layout.entries:
+            name = gate.__class__.__name__
+            if (
+                vectorized
+                and gate in queue
+                and direct
+                and not gate.symbolic_parameters
+                and type(gate) is getattr(gate_module, name, None)
+            ):
+                matrices[gate] = self.matrices.batched(name, parameters[:, start:stop])
+
+        pgates = []
+        for gate in circuit.queue:
+            if gate in matrices:
+                continue
+            if gate in trainable.set:
+                pgates.append(gate)
+            elif isinstance(gate, FusedGate) and any(
+                g in trainable.set for g in gate.gates
+            ):
+                pgates.append(gate)
+        if pgates:
+            original_parameters = circuit.get_parameters()
+            stacks = {gate: [] for gate in pgates}
+            for params in parameters:
+                circuit.set_parameters(params)
+                for gate in pgates:
+                    stacks[gate].append(gate.asmatrix(self))
+            circuit.set_parameters(original_parameters)
+            matrices.update((gate, self.np.stack(m)) for gate, m in stacks.items())
+        return matrices
+
+    def execute_circuit_batched(
+        self, circuit, initial_states=None, parameters=None, nshots=None
+    ):
+        if circuit.density_matrix or circuit.repeated_execution:
+            raise_error(
+                NotImplementedError,
+                "Batched execution is available only for state vector "
+                "simulation without collapse measurements or noise.",
+            )
+        if circuit.accelerators:  # pragma: no cover
+            raise_error(
+                NotImplementedError,
+                "Batched execution is not available for distributed circuits.",
+            )
+        for gate in circuit.queue:
+            if isinstance(gate, SpecialGate) and not isinstance(gate, FusedGate):
+                raise_error(
+                    NotImplementedError,
+                    f"Batched execution does not support {gate.name} gates.",
+                )
+
+        nqubits = circuit.nqubits
+        if initial_states is None and parameters is None:
+            raise_error(
+                ValueError,
+                "Batched execution requires a batch of initial states "
+                "or parameters.",
+            )
+
+        if parameters is not None:
+            matrices = self._batched_matrices(circuit, parameters)
+            batch = len(parameters)
+        else:
+            matrices = {}
+
+        if initial_states is None:
+            state = self.zero_state(nqubits)
+            state = self.np.repeat(state[self.np.newaxis], batch, axis=0)
+        else:
+            if isinstance(initial_states, BatchedCircuitResult):
+                initial_states = initial_states.state()
+            state = self.cast(initial_states)
+            if len(tuple(state.shape)) == 1:
+                if parameters is None:
+                    raise_error(
+                        ValueError,
+                        "Batched execution without parameters requires "
+                        "a batch of initial states with shape "
+                        "``(batch, 2 ** nqubits)``.",
+                    )
+                state = self.np.repeat(state[self.np.newaxis], batch, axis=0)
+            elif parameters is not None and int(state.shape[0]) != batch:
+                raise_error(
+                    ValueError,
+                    f"Given {int(state.shape[0])} initial states for "
+                    f"{batch} parameter sets.",
+                )
+
+        try:
+            for gate in circuit.queue:
+                state = self.apply_gate_batched(
+                    gate, state, nqubits, matrices.get(gate)
+                )
+            return BatchedCircuitResult(self, circuit, state, nshots)
+
+        except self.oom_error:  # pragma: no cover
+            raise_error(
+                RuntimeError,
+                f"State batch does not fit in {self.device} memory.",
+            )
+
+    def distributed_operations(self, queues):
+        """Matrices and local qubits of the device gates applied to each state piece.
+
+        Gates that have global controls are placed only in the queues of
+        the pieces in which these controls are 1, with the global controls
+        removed. Their matrix is therefore restricted to the targets.
+        """
+        matrices = {}
+        operations = []
+        for queue in queues:
+            piece_operations = []
+            for gate in queue:
+                if id(gate) not in matrices:
+                    matrix = self.to_numpy(gate.asmatrix(self))
+                    # controlled gate matrices are block diagonal with the
+                    # target matrix in the last block
+                    d = 2 ** len(gate.target_qubits)
+                    matrices[id(gate)] = np.asarray(matrix[-d:, -d:], dtype=self.dtype)
+                piece_operations.append(
+                    (
+                        matrices[id(gate)],
+                        gate.target_qubits,
+                        gate.control_qubits,
+                        gate.structure,
+                    )
+                )
+            operations.append(piece_operations)
+        return operations
+
     def execute_distributed_circuit(
         self, circuit, initial_state=None, nshots=None, return_array=False
     ):
-        raise_error(
-            NotImplementedError, f"{self} does not support distributed execution."
-        )
+        if not circuit.queues.queues:
+            circuit.queues.set(circuit.queue)
+        queues = circuit.queues
+        qubits = queues.qubits
+        try:
+            if isinstance(initial_state, CircuitResult):
+                initial_state = initial_state.state()
+            if initial_state is None:
+                state = self.zero_state(circuit.nqubits)
+            else:
+                state = self.to_numpy(initial_state)
+
+            with distributed.SharedPieces(
+                circuit.ndevices, circuit.nlocal, self.dtype
+            ) as pieces:
+                pieces.from_tensor(state, qubits)
+                special_gates = iter(queues.special_queue)
+                for group in queues.queues:
+                    if group:
+                        operations = self.distributed_operations(group)
+                        self.workers.apply_operations(
+                            pieces, operations, circuit.nlocal
+                        )
+                        continue
+                    gate = next(special_gates)
+                    if isinstance(gate, tuple):  # global SWAP
+                        self.workers.swap(pieces, qubits, *gate)
+                    else:
+                        # special gates are applied to the full state with
+                        # the original qubit order
+                        self.workers.revert_swaps(
+                            pieces, qubits, reversed(gate.swap_reset)
+                        )
+                        state = gate.apply(
+                            self, pieces.to_tensor(qubits), circuit.nqubits
+                        )
+                        pieces.from_tensor(self.to_numpy(state), qubits)
+                        self.workers.revert_swaps(pieces, qubits, gate.swap_reset)
+                state = self.cast(pieces.to_tensor(qubits))
+
+            if return_array:
+                return state
+            else:
+                circuit._final_state = CircuitResult(self, circuit, state, nshots)
+                return circuit._final_state
+
+        except self.oom_error:  # pragma: no cover
+            raise_error(
+                RuntimeError,
+                "State does not fit in the shared memory of the worker processes.",
+            )
 
     def circuit_result_representation(self, result):
         return result.symbolic()
@@ -502,6 +867,32 @@ class NumpyBackend(Backend):
         probs = self.np.sum(state.astype(rtype), axis=unmeasured_qubits)
         return self._order_probabilities(probs, qubits, nqubits).ravel()
 
+    def calculate_marginal_probabilities(self, probabilities, qubits, marginal_qubits):
+        nqubits = len(qubits)
+        positions = [qubits.index(q) for q in marginal_qubits]
+        shape, axes = kernels.merged_shape(positions, nqubits)
+        probs = self.np.reshape(probabilities, shape)
+        # summing the largest axes first reduces the size of the remaining
+        # sums, which is much faster than a single sum over scattered axes
+        traced = [i for i in range(len(shape)) if i not in axes.values()]
+        for i in sorted(traced, key=lambda i: -shape[i]):
+            if shape[i] > 1:
+                probs = self.np.sum(probs, axis=i, keepdims=True)
+        probs = self.np.reshape(probs, len(positions) * (2,))
+        order = sorted(positions)
+        return self.np.transpose(probs, [order.index(i) for i in positions]).ravel()
+
+    def calculate_probabilities_batched(self, states, qubits, nqubits):
+        rtype = self.np.real(states).dtype
+        batch = int(states.shape[0])
+        unmeasured_qubits = tuple(i + 1 for i in range(nqubits) if i not in qubits)
+        states = self.np.abs(states) ** 2
+        states = self.np.reshape(states.astype(rtype), (batch,) + nqubits * (2,))
+        probs = self.np.sum(states, axis=unmeasured_qubits)
+        reduced = {q: i + 1 for i, q in enumerate(sorted(qubits))}
+        probs = self.np.transpose(probs, [0] + [reduced.get(q) for q in qubits])
+        return self.np.reshape(probs, (batch, 2 ** len(qubits)))
+
     def calculate_probabilities_density_matrix(self, state, qubits, nqubits):
         rtype = self.np.real(state).dtype
         order = tuple(sorted(qubits))
@@ -517,10 +908,19 @@ class NumpyBackend(Backend):
     def set_seed(self, seed):
         self.np.random.seed(seed)
 
+    def sampler(self, probabilities):
+        # the alias table is reused while the same distribution is sampled
+        probabilities = np.asarray(self.to_numpy(probabilities), dtype=np.float64)
+        if self._sampler is not None:
+            cached, sampler = self._sampler
+            if np.array_equal(cached, probabilities):
+                return sampler
+        sampler = sampling.Sampler(probabilities)
+        self._sampler = (np.copy(probabilities), sampler)
+        return sampler
+
     def sample_shots(self, probabilities, nshots):
-        return self.np.random.choice(
-            range(len(probabilities)), size=nshots, p=probabilities
-        )
+        return self.sampler(probabilities).sample(nshots)
 
     def aggregate_shots(self, shots):
         return self.np.array(shots, dtype=shots[0].dtype)
@@ -541,21 +941,11 @@ class NumpyBackend(Backend):
 
     def update_frequencies(self, frequencies, probabilities, nsamples):
         samples = self.sample_shots(probabilities, nsamples)
-        res, counts = self.np.unique(samples, return_counts=True)
-        frequencies[res] += counts
+        frequencies += self.np.bincount(samples, minlength=len(frequencies))
         return frequencies
 
     def sample_frequencies(self, probabilities, nshots):
-        from qibo.config import SHOT_BATCH_SIZE
-
-        nprobs = probabilities / self.np.sum(probabilities)
-        frequencies = self.np.zeros(len(nprobs), dtype="int64")
-        for _ in range(nshots // SHOT_BATCH_SIZE):
-            frequencies = self.update_frequencies(frequencies, nprobs, SHOT_BATCH_SIZE)
-        frequencies = self.update_frequencies(
-            frequencies, nprobs, nshots % SHOT_BATCH_SIZE
-        )
-        return collections.Counter({i: f for i, f in enumerate(frequencies) if f > 0})
+        return self.sampler(probabilities).frequencies(nshots)
 
     def apply_bitflips(self, noiseless_samples, bitflip_probabilities):
         fprobs = self.np.array(bitflip_probabilities, dtype="float64")
@@ -616,11 +1006,13 @@ class NumpyBackend(Backend):
 
     def calculate_eigenvalues(self, matrix, k=6):
         if self.issparse(matrix):
-            log.warning(
-                "Calculating sparse matrix eigenvectors because "
-                "sparse modules do not provide ``eigvals`` method."
-            )
-            return self.calculate_eigenvectors(matrix, k=k)[0]
+            if k < matrix.shape[0]:
+                from scipy.sparse.linalg import eigsh
+
+                eigenvalues = eigsh(matrix, k=k, which="SA", return_eigenvectors=False)
+                return np.sort(eigenvalues)
+            else:  # pragma: no cover
+                matrix = self.to_numpy(matrix)
         return np.linalg.eigvalsh(matrix)
 
     def calculate_eigenvectors(self, matrix, k=6):
@@ -628,7 +1020,9 @@ class NumpyBackend(Backend):
             if k < matrix.shape[0]:
                 from scipy.sparse.linalg import eigsh
 
-                return eigsh(matrix, k=k, which="SA")
+                eigenvalues, eigenvectors = eigsh(matrix, k=k, which="SA")
+                order = np.argsort(eigenvalues)
+                return eigenvalues[order], eigenvectors[:, order]
             else:  # pragma: no cover
                 matrix = self.to_numpy(matrix)
         return np.linalg.eigh(matrix)
@@ -645,6 +1039,14 @@ class NumpyBackend(Backend):
             ud = self.np.transpose(self.np.conj(eigenvectors))
             return self.np.matmul(eigenvectors, self.np.matmul(expd, ud))
 
+    def calculate_matrix_exp_product(self, a, matrix, state):
+        if self.issparse(matrix):
+            # the exponential of a sparse matrix is in general dense
+            from scipy.sparse.linalg import expm_multiply
+
+            return expm_multiply(-1j * a * matrix.tocsr(), state)
+        return super().calculate_matrix_exp_product(a, matrix, state)
+
     def calculate_expectation_state(self, hamiltonian, state, normalize):
         statec = self.np.conj(state)
         hstate = hamiltonian @ state
@@ -662,6 +1064,8 @@ class NumpyBackend(Backend):
         return ev
 
     def calculate_hamiltonian_matrix_product(self, matrix1, matrix2):
+        if self.issparse(matrix1) or self.issparse(matrix2):
+            return matrix1 @ matrix2
         return self.np.dot(matrix1, matrix2)
 
     def calculate_hamiltonian_state_product(self, matrix, state):
@@ -677,6 +1081,24 @@ class NumpyBackend(Backend):
                 "Cannot multiply Hamiltonian with " "rank-{} tensor.".format(rank),
             )
 
+    def calculate_hamiltonian_terms_product(
+        self, terms, state, nqubits, constant=0, density_matrix=False
+    ):
+        state = np.ascontiguousarray(self.cast(state))
+        shape = state.shape
+        if density_matrix:
+            # left multiplication acts on the row qubits of the density
+            # matrix viewed as a vector of ``2 * nqubits`` qubits
+            state = np.reshape(state, (-1,))
+            nqubits = 2 * nqubits
+        result = np.multiply(state, constant)
+        for targets, matrix, structure in terms:
+            matrix = self.cast(matrix, dtype=state.dtype)
+            kernels.accumulate(
+                result, state, matrix, targets, nqubits, structure, self.scratch
+            )
+        return np.reshape(result, shape)
+
     def assert_allclose(self, value, target, rtol=1e-7, atol=0.0):
         value = self.to_numpy(value)
         target = self.to_numpy(target)
@@ -693,7 +1115,7 @@ class NumpyBackend(Backend):
         elif name == "test_probabilistic_measurement":
             return {0: 249, 1: 231, 2: 253, 3: 267}
         elif name == "test_unbalanced_probabilistic_measurement":
-            return {0: 171, 1: 148, 2: 161, 3: 520}
+            return {0: 171, 1: 157, 2: 175, 3: 497}
         elif name == "test_post_measurement_bitflips_on_circuit":
             return [
                 {5: 30},
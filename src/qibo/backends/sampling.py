@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Sampling of measurement shots from a fixed probability distribution.
+
+:class:`qibo.backends.sampling.Sampler` prepares an alias table for the
+distribution once, so that every shot is then drawn in constant time using
+a single uniform random number. Shots are drawn in batches of at most
+``qibo.config.SHOT_BATCH_SIZE`` so that large numbers of shots can be
+sampled, or counted, without keeping all of them in memory.
+"""
+import collections
+
+import numpy as np
+
+
+def alias_table(probabilities):
+    """Alias table of a discrete probability distribution.
+
+    The table is built with a vectorized version of the sweep algorithm.
+    Outcomes with weight smaller than the average (small) are paired with the
+    outcomes with larger weight (large) in order, so that each small outcome
+    takes its missing weight from the large outcome whose cumulative excess
+    covers the start of its cumulative deficit. A large outcome whose excess
+    is exhausted takes its own missing weight from the next large outcome.
+
+    Args:
+        probabilities (np.ndarray): Probabilities of all outcomes. They are
+            normalized if they do not sum to one.
+
+    Returns:
+        An array with the probability of keeping each outcome and an array
+        with the alias outcome that is returned otherwise.
+    """
+    nstates = len(probabilities)
+    weights = probabilities * (nstates / np.sum(probabilities))
+    alias = np.arange(nstates)
+    small = np.nonzero(weights < 1)[0]
+    large = np.nonzero(weights >= 1)[0]
+    if len(small) == 0 or len(large) == 0:
+        # uniform distribution up to rounding errors
+        return np.ones(nstates), alias
+
+    deficit = 1 - weights[small]
+    cumulative_deficit = np.cumsum(deficit)
+    cumulative_excess = np.cumsum(weights[large] - 1)
+    donors = np.searchsorted(cumulative_excess, cumulative_deficit - deficit)
+    alias[small] = large[np.minimum(donors, len(large) - 1)]
+
+    # large outcome ``j`` is exhausted after the first small outcome whose
+    # cumulative deficit exceeds the cumulative excess of outcomes ``<= j``
+    excess = cumulative_excess[:-1]
+    exhausted = np.searchsorted(cumulative_deficit, excess, side="right")
+    exhausted = np.minimum(exhausted, len(small) - 1)
+    weights[large[:-1]] = 1 + excess - cumulative_deficit[exhausted]
+    alias[large[:-1]] = large[1:]
+    weights[large[-1]] = 1
+    return np.clip(weights, 0, 1), alias
+
+
+class Sampler:
+    """Draws measurement shots from a fixed probability distribution.
+
+    The alias table of the distribution is prepared when the sampler is
+    created and reused for all subsequent draws.
+
+    Args:
+        probabilities (np.ndarray): Probabilities of all outcomes.
+        random (callable): Function that returns an array of the given size
+            with uniform random numbers in ``[0, 1)``. If ``None``
+            ``np.random.random`` is used, so that the seed set with
+            :meth:`qibo.set_seed` is respected.
+    """
+
+    def __init__(self, probabilities, random=None):
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        self.nstates = len(probabilities)
+        self.random = np.random.random if random is None else random
+        self.keep, self.alias = alias_table(probabilities)
+
+    def sample(self, nshots):
+        """Draws shots in decimal representation as an array of shape ``(nshots,)``."""
+        values = np.asarray(self.random(nshots), dtype=np.float64) * self.nstates
+        samples = values.astype(np.int64)
+        # guard against rounding to ``nstates`` for values close to one
+        samples = np.minimum(samples, self.nstates - 1, out=samples)
+        values -= samples
+        return np.where(values < self.keep[samples], samples, self.alias[samples])
+
+    def batches(self, nshots, batch_size=None):
+        """Generator of the shots drawn in batches.
+
+        Args:
+            nshots (int): Total number of shots.
+            batch_size (int): Maximum number of shots in each batch. If
+                ``None`` the value of ``qibo.config.SHOT_BATCH_SIZE`` is used.
+
+        Yields:
+            Arrays with the shots of each batch in decimal representation.
+        """
+        if batch_size is None:
+            from qibo.config import SHOT_BATCH_SIZE
+
+            batch_size = SHOT_BATCH_SIZE
+        for start in range(0, nshots, batch_size):
+            yield self.sample(min(batch_size, nshots - start))
+
+    def frequencies(self, nshots, batch_size=None):
+        """Number of times each outcome appears in the given number of shots.
+
+        Shots are counted batch by batch, so that they are never all kept
+        in memory. Batches contain at least as many shots as there are
+        outcomes.
+
+        Returns:
+            A ``collections.Counter`` with the frequencies of the outcomes
+            that were observed.
+        """
+        if batch_size is None:
+            from qibo.config import SHOT_BATCH_SIZE
+
+            batch_size = SHOT_BATCH_SIZE
+        # each batch is counted with a pass over all outcomes, so batches are
+        # never smaller than the array of counts that is kept in memory
+        batch_size = max(batch_size, self.nstates)
+        counts = np.zeros(self.nstates, dtype=np.int64)
+        for samples in self.batches(nshots, batch_size):
+            counts += np.bincount(samples, minlength=self.nstates)
+        outcomes = np.nonzero(counts)[0]
+        frequencies = zip(outcomes.tolist(), counts[outcomes].tolist())
+        return collections.Counter(dict(frequencies))
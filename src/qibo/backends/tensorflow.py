@@ -5,6 +5,8 @@ import os
 import numpy as np
 
 from qibo import __version__
+from qibo.backends import sampling
+from qibo.backends.abstract import Backend
 from qibo.backends.matrices import Matrices
 from qibo.backends.numpy import NumpyBackend
 from qibo.config import TF_LOG_LEVEL, log, raise_error
@@ -21,6 +23,40 @@ class TensorflowMatrices(Matrices):
         self.tf = tf
         self.np = tnp
 
+    def batched(self, name, parameters):
+        # matrices are built from vectors of matrix elements with tensorflow
+        # operations, so that gradients with respect to the parameters are
+        # preserved
+        parameters = self.tf.convert_to_tensor(parameters)
+        controlled = name in ("CRX", "CRY", "CRZ", "CU1", "CU2", "CU3")
+        base = name[1:] if controlled else name
+        if base in ("RX", "RY", "U2", "U3"):
+            # all elements of these matrices depend on the parameters, so
+            # the single gate methods work with vectors of parameters
+            matrix = getattr(self, base)(*self.tf.unstack(parameters, axis=1))
+            matrix = self.tf.transpose(matrix, (2, 0, 1))
+        elif base in ("RZ", "U1"):
+            theta = parameters[:, 0]
+            if base == "RZ":
+                phase = self.np.exp(0.5j * theta)
+                diagonal = [self.np.conj(phase), phase]
+            else:
+                phase = self.np.exp(1j * theta)
+                diagonal = [self.np.ones_like(phase), phase]
+            diagonal = self.tf.cast(self.tf.stack(diagonal, axis=1), self.dtype)
+            matrix = self.tf.linalg.diag(diagonal)
+        else:
+            # other gates are vectorized over the batch by tensorflow
+            def matrix(params):
+                return getattr(self, name)(*self.tf.unstack(params))
+
+            return self.tf.vectorized_map(matrix, parameters)
+        if controlled:
+            matrix = self.tf.pad(matrix, [[0, 0], [2, 0], [2, 0]])
+            identity = self.tf.constant([1, 1, 0, 0], dtype=self.dtype)
+            matrix += self.tf.linalg.diag(identity)
+        return matrix
+
     def RX(self, theta):
         cos = self.np.cos(theta / 2.0) + 0j
         isin = -1j * self.np.sin(theta / 2.0)
@@ -162,6 +198,22 @@ class TensorflowMatrices(Matrices):
         return self.tf.cast(u, dtype=self.dtype)
 
 
+class TensorflowSampler(sampling.Sampler):
+    """Sampler that draws shots using ``tf.random.categorical``.
+
+    Redefined because ``tnp.random.choice`` is not available and so that
+    the seed of ``tf.random`` is respected.
+    """
+
+    def __init__(self, backend, probabilities):
+        self.tf = backend.tf
+        self.nstates = int(probabilities.shape[0])
+        self.logits = self.tf.math.log(probabilities)[self.tf.newaxis]
+
+    def sample(self, nshots):
+        return self.tf.random.categorical(self.logits, nshots)[0]
+
+
 class TensorflowBackend(NumpyBackend):
     def __init__(self):
         super().__init__()
@@ -173,6 +225,11 @@ class TensorflowBackend(NumpyBackend):
         tnp.experimental_enable_numpy_behavior()
         self.tf = tf
         self.np = tnp
+        # fused gate matrices are calculated with numpy which breaks
+        # automatic differentiation so gates are not fused automatically
+        self.planner = None
+        # distributed execution is implemented only for the numpy kernels
+        self.supports_multigpu = False
 
         self.versions = {
             "qibo": __version__,
@@ -252,9 +309,40 @@ class TensorflowBackend(NumpyBackend):
         return self.tf.cast(npmatrix, dtype=self.dtype)
 
     def asmatrix_fused(self, gate):
-        npmatrix = super().asmatrix_fused(gate)
+        # fused matrices are not cached because parameters given as
+        # ``tf.Variable`` may be updated without using the setter
+        npmatrix = super()._asmatrix_fused(gate)
         return self.tf.cast(npmatrix, dtype=self.dtype)
 
+    def apply_gate(self, gate, state, nqubits, inplace=False):
+        # redefining this because tensorflow tensors cannot be updated in place
+        return self._apply_gate_einsum(gate, state, nqubits)
+
+    def apply_gate_density_matrix(self, gate, state, nqubits, inplace=False):
+        # redefining this because tensorflow tensors cannot be updated in place
+        return self._apply_gate_density_matrix_einsum(gate, state, nqubits)
+
+    def apply_gate_half_density_matrix(self, gate, state, nqubits):
+        # redefining this because tensorflow tensors cannot be updated in place
+        state = self.cast(state)
+        state = self.np.reshape(state, 2 * nqubits * (2,))
+        matrix = gate.asmatrix(self)
+        if gate.is_controlled_by:  # pragma: no cover
+            raise_error(
+                NotImplementedError,
+                "Gate density matrix half call is "
+                "not implemented for ``controlled_by``"
+                "gates.",
+            )
+        plan = self.einsum_plans.get(gate.qubits, (), nqubits, density_matrix=True)
+        matrix = self.np.reshape(matrix, plan.matrix_shape)
+        state = self._einsum(plan, plan.left, state, matrix)
+        return self.np.reshape(state, 2 * (2**nqubits,))
+
+    def _einsum(self, plan, opstring, *operands):
+        # redefining this because ``tnp.einsum`` does not accept explicit paths
+        return self.np.einsum(opstring, *operands)
+
     def execute_circuit(
         self, circuit, initial_state=None, nshots=None, return_array=False
     ):
@@ -265,11 +353,15 @@ class TensorflowBackend(NumpyBackend):
         with self.tf.device(self.device):
             return super().execute_circuit_repeated(circuit, initial_state, nshots)
 
-    def sample_shots(self, probabilities, nshots):
-        # redefining this because ``tnp.random.choice`` is not available
-        logits = self.tf.math.log(probabilities)[self.tf.newaxis]
-        samples = self.tf.random.categorical(logits, nshots)[0]
-        return samples
+    def execute_distributed_circuit(
+        self, circuit, initial_state=None, nshots=None, return_array=False
+    ):
+        raise_error(
+            NotImplementedError, f"{self} does not support distributed execution."
+        )
+
+    def sampler(self, probabilities):
+        return TensorflowSampler(self, probabilities)
 
     def samples_to_binary(self, samples, nqubits):
         # redefining this because ``tnp.right_shift`` is not available
@@ -325,6 +417,15 @@ class TensorflowBackend(NumpyBackend):
             )
         return super().calculate_hamiltonian_matrix_product(matrix1, matrix2)
 
+    def calculate_hamiltonian_terms_product(
+        self, terms, state, nqubits, constant=0, density_matrix=False
+    ):
+        # redefining this because the numpy kernels accumulate the terms in
+        # place, the terms are applied as gates to keep gradients
+        return Backend.calculate_hamiltonian_terms_product(
+            self, terms, state, nqubits, constant, density_matrix
+        )
+
     def calculate_hamiltonian_state_product(self, matrix, state):
         rank = len(tuple(state.shape))
         if rank == 1:  # vector
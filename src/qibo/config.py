@@ -18,6 +18,18 @@ if "TF_LOG_LEVEL" in os.environ:  # pragma: no cover
 # characters used in einsum strings
 EINSUM_CHARS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
 
+# Maximum number of einsum plans kept in the cache of the numpy backend
+EINSUM_PLAN_CACHE_SIZE = 1024
+
+# Maximum number of qubits in the gates fused by the execution planner
+PLANNER_MAX_QUBITS = 5
+
+# Memory budget in bytes for the blocks of the state loaded by the memmap backend
+MEMMAP_MEMORY = 2**30
+
+# Memory budget in bytes for the intermediate states stored by circuit checkpoints
+CHECKPOINT_MEMORY = 2**30
+
 # Entanglement entropy eigenvalue cut-off
 # Eigenvalues smaller than this cut-off are ignored in entropy calculation
 EIGVAL_CUTOFF = 1e-14
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+Gradients of Hamiltonian expectation values with respect to circuit parameters.
+"""
+import numpy as np
+
+from qibo import gates
+from qibo.config import raise_error
+
+# gates whose parameters enter through rotations generated by operators with
+# two eigenvalues separated by one, for which the two-term shift rule is exact
+PARAMETER_SHIFT_GATES = {
+    "RX",
+    "RY",
+    "RZ",
+    "RXX",
+    "RYY",
+    "RZZ",
+    "U1",
+    "U2",
+    "U3",
+    "CU1",
+}
+
+# shifts and weights that give the exact derivative of a matrix whose elements
+# depend on each parameter through ``exp(±i theta / 2)`` and ``exp(±i theta)``
+_MATRIX_SHIFTS = ((np.pi, 0.5 - np.sqrt(0.5)), (np.pi / 2, 1.0))
+
+
+def _unsupported(circuit):
+    """Reason why the gradient of a circuit cannot be calculated, if any."""
+    if circuit.density_matrix or circuit.repeated_execution:
+        return (
+            "Gradients are available only for state vector simulation "
+            "without collapse measurements or noise."
+        )
+    if circuit.accelerators:  # pragma: no cover
+        return "Gradients are not available for distributed circuits."
+    trainable = circuit.trainable_gates.set
+    for gate in circuit.queue:
+        if isinstance(gate, gates.FusedGate):
+            if any(g in trainable for g in gate.gates):
+                return "Gradients are not available for fused trainable gates."
+        elif isinstance(gate, (gates.SpecialGate, gates.Channel, gates.M)):
+            return f"Gradients are not available for {gate.name} gates."
+    for gate in circuit.trainable_gates:
+        if isinstance(gate, (gates.Unitary, gates.GeneralizedfSim)):
+            return f"Cannot differentiate the parameters of {gate.name}."
+    return None
+
+
+def is_differentiable(circuit):
+    """Checks if the gradient of a circuit can be calculated.
+
+    This is the case for state vector simulation of circuits without
+    collapse measurements, noise channels or special gates, and without
+    trainable :class:`qibo.gates.Unitary` or :class:`qibo.gates.GeneralizedfSim`
+    gates.
+    """
+    return _unsupported(circuit) is None
+
+
+def check_circuit(circuit):
+    """Raises ``NotImplementedError`` if the gradient of a circuit is not available."""
+    reason = _unsupported(circuit)
+    if reason is not None:
+        raise_error(NotImplementedError, reason)
+
+
+def _expectation(circuit, hamiltonian, initial_state):
+    backend = hamiltonian.backend
+    state = backend.execute_circuit(circuit, initial_state, return_array=True)
+    return float(np.real(backend.to_numpy(hamiltonian.expectation(state))))
+
+
+def parameter_shift(circuit, hamiltonian, initial_state=None):
+    """Gradient of a Hamiltonian expectation value using the parameter shift rule.
+
+    The derivative with respect to each parameter is calculated from two
+    executions of the circuit, with the parameter shifted by :math:`\\pm \\pi / 2`.
+    The rule is exact for the gates listed in
+    ``qibo.derivative.PARAMETER_SHIFT_GATES``.
+
+    Args:
+        circuit (:class:`qibo.models.circuit.Circuit`): Circuit that prepares
+            the state. Its trainable parameters are restored after the
+            calculation.
+        hamiltonian (:class:`qibo.hamiltonians.abstract.AbstractHamiltonian`):
+            Hamiltonian whose expectation value is differentiated.
+        initial_state (np.ndarray): Initial state of the circuit execution.
+            If ``None`` the zero state is used.
+
+    Returns:
+        Array with the derivatives with respect to the flat list of trainable
+        parameters, in the order used by
+        :meth:`qibo.models.circuit.Circuit.set_parameters`.
+    """
+    check_circuit(circuit)
+    for gate in circuit.trainable_gates:
+        name = gate.__class__.__name__
+        if gate.is_controlled_by or name not in PARAMETER_SHIFT_GATES:
+            raise_error(
+                NotImplementedError,
+                f"Parameter shift rule is not available for {gate.name}.",
+            )
+
+    gradient = []
+    for gate in circuit.trainable_gates:
+        parameters = tuple(gate.parameters)
+        for i, theta in enumerate(parameters):
+            shifted = list(parameters)
+            shifted[i] = theta + np.pi / 2
+            gate.parameters = shifted
+            forward = _expectation(circuit, hamiltonian, initial_state)
+            shifted[i] = theta - np.pi / 2
+            gate.parameters = shifted
+            backward = _expectation(circuit, hamiltonian, initial_state)
+            gradient.append((forward - backward) / 2)
+        gate.parameters = parameters
+    return np.array(gradient)
+
+
+def _matrix_derivatives(gate, backend):
+    """Derivatives of the matrix of a parametrized gate for each of its parameters."""
+    matrix = getattr(backend.matrices, gate.__class__.__name__)
+    parameters = list(gate.parameters)
+    derivatives = []
+    for i, theta in enumerate(parameters):
+        derivative = 0
+        for shift, weight in _MATRIX_SHIFTS:
+            parameters[i] = theta + shift
+            forward = backend.to_numpy(matrix(*parameters))
+            parameters[i] = theta - shift
+            backward = backend.to_numpy(matrix(*parameters))
+            derivative = derivative + weight * (forward - backward) / 2
+        parameters[i] = theta
+        derivatives.append(derivative)
+    return derivatives
+
+
+def _matrix_gate(matrix, gate):
+    """Gate that applies ``matrix`` to the qubits of ``gate``.
+
+    For gates with controls ``matrix`` acts on the targets when all controls
+    are active.
+    """
+    if gate.is_controlled_by:
+        return gates.Unitary(matrix, *gate.target_qubits).controlled_by(
+            *gate.control_qubits
+        )
+    return gates.Unitary(matrix, *gate.qubits)
+
+
+def _derivative_gate(derivative, gate):
+    """Gate that applies the derivative of the matrix of ``gate``."""
+    if gate.is_controlled_by:
+        # the derivative vanishes when one of the controls is not active
+        d = len(derivative)
+        matrix = np.zeros(2 * (2 ** len(gate.control_qubits) * d,), dtype=complex)
+        matrix[-d:, -d:] = derivative
+        return gates.Unitary(matrix, *gate.control_qubits, *gate.target_qubits)
+    return gates.Unitary(derivative, *gate.qubits)
+
+
+def adjoint(circuit, hamiltonian, initial_state=None):
+    """Gradient of a Hamiltonian expectation value using the adjoint method.
+
+    The final state :math:`|\\psi \\rangle` is calculated by a single circuit
+    execution. The gates are then undone one by one from the end of the
+    circuit, applying their inverse both to :math:`|\\psi \\rangle` and to
+    :math:`H|\\psi \\rangle`, so that the derivative with respect to each
+    parameter is obtained from an overlap of these states
+    (`arXiv:2009.02823 <https://arxiv.org/abs/2009.02823>`_). The cost is
+    similar to two circuit executions, independently of the number of
+    parameters, and only three state vectors are kept in memory.
+
+    Args:
+        circuit (:class:`qibo.models.circuit.Circuit`): Circuit that prepares
+            the state.
+        hamiltonian (:class:`qibo.hamiltonians.abstract.AbstractHamiltonian`):
+            Hermitian Hamiltonian whose expectation value is differentiated.
+        initial_state (np.ndarray): Initial state of the circuit execution.
+            If ``None`` the zero state is used.
+
+    Returns:
+        Array with the derivatives with respect to the flat list of trainable
+        parameters, in the order used by
+        :meth:`qibo.models.circuit.Circuit.set_parameters`.
+    """
+    check_circuit(circuit)
+    backend = hamiltonian.backend
+    nqubits = circuit.nqubits
+
+    offsets = {}
+    nparams = 0
+    for gate in circuit.trainable_gates:
+        offsets[gate] = nparams
+        nparams += gate.nparams
+    gradient = np.zeros(nparams)
+
+    state = backend.execute_circuit(circuit, initial_state, return_array=True)
+    costate = hamiltonian @ state
+    for gate in reversed(circuit.queue):
+        matrix = backend.to_numpy(gate.asmatrix(backend))
+        inverse = _matrix_gate(np.conj(matrix.T), gate)
+        state = backend.apply_gate(inverse, state, nqubits)
+        if gate in offsets:
+            for i, derivative in enumerate(_matrix_derivatives(gate, backend)):
+                dgate = _derivative_gate(derivative, gate)
+                dstate = backend.apply_gate(dgate, state, nqubits)
+                overlap = backend.np.vdot(costate, dstate)
+                gradient[offsets[gate] + i] += 2 * np.real(backend.to_numpy(overlap))
+        costate = backend.apply_gate(inverse, costate, nqubits)
+    return gradient
+
+
+def gradient(circuit, hamiltonian, method="adjoint", initial_state=None):
+    """Gradient of a Hamiltonian expectation value for the parameters of a circuit.
+
+    Args:
+        circuit (:class:`qibo.models.circuit.Circuit`): Circuit that prepares
+            the state.
+        hamiltonian (:class:`qibo.hamiltonians.abstract.AbstractHamiltonian`):
+            Hamiltonian whose expectation value is differentiated.
+        method (str): ``'adjoint'`` for :meth:`qibo.derivative.adjoint` or
+            ``'parameter_shift'`` for :meth:`qibo.derivative.parameter_shift`.
+        initial_state (np.ndarray): Initial state of the circuit execution.
+            If ``None`` the zero state is used.
+
+    Returns:
+        Array with the derivatives with respect to the flat list of trainable
+        parameters.
+    """
+    if method == "adjoint":
+        return adjoint(circuit, hamiltonian, initial_state)
+    elif method == "parameter_shift":
+        return parameter_shift(circuit, hamiltonian, initial_state)
+    raise_error(ValueError, f"Unknown gradient method {method}.")
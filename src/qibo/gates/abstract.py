@@ -27,11 +27,19 @@ class Gate:
             target_qubits (tuple): Tuple with ids of target qubits.
             control_qubits (tuple): Tuple with ids of control qubits sorted in
                 increasing order.
+            structure (str): Structure of the gate matrix that backends may
+                use to apply the gate more efficiently. ``"diagonal"`` for
+                diagonal matrices, ``"permutation"`` for matrices with a
+                single non-zero element in every row and column (permutation
+                matrices up to phases) and ``"dense"`` for all other gates.
+                For controlled gates it refers to the matrix that acts on
+                the target qubits.
         """
         from qibo import config
 
         self.name = None
         self.is_controlled_by = False
+        self.structure = "dense"
         # args for creating gate
         self.init_args = []
         self.init_kwargs = {}
@@ -265,11 +273,20 @@ class Gate:
         backend = GlobalBackend()
         return self.asmatrix(backend)
 
-    def apply(self, backend, state, nqubits):
-        return backend.apply_gate(self, state, nqubits)
+    def apply(self, backend, state, nqubits, inplace=False):
+        """Applies the gate to a state vector.
 
-    def apply_density_matrix(self, backend, state, nqubits):
-        return backend.apply_gate_density_matrix(self, state, nqubits)
+        If ``inplace`` is ``True`` the backend may overwrite ``state``. This
+        is used by circuit executions, which own the state they update.
+        """
+        return backend.apply_gate(self, state, nqubits, inplace=inplace)
+
+    def apply_density_matrix(self, backend, state, nqubits, inplace=False):
+        """Applies the gate to a density matrix.
+
+        If ``inplace`` is ``True`` the backend may overwrite ``state``.
+        """
+        return backend.apply_gate_density_matrix(self, state, nqubits, inplace=inplace)
 
 
 class SpecialGate(Gate):
@@ -298,6 +315,12 @@ class ParametrizedGate(Gate):
         self.parameter_names = "theta"
         self.nparams = 1
         self.trainable = trainable
+        # increased every time new parameters are set so that matrices
+        # that depend on them, such as fused gate matrices, are updated
+        self.parameters_version = 0
+        # ``(parameters_version, matrix)`` for matrices calculated in bulk
+        # by ``Circuit.set_parameters``
+        self.cached_matrix = None
 
     @Gate.parameters.setter
     def parameters(self, x):
@@ -335,6 +358,7 @@ class ParametrizedGate(Gate):
                 self.symbolic_parameters[i] = v
             params[i] = v
         self._parameters = tuple(params)
+        self.parameters_version += 1
 
         # set parameters in device gates
         for gate in self.device_gates:  # pragma: no cover
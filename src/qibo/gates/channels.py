@@ -27,12 +27,12 @@ class Channel(Gate):
             "`on_qubits` method is not available " "for the `Channel` gate.",
         )
 
-    def apply(self, backend, state, nqubits):  # pragma: no cover
+    def apply(self, backend, state, nqubits, inplace=False):  # pragma: no cover
         raise_error(
             NotImplementedError, f"{self.name} cannot be applied to state vector."
         )
 
-    def apply_density_matrix(self, backend, state, nqubits):
+    def apply_density_matrix(self, backend, state, nqubits, inplace=False):
         return backend.apply_channel_density_matrix(self, state, nqubits)
 
 
@@ -156,7 +156,7 @@ class UnitaryChannel(KrausChannel):
 
         self.init_args = [probabilities, self.gates]
 
-    def apply(self, backend, state, nqubits):
+    def apply(self, backend, state, nqubits, inplace=False):
         return backend.apply_channel(self, state, nqubits)
 
 
@@ -267,7 +267,7 @@ class ResetChannel(Channel):
         self.init_args = [q]
         self.init_kwargs = {"p0": p0, "p1": p1}
 
-    def apply_density_matrix(self, backend, state, nqubits):
+    def apply_density_matrix(self, backend, state, nqubits, inplace=False):
         return backend.reset_error_density_matrix(self, state, nqubits)
 
 
@@ -359,7 +359,7 @@ class ThermalRelaxationChannel(Channel):
             pz = p_reset + np.exp(-time / t2) * (1 - np.exp(time / t1))
             self.coefficients.append(pz)
 
-    def apply_density_matrix(self, backend, state, nqubits):
+    def apply_density_matrix(self, backend, state, nqubits, inplace=False):
         q = self.target_qubits[0]
         if self.t1 < self.t2:
             from qibo.gates import Unitary
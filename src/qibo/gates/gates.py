@@ -77,6 +77,7 @@ class X(Gate):
     def __init__(self, q):
         super().__init__()
         self.name = "x"
+        self.structure = "permutation"
         self.target_qubits = (q,)
         self.init_args = [q]
 
@@ -172,6 +173,7 @@ class Y(Gate):
     def __init__(self, q):
         super().__init__()
         self.name = "y"
+        self.structure = "permutation"
         self.target_qubits = (q,)
         self.init_args = [q]
 
@@ -186,6 +188,7 @@ class Z(Gate):
     def __init__(self, q):
         super().__init__()
         self.name = "z"
+        self.structure = "diagonal"
         self.target_qubits = (q,)
         self.init_args = [q]
 
@@ -217,6 +220,7 @@ class S(Gate):
     def __init__(self, q):
         super().__init__()
         self.name = "s"
+        self.structure = "diagonal"
         self.target_qubits = (q,)
         self.init_args = [q]
 
@@ -242,6 +246,7 @@ class SDG(Gate):
     def __init__(self, q):
         super().__init__()
         self.name = "sdg"
+        self.structure = "diagonal"
         self.target_qubits = (q,)
         self.init_args = [q]
 
@@ -267,6 +272,7 @@ class T(Gate):
     def __init__(self, q):
         super().__init__()
         self.name = "t"
+        self.structure = "diagonal"
         self.target_qubits = (q,)
         self.init_args = [q]
 
@@ -292,6 +298,7 @@ class TDG(Gate):
     def __init__(self, q):
         super().__init__()
         self.name = "tdg"
+        self.structure = "diagonal"
         self.target_qubits = (q,)
         self.init_args = [q]
 
@@ -309,6 +316,7 @@ class I(ParametrizedGate):
     def __init__(self, *q):
         super().__init__()
         self.name = "id"
+        self.structure = "diagonal"
         self.target_qubits = tuple(q)
         self.init_args = q
         # save the number of target qubits as parameter
@@ -320,6 +328,7 @@ class Align(ParametrizedGate):
     def __init__(self, *q):
         super().__init__()
         self.name = "align"
+        self.structure = "diagonal"
         self.target_qubits = tuple(q)
         self.init_args = q
         # save the number of target qubits as parameter
@@ -442,6 +451,7 @@ class RZ(_Rn_):
     def __init__(self, q, theta, trainable=True):
         super().__init__(q, theta, trainable)
         self.name = "rz"
+        self.structure = "diagonal"
         self._controlled_gate = CRZ
 
 
@@ -498,6 +508,7 @@ class U1(_Un_):
     def __init__(self, q, theta, trainable=True):
         super().__init__(q, trainable=trainable)
         self.name = "u1"
+        self.structure = "diagonal"
         self._controlled_gate = CU1
         self.nparams = 1
         self.parameters = theta
@@ -609,6 +620,7 @@ class CNOT(Gate):
     def __init__(self, q0, q1):
         super().__init__()
         self.name = "cx"
+        self.structure = "permutation"
         self.control_qubits = (q0,)
         self.target_qubits = (q1,)
         self.init_args = [q0, q1]
@@ -639,6 +651,7 @@ class CZ(Gate):
     def __init__(self, q0, q1):
         super().__init__()
         self.name = "cz"
+        self.structure = "diagonal"
         self.control_qubits = (q0,)
         self.target_qubits = (q1,)
         self.init_args = [q0, q1]
@@ -755,6 +768,7 @@ class CRZ(_CRn_):
     def __init__(self, q0, q1, theta, trainable=True):
         super().__init__(q0, q1, theta, trainable)
         self.name = "crz"
+        self.structure = "diagonal"
 
 
 class _CUn_(ParametrizedGate):
@@ -805,6 +819,7 @@ class CU1(_CUn_):
     def __init__(self, q0, q1, theta, trainable=True):
         super().__init__(q0, q1, trainable=trainable)
         self.name = "cu1"
+        self.structure = "diagonal"
         self.nparams = 1
         self.parameters = theta
         self.init_kwargs = {"theta": theta, "trainable": trainable}
@@ -926,6 +941,7 @@ class SWAP(Gate):
     def __init__(self, q0, q1):
         super().__init__()
         self.name = "swap"
+        self.structure = "permutation"
         self.target_qubits = (q0, q1)
         self.init_args = [q0, q1]
 
@@ -951,6 +967,7 @@ class FSWAP(Gate):
     def __init__(self, q0, q1):
         super().__init__()
         self.name = "fswap"
+        self.structure = "permutation"
         self.target_qubits = (q0, q1)
         self.init_args = [q0, q1]
 
@@ -1163,6 +1180,7 @@ class RZZ(_Rnn_):
     def __init__(self, q0, q1, theta, trainable=True):
         super().__init__(q0, q1, theta, trainable)
         self.name = "rzz"
+        self.structure = "diagonal"
 
 
 class TOFFOLI(Gate):
@@ -1177,6 +1195,7 @@ class TOFFOLI(Gate):
     def __init__(self, q0, q1, q2):
         super().__init__()
         self.name = "ccx"
+        self.structure = "permutation"
         self.control_qubits = (q0, q1)
         self.target_qubits = (q2,)
         self.init_args = [q0, q1, q2]
@@ -1254,6 +1273,7 @@ class Unitary(ParametrizedGate):
 
         shape = self.parameters[0].shape
         self._parameters = (np.reshape(x, shape),)
+        self.parameters_version += 1
         for gate in self.device_gates:  # pragma: no cover
             gate.parameters = x
 
@@ -237,7 +237,7 @@ class M(Gate):
             NotImplementedError, "Measurement gates do not have matrix representation."
         )
 
-    def apply(self, backend, state, nqubits):
+    def apply(self, backend, state, nqubits, inplace=False):
         qubits = sorted(self.target_qubits)
         # measure and get result
         probs = backend.calculate_probabilities(state, qubits, nqubits)
@@ -249,7 +249,7 @@ class M(Gate):
         # collapse state
         return backend.collapse_state(state, qubits, shot, nqubits)
 
-    def apply_density_matrix(self, backend, state, nqubits):
+    def apply_density_matrix(self, backend, state, nqubits, inplace=False):
         qubits = sorted(self.target_qubits)
         # measure and get result
         probs = backend.calculate_probabilities_density_matrix(state, qubits, nqubits)
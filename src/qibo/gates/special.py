@@ -18,17 +18,31 @@ class CallbackGate(SpecialGate):
         self.callback = callback
         self.init_args = [callback]
 
-    def apply(self, backend, state, nqubits):
+    def apply(self, backend, state, nqubits, inplace=False):
         self.callback.nqubits = nqubits
         self.callback.apply(backend, state)
         return state
 
-    def apply_density_matrix(self, backend, state, nqubits):
+    def apply_density_matrix(self, backend, state, nqubits, inplace=False):
         self.callback.nqubits = nqubits
         self.callback.apply_density_matrix(backend, state)
         return state
 
 
+def fused_structure(structure1, structure2):
+    """Structure of the product of two matrices with the given structures.
+
+    Products of diagonal matrices are diagonal and products of
+    permutation matrices (up to phases) are also permutations.
+    """
+    structures = {structure1, structure2}
+    if structures == {"diagonal"}:
+        return "diagonal"
+    if structures <= {"diagonal", "permutation"}:
+        return "permutation"
+    return "dense"
+
+
 class FusedGate(SpecialGate):
     """Collection of gates that will be fused and applied as single gate during simulation.
 
@@ -39,6 +53,9 @@ class FusedGate(SpecialGate):
     def __init__(self, *q):
         super().__init__()
         self.name = "fused"
+        # the structure of the fused gate is updated when gates are added
+        # starting from the identity
+        self.structure = "diagonal"
         self.target_qubits = tuple(sorted(q))
         self.init_args = list(q)
         self.qubit_set = set(q)
@@ -48,13 +65,16 @@ class FusedGate(SpecialGate):
 
         self.left_neighbors = {}
         self.right_neighbors = {}
+        # matrix cached by the backend with the key used to validate it
+        self.cached_matrix = None
 
     @classmethod
     def from_gate(cls, gate):
         fgate = cls(*gate.qubits)
         fgate.append(gate)
-        if isinstance(gate, SpecialGate):
-            # special gates do not participate in fusion
+        if isinstance(gate, SpecialGate) and not isinstance(gate, cls):
+            # special gates do not participate in fusion, except from
+            # gates that were already fused
             fgate.marked = True
         return fgate
 
@@ -66,6 +86,8 @@ class FusedGate(SpecialGate):
             self.gates = gate.gates + self.gates
         else:
             self.gates = [gate] + self.gates
+        self._fuse_structure(gate)
+        self.cached_matrix = None
 
     def append(self, gate):
         self.qubit_set = self.qubit_set | set(gate.qubits)
@@ -75,10 +97,30 @@ class FusedGate(SpecialGate):
             self.gates.extend(gate.gates)
         else:
             self.gates.append(gate)
+        self._fuse_structure(gate)
+        self.cached_matrix = None
+
+    def _fuse_structure(self, gate):
+        """Updates the structure of the fused gate when ``gate`` is added."""
+        self.structure = fused_structure(self.structure, gate.structure)
 
     def __iter__(self):
         return iter(self.gates)
 
+    @property
+    def parameters_versions(self):
+        """Versions of the parameters of all parametrized gates that are fused.
+
+        These change every time one of the gates receives new parameters,
+        for example through :meth:`qibo.models.circuit.Circuit.set_parameters`,
+        and are used to invalidate the cached matrix of the fused gate.
+        """
+        return tuple(
+            gate.parameters_version
+            for gate in self.gates
+            if isinstance(gate, ParametrizedGate)
+        )
+
     def _dagger(self):
         dagger = self.__class__(*self.init_args)
         for gate in self.gates[::-1]:
@@ -1,3 +1,5 @@
 # -*- coding: utf-8 -*-
+from qibo.hamiltonians.diagonal import DiagonalHamiltonian
 from qibo.hamiltonians.hamiltonians import *
 from qibo.hamiltonians.models import TFIM, XXZ, MaxCut, X, Y, Z
+from qibo.hamiltonians.pauli import PauliHamiltonian
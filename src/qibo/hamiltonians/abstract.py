@@ -70,6 +70,16 @@ class AbstractHamiltonian:
         """
         raise_error(NotImplementedError)
 
+    def exp_matmul(self, a, state):
+        """Computes the product of exp(-1j * a * H) with a state vector.
+
+        Args:
+            a (complex): Complex number to multiply Hamiltonian before
+                exponentiation.
+            state (array): State vector to multiply.
+        """
+        return (self.exp(a) @ state[:, self.backend.np.newaxis])[:, 0]
+
     @abstractmethod
     def expectation(self, state, normalize=False):  # pragma: no cover
         """Computes the real expectation value for a given state.
@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 from abc import ABC, abstractmethod
 
+import numpy as np
+
 from qibo.config import raise_error
 from qibo.hamiltonians import hamiltonians, terms
+from qibo.hamiltonians.abstract import AbstractHamiltonian
 
 
 class AdiabaticHamiltonian(ABC):
@@ -57,9 +60,87 @@ class AdiabaticHamiltonian(ABC):
         raise_error(NotImplementedError)
 
 
+class InterpolatedHamiltonian(AbstractHamiltonian):
+    """Adiabatic Hamiltonian ``(1 - s) * H0 + s * H1`` at a fixed value of ``s``.
+
+    Products with states are calculated as ``(1 - s) * (H0 @ state) + s * (H1 @ state)``
+    without constructing the interpolated Hamiltonian. The interpolated
+    Hamiltonian is constructed only when its matrix, exponential or
+    eigenvalues are needed and is then reused.
+
+    Args:
+        h0 (:class:`qibo.hamiltonians.abstract.AbstractHamiltonian`): Initial Hamiltonian.
+        h1 (:class:`qibo.hamiltonians.abstract.AbstractHamiltonian`): Final Hamiltonian.
+        s (float): Value of the scheduling function.
+    """
+
+    def __init__(self, h0, h1, s):
+        super().__init__()
+        self.nqubits = h0.nqubits
+        self.backend = h0.backend
+        self.h0, self.h1 = h0, h1
+        self.s = s
+        self._hamiltonian = None
+
+    @property
+    def hamiltonian(self):
+        """Interpolated Hamiltonian object, constructed on first access."""
+        if self._hamiltonian is None:
+            self._hamiltonian = self.h0 * (1 - self.s) + self.h1 * self.s
+        return self._hamiltonian
+
+    @property
+    def matrix(self):
+        return self.hamiltonian.matrix
+
+    @property
+    def dense(self):
+        return self.hamiltonian.dense
+
+    def eigenvalues(self, k=6):
+        return self.hamiltonian.eigenvalues(k)
+
+    def eigenvectors(self, k=6):
+        return self.hamiltonian.eigenvectors(k)
+
+    def ground_state(self):
+        return self.hamiltonian.ground_state()
+
+    def exp(self, a):
+        return self.hamiltonian.exp(a)
+
+    def exp_matmul(self, a, state):
+        return self.hamiltonian.exp_matmul(a, state)
+
+    def expectation(self, state, normalize=False):
+        return (1 - self.s) * self.h0.expectation(
+            state, normalize
+        ) + self.s * self.h1.expectation(state, normalize)
+
+    def __add__(self, o):
+        return self.hamiltonian + o
+
+    def __sub__(self, o):
+        return self.hamiltonian - o
+
+    def __rsub__(self, o):
+        return o - self.hamiltonian
+
+    def __mul__(self, o):
+        return self.hamiltonian * o
+
+    def __matmul__(self, o):
+        if isinstance(o, self.backend.tensor_types):
+            return (1 - self.s) * (self.h0 @ o) + self.s * (self.h1 @ o)
+        return self.hamiltonian @ o
+
+
 class BaseAdiabaticHamiltonian:
     """Adiabatic Hamiltonian that is a sum of :class:`qibo.hamiltonians.hamiltonians.Hamiltonian`."""
 
+    # number of Hamiltonians at different times that are kept in memory
+    CACHE_SIZE = 8
+
     def __init__(self, h0, h1):
         if h0.nqubits != h1.nqubits:
             raise_error(
@@ -73,6 +154,7 @@ class BaseAdiabaticHamiltonian:
         self.h0, self.h1 = h0, h1
         self.schedule = None
         self.total_time = None
+        self._cache = {}
 
     def ground_state(self):
         return self.h0.ground_state()
@@ -80,9 +162,13 @@ class BaseAdiabaticHamiltonian:
     def __call__(self, t):
         """Hamiltonian object corresponding to the given time.
 
+        Hamiltonians are cached for the last few distinct values of the
+        scheduling function, so that solvers calling this method several
+        times per step do not repeat the construction.
+
         Returns:
-            A :class:`qibo.hamiltonians.hamiltonians.Hamiltonian` object corresponding
-            to the adiabatic Hamiltonian at a given time.
+            A :class:`qibo.hamiltonians.adiabatic.InterpolatedHamiltonian` object
+            corresponding to the adiabatic Hamiltonian at a given time.
         """
         if t == 0:
             return self.h0
@@ -95,7 +181,14 @@ class BaseAdiabaticHamiltonian:
                 "scheduling.",
             )
         st = self.schedule(t / self.total_time)  # pylint: disable=E1102
-        return self.h0 * (1 - st) + self.h1 * st
+        # parametrized schedules may return arrays, which are not hashable
+        key = np.asarray(st).item()
+        if key not in self._cache:
+            if len(self._cache) >= self.CACHE_SIZE:
+                # remove the oldest entry
+                del self._cache[next(iter(self._cache))]
+            self._cache[key] = InterpolatedHamiltonian(self.h0, self.h1, st)
+        return self._cache[key]
 
     def circuit(self, dt, accelerators=None, t=0):  # pragma: no cover
         raise_error(
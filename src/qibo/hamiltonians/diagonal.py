@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from qibo.backends import kernels
+from qibo.config import log, raise_error
+from qibo.hamiltonians.abstract import AbstractHamiltonian
+
+
+def _is_diagonal(matrix):
+    """Checks if all off-diagonal elements of a matrix vanish."""
+    return np.count_nonzero(matrix - np.diag(np.diag(matrix))) == 0
+
+
+class DiagonalHamiltonian(AbstractHamiltonian):
+    """Hamiltonian that is diagonal in the computational basis.
+
+    The Hamiltonian is stored as the vector of its ``2 ** nqubits``
+    diagonal elements, so that products with states are elementwise
+    multiplications, expectation values are sums of the probabilities
+    weighted by the diagonal and ``exp(a)`` is a vector of phases.
+    Cost Hamiltonians of optimization problems, such as
+    :class:`qibo.hamiltonians.MaxCut`, are of this type.
+
+    Example:
+        .. testcode::
+
+            from qibo import hamiltonians
+            # diagonal Max Cut Hamiltonian for ten qubits
+            ham = hamiltonians.MaxCut(10, diagonal=True)
+            # convert an existing diagonal Hamiltonian
+            ham = hamiltonians.DiagonalHamiltonian.from_hamiltonian(
+                hamiltonians.Z(4)
+            )
+
+    Args:
+        nqubits (int): number of quantum bits.
+        diagonal (np.ndarray): Real diagonal of the Hamiltonian as an array
+            of shape ``(2 ** nqubits,)``.
+    """
+
+    def __init__(self, nqubits, diagonal, backend=None):
+        if backend is None:  # pragma: no cover
+            from qibo.backends import GlobalBackend
+
+            self.backend = GlobalBackend()
+        else:
+            self.backend = backend
+        super().__init__()
+        self.nqubits = nqubits
+        diagonal = np.asarray(self.backend.to_numpy(diagonal))
+        if tuple(diagonal.shape) != (2**nqubits,):
+            raise_error(
+                ValueError,
+                "The Hamiltonian is defined for {} qubits "
+                "while the given diagonal has shape {}."
+                "".format(nqubits, tuple(diagonal.shape)),
+            )
+        if np.iscomplexobj(diagonal):
+            if np.any(np.imag(diagonal)):
+                raise_error(ValueError, "Diagonal Hamiltonians should be real.")
+            diagonal = np.real(diagonal)
+        self.diagonal = self.backend.cast(diagonal, dtype=np.float64)
+        self._exp = {"a": None, "result": None}
+
+    @classmethod
+    def from_hamiltonian(cls, hamiltonian):
+        """Creates a diagonal Hamiltonian from any other Hamiltonian object.
+
+        For :class:`qibo.hamiltonians.SymbolicHamiltonian` and
+        :class:`qibo.hamiltonians.PauliHamiltonian` the diagonal is calculated
+        from the terms, without constructing the full matrix.
+
+        Raises:
+            ValueError: If the given Hamiltonian is not diagonal.
+        """
+        from qibo.hamiltonians.hamiltonians import Hamiltonian, SymbolicHamiltonian
+        from qibo.hamiltonians.pauli import PauliHamiltonian
+
+        if isinstance(hamiltonian, cls):
+            return hamiltonian
+        elif isinstance(hamiltonian, PauliHamiltonian):
+            if np.any(hamiltonian.x_masks != 0):
+                raise_error(ValueError, "Given Hamiltonian is not diagonal.")
+            diagonal = hamiltonian.diagonal
+        elif isinstance(hamiltonian, SymbolicHamiltonian):
+            nqubits = hamiltonian.nqubits
+            diagonal = np.zeros(2**nqubits, dtype=np.complex128)
+            # the constant is updated when the terms are calculated
+            for term in hamiltonian.terms:
+                cls._add_term(diagonal, term, nqubits)
+            diagonal += complex(hamiltonian.constant)
+        elif isinstance(hamiltonian, Hamiltonian):
+            backend = hamiltonian.backend
+            matrix = hamiltonian.matrix
+            if backend.issparse(matrix):
+                matrix = matrix.tocsr()
+                diagonal = matrix.diagonal()
+                if matrix.count_nonzero() != np.count_nonzero(diagonal):
+                    raise_error(ValueError, "Given Hamiltonian is not diagonal.")
+            else:
+                matrix = backend.to_numpy(matrix)
+                if not _is_diagonal(matrix):
+                    raise_error(ValueError, "Given Hamiltonian is not diagonal.")
+                diagonal = np.diag(matrix)
+        else:
+            raise_error(
+                TypeError,
+                "Cannot create diagonal Hamiltonian from {}."
+                "".format(type(hamiltonian)),
+            )
+        return cls(hamiltonian.nqubits, diagonal, backend=hamiltonian.backend)
+
+    @staticmethod
+    def _add_term(diagonal, term, nqubits):
+        """Adds the diagonal of a :class:`qibo.hamiltonians.terms.HamiltonianTerm`."""
+        matrix = term.matrix
+        qubits = term.target_qubits
+        if not qubits:
+            diagonal += matrix
+            return
+        if not _is_diagonal(matrix):
+            raise_error(ValueError, "Given Hamiltonian is not diagonal.")
+        values = np.reshape(np.diag(matrix), len(qubits) * (2,))
+        # order the axes of the term following the order of the qubits
+        order = np.argsort(qubits)
+        values = np.transpose(values, order)
+        qubits = sorted(qubits)
+        shape, axes = kernels.merged_shape(qubits, nqubits)
+        values_shape = len(shape) * [1]
+        for q in qubits:
+            values_shape[axes[q]] = 2
+        tensor = np.reshape(diagonal, shape)
+        tensor += np.reshape(values, values_shape)
+
+    @property
+    def matrix(self):
+        """Returns the full ``(2 ** nqubits, 2 ** nqubits)`` matrix representation."""
+        log.warning(
+            "Calculating the dense form of a diagonal Hamiltonian. "
+            "This operation is memory inefficient."
+        )
+        return self.backend.cast(self.backend.np.diag(self.diagonal))
+
+    def eigenvalues(self, k=6):
+        return self.backend.np.sort(self.diagonal)
+
+    def eigenvectors(self, k=6):
+        order = np.argsort(self.backend.to_numpy(self.diagonal), kind="stable")
+        return self.backend.cast(np.eye(2**self.nqubits)[:, order])
+
+    def ground_state(self):
+        index = int(np.argmin(self.backend.to_numpy(self.diagonal)))
+        state = np.zeros(2**self.nqubits)
+        state[index] = 1
+        return self.backend.cast(state)
+
+    def exp(self, a):
+        """Computes the diagonal of exp(-1j * a * H).
+
+        Args:
+            a (complex): Complex number to multiply Hamiltonian before
+                exponentiation.
+
+        Returns:
+            Array of shape ``(2 ** nqubits,)`` with the phases that multiply
+            each amplitude of a state vector.
+        """
+        if self._exp.get("a") != a:
+            self._exp["a"] = a
+            diagonal = self.backend.cast(self.diagonal)
+            self._exp["result"] = self.backend.np.exp(-1j * a * diagonal)
+        return self._exp.get("result")
+
+    def exp_matmul(self, a, state):
+        return self.exp(a) * state
+
+    def expectation(self, state, normalize=False):
+        if not isinstance(state, self.backend.tensor_types):
+            raise_error(
+                TypeError,
+                "Cannot calculate Hamiltonian expectation "
+                "value for state of type {}."
+                "".format(type(state)),
+            )
+        shape = tuple(state.shape)
+        if len(shape) == 1:
+            probabilities = self.backend.np.abs(state) ** 2
+        elif len(shape) == 2:
+            probabilities = self.backend.np.real(self.backend.np.diagonal(state))
+        else:
+            raise_error(
+                ValueError,
+                "Cannot calculate Hamiltonian "
+                "expectation value for state of shape "
+                "{}.".format(shape),
+            )
+        ev = self.backend.np.sum(probabilities * self.diagonal)
+        if normalize:
+            ev = ev / self.backend.np.sum(probabilities)
+        return ev
+
+    def _new(self, diagonal):
+        return self.__class__(self.nqubits, diagonal, backend=self.backend)
+
+    def _check_nqubits(self, o):
+        if self.nqubits != o.nqubits:
+            raise_error(
+                RuntimeError,
+                "Only hamiltonians with the same number of qubits can be combined.",
+            )
+
+    def __add__(self, o):
+        if isinstance(o, self.__class__):
+            self._check_nqubits(o)
+            return self._new(self.diagonal + o.diagonal)
+        elif isinstance(o, self.backend.numeric_types):
+            return self._new(self.diagonal + o)
+        raise_error(
+            NotImplementedError,
+            "Hamiltonian addition to {} not " "implemented.".format(type(o)),
+        )
+
+    def __sub__(self, o):
+        if isinstance(o, self.__class__):
+            self._check_nqubits(o)
+            return self._new(self.diagonal - o.diagonal)
+        elif isinstance(o, self.backend.numeric_types):
+            return self._new(self.diagonal - o)
+        raise_error(
+            NotImplementedError,
+            "Hamiltonian subtraction to {} " "not implemented.".format(type(o)),
+        )
+
+    def __rsub__(self, o):
+        if isinstance(o, self.backend.numeric_types):
+            return self._new(o - self.diagonal)
+        raise_error(
+            NotImplementedError,
+            "Hamiltonian subtraction to {} " "not implemented.".format(type(o)),
+        )
+
+    def __mul__(self, o):
+        if isinstance(o, self.backend.tensor_types):
+            o = complex(o)
+        elif not isinstance(o, self.backend.numeric_types):
+            raise_error(
+                NotImplementedError,
+                "Hamiltonian multiplication to {} " "not implemented.".format(type(o)),
+            )
+        return self._new(o * self.backend.to_numpy(self.diagonal))
+
+    def __matmul__(self, o):
+        if isinstance(o, self.__class__):
+            self._check_nqubits(o)
+            return self._new(self.diagonal * o.diagonal)
+
+        if isinstance(o, self.backend.tensor_types):
+            rank = len(tuple(o.shape))
+            diagonal = self.backend.cast(self.diagonal, dtype=o.dtype)
+            if rank == 1:
+                return diagonal * o
+            elif rank == 2:
+                return diagonal[:, self.backend.np.newaxis] * o
+            raise_error(
+                NotImplementedError,
+                "Cannot multiply Hamiltonian with " "rank-{} tensor.".format(rank),
+            )
+
+        raise_error(
+            NotImplementedError,
+            "Hamiltonian matmul to {} not " "implemented.".format(type(o)),
+        )
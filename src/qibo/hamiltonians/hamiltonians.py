@@ -14,7 +14,11 @@ class Hamiltonian(AbstractHamiltonian):
             computational basis as an array of shape ``(2 ** nqubits, 2 ** nqubits)``.
             Sparse matrices based on ``scipy.sparse`` for numpy/qibojit backends
             or on ``tf.sparse`` for the tensorflow backend are also
-            supported.
+            supported. For ``scipy.sparse`` matrices the eigenvalues and the
+            ground state are calculated with ``scipy.sparse.linalg.eigsh``
+            and :meth:`qibo.hamiltonians.Hamiltonian.exp_matmul` uses
+            ``scipy.sparse.linalg.expm_multiply``, without constructing the
+            exponential.
     """
 
     def __init__(self, nqubits, matrix=None, backend=None):
@@ -102,6 +106,13 @@ class Hamiltonian(AbstractHamiltonian):
             )
         return self._eigenvectors
 
+    def ground_state(self):
+        if self._eigenvectors is None and self.backend.issparse(self.matrix):
+            # only the lowest eigenvector is needed
+            _, eigenvectors = self.backend.calculate_eigenvectors(self.matrix, k=1)
+            return eigenvectors[:, 0]
+        return super().ground_state()
+
     def exp(self, a):
         if self._exp.get("a") != a:
             self._exp["a"] = a
@@ -110,6 +121,11 @@ class Hamiltonian(AbstractHamiltonian):
             )
         return self._exp.get("result")
 
+    def exp_matmul(self, a, state):
+        if self.backend.issparse(self.matrix):
+            return self.backend.calculate_matrix_exp_product(a, self.matrix, state)
+        return super().exp_matmul(a, state)
+
     def expectation(self, state, normalize=False):
         if isinstance(state, self.backend.tensor_types):
             shape = tuple(state.shape)
@@ -137,8 +153,25 @@ class Hamiltonian(AbstractHamiltonian):
     def eye(self, n=None):
         if n is None:
             n = int(self.matrix.shape[0])
+        if self.backend.issparse(self.matrix):
+            from scipy import sparse
+
+            return sparse.identity(n, dtype=self.matrix.dtype, format="csr")
         return self.backend.cast(self.backend.matrices.I(n), dtype=self.matrix.dtype)
 
+    def _matrices(self, o):
+        """Matrices of this and the ``o`` Hamiltonian in the same format.
+
+        If only one of the two matrices is sparse it is converted to a dense
+        array, because operations between sparse and dense matrices produce
+        dense matrices.
+        """
+        matrix1, matrix2 = self.matrix, o.matrix
+        if self.backend.issparse(matrix1) != self.backend.issparse(matrix2):
+            matrix1 = self.backend.cast(self.backend.to_numpy(matrix1))
+            matrix2 = self.backend.cast(self.backend.to_numpy(matrix2))
+        return matrix1, matrix2
+
     def __add__(self, o):
         if isinstance(o, self.__class__):
             if self.nqubits != o.nqubits:
@@ -146,7 +179,8 @@ class Hamiltonian(AbstractHamiltonian):
                     RuntimeError,
                     "Only hamiltonians with the same " "number of qubits can be added.",
                 )
-            new_matrix = self.matrix + o.matrix
+            matrix1, matrix2 = self._matrices(o)
+            new_matrix = matrix1 + matrix2
         elif isinstance(o, self.backend.numeric_types):
             new_matrix = self.matrix + o * self.eye()
         else:
@@ -164,7 +198,8 @@ class Hamiltonian(AbstractHamiltonian):
                     "Only hamiltonians with the same "
                     "number of qubits can be subtracted.",
                 )
-            new_matrix = self.matrix - o.matrix
+            matrix1, matrix2 = self._matrices(o)
+            new_matrix = matrix1 - matrix2
         elif isinstance(o, self.backend.numeric_types):
             new_matrix = self.matrix - o * self.eye()
         else:
@@ -182,7 +217,8 @@ class Hamiltonian(AbstractHamiltonian):
                     RuntimeError,
                     "Only hamiltonians with the same " "number of qubits can be added.",
                 )
-            new_matrix = o.matrix - self.matrix
+            matrix1, matrix2 = self._matrices(o)
+            new_matrix = matrix2 - matrix1
         elif isinstance(o, self.backend.numeric_types):
             new_matrix = o * self.eye() - self.matrix
         else:
@@ -217,7 +253,7 @@ class Hamiltonian(AbstractHamiltonian):
     def __matmul__(self, o):
         if isinstance(o, self.__class__):
             matrix = self.backend.calculate_hamiltonian_matrix_product(
-                self.matrix, o.matrix
+                *self._matrices(o)
             )
             return self.__class__(self.nqubits, matrix, backend=self.backend)
 
@@ -304,6 +340,7 @@ class SymbolicHamiltonian(AbstractHamiltonian):
         self._form = None
         self._terms = None
         self.constant = 0  # used only when we perform calculations using ``_terms``
+        self._grouped_terms = None
         self._dense = None
         self.symbol_map = symbol_map
         # if a symbol in the given form is not a Qibo symbol it must be
@@ -399,6 +436,7 @@ class SymbolicHamiltonian(AbstractHamiltonian):
     @terms.setter
     def terms(self, terms):
         self._terms = terms
+        self._grouped_terms = None
         self.nqubits = max(q for term in self._terms for q in term.target_qubits) + 1
 
     @property
@@ -418,6 +456,9 @@ class SymbolicHamiltonian(AbstractHamiltonian):
     def exp(self, a):
         return self.dense.exp(a)
 
+    def exp_matmul(self, a, state):
+        return self.dense.exp_matmul(a, state)
+
     def _get_symbol_matrix(self, term):
         """Calculates numerical matrix corresponding to symbolic expression.
 
@@ -525,7 +566,54 @@ class SymbolicHamiltonian(AbstractHamiltonian):
         matrix = np.reshape(matrix, 2 * (2**self.nqubits,))
         return Hamiltonian(self.nqubits, matrix, backend=self.backend) + self.constant
 
-    def calculate_dense(self):
+    def _calculate_sparse_from_terms(self):
+        """Calculates equivalent :class:`qibo.core.hamiltonians.Hamiltonian` with a sparse matrix.
+
+        The non-zero elements of each term are placed directly using bit
+        operations on the indices of the computational basis, without
+        constructing Kronecker products with identities.
+        """
+        import numpy as np
+        from scipy import sparse
+
+        n = self.nqubits
+        indices = np.arange(2**n)
+        rows, columns, values = [], [], []
+        for term in self.terms:
+            targets = term.target_qubits
+            ntargets = len(targets)
+            # bits of the basis indices that correspond to each target
+            shifts = [n - q - 1 for q in targets]
+            mask = sum(1 << shift for shift in shifts)
+            rest = indices[(indices & mask) == 0]
+            local = np.arange(2**ntargets)
+            spread = np.zeros_like(local)
+            for i, shift in enumerate(shifts):
+                spread |= ((local >> (ntargets - i - 1)) & 1) << shift
+            matrix = self.backend.to_numpy(term.matrix)
+            for i, j in zip(*np.nonzero(matrix)):
+                rows.append(rest | spread[i])
+                columns.append(rest | spread[j])
+                values.append(np.full(len(rest), matrix[i, j]))
+        rows.append(indices)
+        columns.append(indices)
+        values.append(np.full(2**n, complex(self.constant)))
+        values = np.concatenate(values)
+        indices = (np.concatenate(rows), np.concatenate(columns))
+        # elements with the same indices are summed
+        matrix = sparse.csr_matrix((values, indices), shape=2 * (2**n,))
+        matrix.eliminate_zeros()
+        return Hamiltonian(n, matrix, backend=self.backend)
+
+    def calculate_dense(self, sparse=False):
+        """Calculates the equivalent :class:`qibo.hamiltonians.Hamiltonian`.
+
+        Args:
+            sparse (bool): If ``True`` the matrix of the Hamiltonian is
+                constructed from the terms as a ``scipy.sparse.csr_matrix``.
+        """
+        if sparse:
+            return self._calculate_sparse_from_terms()
         if self._terms is None:
             # calculate dense matrix directly using the form to avoid the
             # costly ``sympy.expand`` call
@@ -652,21 +740,48 @@ class SymbolicHamiltonian(AbstractHamiltonian):
             new_ham.dense = o * self._dense
         return new_ham
 
+    @property
+    def grouped_terms(self):
+        """Terms of the Hamiltonian merged to groups that act on the same qubits.
+
+        Terms that act on a subset of the qubits of another term are merged
+        to a single matrix using :class:`qibo.hamiltonians.terms.TermGroup`.
+        The groups are calculated once and cached.
+
+        Returns:
+            List of ``(targets, matrix, structure)`` tuples, where ``structure``
+            is one of ``"diagonal"``, ``"permutation"`` or ``"dense"``.
+        """
+        if self._grouped_terms is None:
+            import numpy as np
+
+            from qibo.backends import kernels
+            from qibo.hamiltonians.terms import TermGroup
+
+            grouped_terms = []
+            for group in TermGroup.from_terms(self.terms):
+                term = group.to_term()
+                matrix = np.asarray(self.backend.to_numpy(term.matrix), dtype=complex)
+                structure = kernels.matrix_structure(matrix)
+                grouped_terms.append((term.target_qubits, matrix, structure))
+            self._grouped_terms = grouped_terms
+        return self._grouped_terms
+
     def apply_gates(self, state, density_matrix=False):
-        """Applies gates corresponding to the Hamiltonian terms to a given state.
+        """Applies the Hamiltonian terms to a given state.
         Helper method for ``__matmul__``.
+
+        The contributions of all groups of terms, see
+        :attr:`qibo.hamiltonians.SymbolicHamiltonian.grouped_terms`, are
+        added to a single array without copying the given state.
         """
-        total = 0
-        for term in self.terms:
-            total += term(
-                self.backend,
-                self.backend.cast(state, copy=True),
-                self.nqubits,
-                density_matrix=density_matrix,
-            )
-        if self.constant:  # pragma: no cover
-            total += self.constant * state
-        return total
+        return self.backend.calculate_hamiltonian_terms_product(
+            self.grouped_terms,
+            state,
+            self.nqubits,
+            complex(self.constant),
+            density_matrix,
+        )
 
     def __matmul__(self, o):
         """Matrix multiplication with other Hamiltonians or state vectors."""
@@ -23,16 +23,63 @@ def multikron(matrix_list):
     return h
 
 
-def _build_spin_model(nqubits, matrix, condition):
-    """Helper method for building nearest-neighbor spin model Hamiltonians."""
-    h = sum(
-        multikron(matrix if condition(i, j) else matrices.I for j in range(nqubits))
-        for i in range(nqubits)
+def _pauli_model(nqubits, terms, backend=None):
+    """Helper method for building Hamiltonians as sums of Pauli strings.
+
+    Args:
+        nqubits (int): number of quantum bits.
+        terms (list): Pairs of coefficients and dictionaries that map qubits
+            to the Pauli operator (``"X"``, ``"Y"`` or ``"Z"``) acting on them.
+
+    Returns:
+        A :class:`qibo.hamiltonians.PauliHamiltonian`.
+    """
+    from qibo.hamiltonians.pauli import PAULI_MASKS, PauliHamiltonian
+
+    x_masks, z_masks, coefficients = [], [], []
+    for coefficient, paulis in terms:
+        x, z = 0, 0
+        for q, pauli in paulis.items():
+            xq, zq = PAULI_MASKS[pauli]
+            x |= xq << (nqubits - q - 1)
+            z |= zq << (nqubits - q - 1)
+        x_masks.append(x)
+        z_masks.append(z)
+        coefficients.append(coefficient)
+    return PauliHamiltonian.from_masks(
+        nqubits, x_masks, z_masks, coefficients, backend=backend
     )
-    return h
 
 
-def XXZ(nqubits, delta=0.5, dense=True, backend=None):
+def _diagonal_model(hamiltonian):
+    """Converts a diagonal :class:`qibo.hamiltonians.PauliHamiltonian` to
+    :class:`qibo.hamiltonians.DiagonalHamiltonian`."""
+    from qibo.hamiltonians.diagonal import DiagonalHamiltonian
+
+    return DiagonalHamiltonian.from_hamiltonian(hamiltonian)
+
+
+def _dense_model(nqubits, terms, backend=None, sparse=False):
+    """Helper method for building dense Hamiltonians as sums of Pauli strings.
+
+    The matrix is constructed from bit operations on the indices of the
+    computational basis, see
+    :meth:`qibo.hamiltonians.PauliHamiltonian.calculate_matrix`.
+
+    Args:
+        nqubits (int): number of quantum bits.
+        terms (list): Pairs of coefficients and dictionaries that map qubits
+            to the Pauli operator (``"X"``, ``"Y"`` or ``"Z"``) acting on them.
+        sparse (bool): If ``True`` the matrix is a ``scipy.sparse.csr_matrix``.
+
+    Returns:
+        A :class:`qibo.hamiltonians.Hamiltonian`.
+    """
+    ham = _pauli_model(nqubits, terms, backend=backend)
+    return Hamiltonian(nqubits, ham.calculate_matrix(sparse), backend=backend)
+
+
+def XXZ(nqubits, delta=0.5, dense=True, backend=None, pauli=False, sparse=False):
     """Heisenberg XXZ model with periodic boundary conditions.
 
     .. math::
@@ -44,6 +91,11 @@ def XXZ(nqubits, delta=0.5, dense=True, backend=None):
         dense (bool): If ``True`` it creates the Hamiltonian as a
             :class:`qibo.core.hamiltonians.Hamiltonian`, otherwise it creates
             a :class:`qibo.core.hamiltonians.SymbolicHamiltonian`.
+        pauli (bool): If ``True`` it creates the Hamiltonian as a
+            :class:`qibo.hamiltonians.PauliHamiltonian` and ``dense`` is
+            ignored.
+        sparse (bool): If ``True`` and ``dense`` is ``True`` the matrix of the
+            Hamiltonian is stored as a ``scipy.sparse.csr_matrix``.
 
     Example:
         .. testcode::
@@ -51,13 +103,16 @@ def XXZ(nqubits, delta=0.5, dense=True, backend=None):
             from qibo.hamiltonians import XXZ
             h = XXZ(3) # initialized XXZ model with 3 qubits
     """
-    if dense:
-        condition = lambda i, j: i in {j % nqubits, (j + 1) % nqubits}
-        hx = _build_spin_model(nqubits, matrices.X, condition)
-        hy = _build_spin_model(nqubits, matrices.Y, condition)
-        hz = _build_spin_model(nqubits, matrices.Z, condition)
-        matrix = hx + hy + delta * hz
-        return Hamiltonian(nqubits, matrix, backend=backend)
+    if pauli or dense:
+        terms = []
+        for i in range(nqubits):
+            j = (i + 1) % nqubits
+            terms.append((1, {i: "X", j: "X"}))
+            terms.append((1, {i: "Y", j: "Y"}))
+            terms.append((delta, {i: "Z", j: "Z"}))
+        if pauli:
+            return _pauli_model(nqubits, terms, backend=backend)
+        return _dense_model(nqubits, terms, backend=backend, sparse=sparse)
 
     hx = multikron([matrices.X, matrices.X])
     hy = multikron([matrices.Y, matrices.Y])
@@ -70,12 +125,15 @@ def XXZ(nqubits, delta=0.5, dense=True, backend=None):
     return ham
 
 
-def _OneBodyPauli(nqubits, matrix, dense=True, backend=None):
+def _OneBodyPauli(
+    nqubits, matrix, name, dense=True, backend=None, pauli=False, sparse=False
+):
     """Helper method for constracting non-interacting X, Y, Z Hamiltonians."""
-    if dense:
-        condition = lambda i, j: i == j % nqubits
-        ham = -_build_spin_model(nqubits, matrix, condition)
-        return Hamiltonian(nqubits, ham, backend=backend)
+    if pauli or dense:
+        terms = [(-1, {i: name}) for i in range(nqubits)]
+        if pauli:
+            return _pauli_model(nqubits, terms, backend=backend)
+        return _dense_model(nqubits, terms, backend=backend, sparse=sparse)
 
     matrix = -matrix
     terms = [HamiltonianTerm(matrix, i) for i in range(nqubits)]
@@ -84,7 +142,7 @@ def _OneBodyPauli(nqubits, matrix, dense=True, backend=None):
     return ham
 
 
-def X(nqubits, dense=True, backend=None):
+def X(nqubits, dense=True, backend=None, pauli=False, sparse=False):
     """Non-interacting Pauli-X Hamiltonian.
 
     .. math::
@@ -95,11 +153,16 @@ def X(nqubits, dense=True, backend=None):
         dense (bool): If ``True`` it creates the Hamiltonian as a
             :class:`qibo.core.hamiltonians.Hamiltonian`, otherwise it creates
             a :class:`qibo.core.hamiltonians.SymbolicHamiltonian`.
+        pauli (bool): If ``True`` it creates the Hamiltonian as a
+            :class:`qibo.hamiltonians.PauliHamiltonian` and ``dense`` is
+            ignored.
+        sparse (bool): If ``True`` and ``dense`` is ``True`` the matrix of the
+            Hamiltonian is stored as a ``scipy.sparse.csr_matrix``.
     """
-    return _OneBodyPauli(nqubits, matrices.X, dense, backend=backend)
+    return _OneBodyPauli(nqubits, matrices.X, "X", dense, backend, pauli, sparse)
 
 
-def Y(nqubits, dense=True, backend=None):
+def Y(nqubits, dense=True, backend=None, pauli=False, sparse=False):
     """Non-interacting Pauli-Y Hamiltonian.
 
     .. math::
@@ -110,11 +173,16 @@ def Y(nqubits, dense=True, backend=None):
         dense (bool): If ``True`` it creates the Hamiltonian as a
             :class:`qibo.core.hamiltonians.Hamiltonian`, otherwise it creates
             a :class:`qibo.core.hamiltonians.SymbolicHamiltonian`.
+        pauli (bool): If ``True`` it creates the Hamiltonian as a
+            :class:`qibo.hamiltonians.PauliHamiltonian` and ``dense`` is
+            ignored.
+        sparse (bool): If ``True`` and ``dense`` is ``True`` the matrix of the
+            Hamiltonian is stored as a ``scipy.sparse.csr_matrix``.
     """
-    return _OneBodyPauli(nqubits, matrices.Y, dense, backend=backend)
+    return _OneBodyPauli(nqubits, matrices.Y, "Y", dense, backend, pauli, sparse)
 
 
-def Z(nqubits, dense=True, backend=None):
+def Z(nqubits, dense=True, backend=None, pauli=False, diagonal=False, sparse=False):
     """Non-interacting Pauli-Z Hamiltonian.
 
     .. math::
@@ -125,11 +193,22 @@ def Z(nqubits, dense=True, backend=None):
         dense (bool): If ``True`` it creates the Hamiltonian as a
             :class:`qibo.core.hamiltonians.Hamiltonian`, otherwise it creates
             a :class:`qibo.core.hamiltonians.SymbolicHamiltonian`.
+        pauli (bool): If ``True`` it creates the Hamiltonian as a
+            :class:`qibo.hamiltonians.PauliHamiltonian` and ``dense`` is
+            ignored.
+        diagonal (bool): If ``True`` it creates the Hamiltonian as a
+            :class:`qibo.hamiltonians.DiagonalHamiltonian` and ``dense``
+            and ``pauli`` are ignored.
+        sparse (bool): If ``True`` and ``dense`` is ``True`` the matrix of the
+            Hamiltonian is stored as a ``scipy.sparse.csr_matrix``.
     """
-    return _OneBodyPauli(nqubits, matrices.Z, dense, backend=backend)
+    if diagonal:
+        ham = _OneBodyPauli(nqubits, matrices.Z, "Z", backend=backend, pauli=True)
+        return _diagonal_model(ham)
+    return _OneBodyPauli(nqubits, matrices.Z, "Z", dense, backend, pauli, sparse)
 
 
-def TFIM(nqubits, h=0.0, dense=True, backend=None):
+def TFIM(nqubits, h=0.0, dense=True, backend=None, pauli=False, sparse=False):
     """Transverse field Ising model with periodic boundary conditions.
 
     .. math::
@@ -141,14 +220,18 @@ def TFIM(nqubits, h=0.0, dense=True, backend=None):
         dense (bool): If ``True`` it creates the Hamiltonian as a
             :class:`qibo.core.hamiltonians.Hamiltonian`, otherwise it creates
             a :class:`qibo.core.hamiltonians.SymbolicHamiltonian`.
+        pauli (bool): If ``True`` it creates the Hamiltonian as a
+            :class:`qibo.hamiltonians.PauliHamiltonian` and ``dense`` is
+            ignored.
+        sparse (bool): If ``True`` and ``dense`` is ``True`` the matrix of the
+            Hamiltonian is stored as a ``scipy.sparse.csr_matrix``.
     """
-    if dense:
-        condition = lambda i, j: i in {j % nqubits, (j + 1) % nqubits}
-        ham = -_build_spin_model(nqubits, matrices.Z, condition)
-        if h != 0:
-            condition = lambda i, j: i == j % nqubits
-            ham -= h * _build_spin_model(nqubits, matrices.X, condition)
-        return Hamiltonian(nqubits, ham, backend=backend)
+    if pauli or dense:
+        terms = [(-1, {i: "Z", (i + 1) % nqubits: "Z"}) for i in range(nqubits)]
+        terms.extend((-h, {i: "X"}) for i in range(nqubits))
+        if pauli:
+            return _pauli_model(nqubits, terms, backend=backend)
+        return _dense_model(nqubits, terms, backend=backend, sparse=sparse)
 
     matrix = -(
         multikron([matrices.Z, matrices.Z]) + h * multikron([matrices.X, matrices.I])
@@ -160,7 +243,9 @@ def TFIM(nqubits, h=0.0, dense=True, backend=None):
     return ham
 
 
-def MaxCut(nqubits, dense=True, backend=None):
+def MaxCut(
+    nqubits, dense=True, backend=None, pauli=False, diagonal=False, sparse=False
+):
     """Max Cut Hamiltonian.
 
     .. math::
@@ -171,7 +256,28 @@ def MaxCut(nqubits, dense=True, backend=None):
         dense (bool): If ``True`` it creates the Hamiltonian as a
             :class:`qibo.core.hamiltonians.Hamiltonian`, otherwise it creates
             a :class:`qibo.core.hamiltonians.SymbolicHamiltonian`.
+        pauli (bool): If ``True`` it creates the Hamiltonian as a
+            :class:`qibo.hamiltonians.PauliHamiltonian` and ``dense`` is
+            ignored.
+        diagonal (bool): If ``True`` it creates the Hamiltonian as a
+            :class:`qibo.hamiltonians.DiagonalHamiltonian` and ``dense``
+            and ``pauli`` are ignored.
+        sparse (bool): If ``True`` and ``dense`` is ``True`` the matrix of the
+            Hamiltonian is stored as a ``scipy.sparse.csr_matrix``.
     """
+    if pauli or diagonal or dense:
+        # terms with i == j vanish and the others appear twice
+        terms = []
+        for i in range(nqubits):
+            for j in range(i + 1, nqubits):
+                terms.append((1, {i: "Z", j: "Z"}))
+                terms.append((-1, {}))
+        if diagonal:
+            return _diagonal_model(_pauli_model(nqubits, terms, backend=backend))
+        if pauli:
+            return _pauli_model(nqubits, terms, backend=backend)
+        return _dense_model(nqubits, terms, backend=backend, sparse=sparse)
+
     import sympy as sp
     from numpy import ones
 
@@ -188,7 +294,4 @@ def MaxCut(nqubits, dense=True, backend=None):
     smap = {s: (i, matrices.Z) for i, s in enumerate(Z)}
     smap.update({s: (i, v[i]) for i, s in enumerate(V)})
 
-    ham = SymbolicHamiltonian(sham, smap, backend=backend)
-    if dense:
-        return ham.dense
-    return ham
+    return SymbolicHamiltonian(sham, smap, backend=backend)
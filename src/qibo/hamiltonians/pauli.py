@@ -0,0 +1,542 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from qibo.backends import kernels
+from qibo.config import log, raise_error
+from qibo.hamiltonians.abstract import AbstractHamiltonian
+
+# bits of the ``x`` and ``z`` masks that correspond to each Pauli operator
+PAULI_MASKS = {"I": (0, 0), "X": (1, 0), "Y": (1, 1), "Z": (0, 1)}
+
+
+def _real_vdot(a, b):
+    """Real part of ``np.vdot(a, b)`` for strided views without copying them.
+
+    The last axis of both views should be contiguous.
+    """
+    dtype = a.real.dtype
+    a, b = a.view(dtype), b.view(dtype)
+    axes = list(range(a.ndim))
+    return np.einsum(a, axes, b, axes, [])
+
+
+def _parity(values, mask):
+    """Parity of the bits of ``values`` that are set in ``mask``."""
+    parity = np.zeros_like(values)
+    while mask:
+        bit = mask & -mask
+        parity ^= (values & bit) != 0
+        mask ^= bit
+    return parity
+
+
+class PauliHamiltonian(AbstractHamiltonian):
+    """Hamiltonian given as a sum of Pauli strings.
+
+    Each term is stored as a pair of bit masks ``x`` and ``z``, so that the
+    term is ``coefficient * phase * X^x Z^z`` where ``phase = 1j ** ny`` and
+    ``ny`` is the number of ``Y`` operators in the string. Qubit ``q``
+    corresponds to bit ``nqubits - q - 1`` of the masks, following the
+    big-endian order of state vectors. A term maps the computational basis
+    state ``k`` to ``(-1) ** popcount(k & z) * phase * coefficient`` times
+    the state ``k ^ x``.
+
+    Expectation values and products with states are calculated directly
+    from the masks, without constructing the matrix of the Hamiltonian.
+    The terms that do not contain ``X`` or ``Y`` operators are summed to a
+    single diagonal, which is calculated once and cached. The remaining
+    terms are grouped by their ``x`` mask and each group is evaluated with
+    a single pass over the pairs of amplitudes that it connects.
+
+    Example:
+        .. testcode::
+
+            from qibo.hamiltonians import PauliHamiltonian
+            # H = Z0 Z1 + 0.5 X0 - Y0 Y1
+            ham = PauliHamiltonian(2, {"ZZ": 1, "XI": 0.5, "YY": -1})
+
+    Args:
+        nqubits (int): number of quantum bits.
+        terms (dict): Dictionary that maps Pauli strings of length
+            ``nqubits`` to their coefficients. The ``i``-th character of each
+            string is one of ``"I"``, ``"X"``, ``"Y"``, ``"Z"`` and
+            corresponds to the operator acting on qubit ``i``.
+    """
+
+    # maximum number of qubits of the groups of terms that are evaluated
+    # using views of the state, larger groups gather amplitudes by index
+    MAX_GROUP_QUBITS = 8
+
+    def __init__(self, nqubits, terms=None, backend=None):
+        if backend is None:  # pragma: no cover
+            from qibo.backends import GlobalBackend
+
+            self.backend = GlobalBackend()
+        else:
+            self.backend = backend
+        super().__init__()
+        self.nqubits = nqubits
+        if nqubits > 62:
+            raise_error(ValueError, "Pauli Hamiltonians support up to 62 qubits.")
+
+        x_masks, z_masks, coefficients = [], [], []
+        for string, coefficient in (terms or {}).items():
+            if len(string) != nqubits:
+                raise_error(
+                    ValueError,
+                    f"Pauli string {string} does not have length {nqubits}.",
+                )
+            x, z = 0, 0
+            for pauli in string:
+                if pauli not in PAULI_MASKS:
+                    raise_error(ValueError, f"Unknown Pauli operator {pauli}.")
+                xq, zq = PAULI_MASKS[pauli]
+                x, z = (x << 1) | xq, (z << 1) | zq
+            x_masks.append(x)
+            z_masks.append(z)
+            coefficients.append(coefficient)
+        self._set_terms(x_masks, z_masks, coefficients)
+        self._dense = None
+
+    def _set_terms(self, x_masks, z_masks, coefficients):
+        self.x_masks = np.array(x_masks, dtype=np.int64)
+        self.z_masks = np.array(z_masks, dtype=np.int64)
+        self.coefficients = np.array(coefficients, dtype=np.complex128)
+        ny = [bin(x & z).count("1") % 4 for x, z in zip(x_masks, z_masks)]
+        self.phases = np.array([1j**k for k in ny], dtype=np.complex128)
+        self._diagonal = None
+        self._groups = None
+
+    @classmethod
+    def from_masks(cls, nqubits, x_masks, z_masks, coefficients, backend=None):
+        """Creates the Hamiltonian from the masks and coefficients of its terms.
+
+        Terms with the same masks are merged and terms that vanish are removed.
+
+        Args:
+            nqubits (int): number of quantum bits.
+            x_masks (list): Integer masks of the qubits with ``X`` or ``Y``.
+            z_masks (list): Integer masks of the qubits with ``Z`` or ``Y``.
+            coefficients (list): Coefficients of the terms, which multiply
+                the phase that corresponds to the ``Y`` operators.
+        """
+        merged = {}
+        for x, z, c in zip(x_masks, z_masks, coefficients):
+            key = (int(x), int(z))
+            merged[key] = merged.get(key, 0) + complex(c)
+        merged = {key: c for key, c in merged.items() if c != 0}
+        ham = cls(nqubits, backend=backend)
+        masks = list(merged.keys())
+        ham._set_terms(
+            [x for x, _ in masks], [z for _, z in masks], list(merged.values())
+        )
+        return ham
+
+    @classmethod
+    def from_symbolic(cls, hamiltonian):
+        """Creates the Hamiltonian from a :class:`qibo.hamiltonians.SymbolicHamiltonian`.
+
+        All factors of the symbolic terms should be Pauli matrices.
+        """
+        from qibo.backends import matrices
+
+        paulis = {
+            "I": matrices.I,
+            "X": matrices.X,
+            "Y": matrices.Y,
+            "Z": matrices.Z,
+        }
+        nqubits = hamiltonian.nqubits
+        terms = hamiltonian.terms
+        x_masks, z_masks, coefficients = [0], [0], [hamiltonian.constant]
+        for term in terms:
+            x, z, c = 0, 0, complex(term.coefficient)
+            for factor in term.factors:
+                matrix = np.asarray(factor.matrix)
+                for pauli, target in paulis.items():
+                    if matrix.shape == (2, 2) and np.allclose(matrix, target):
+                        break
+                else:
+                    raise_error(
+                        ValueError,
+                        f"Symbol {factor} does not correspond to a Pauli matrix.",
+                    )
+                xq, zq = PAULI_MASKS[pauli]
+                bit = nqubits - factor.target_qubit - 1
+                x, z, c = cls._product(x, z, c, xq << bit, zq << bit, 1)
+            x_masks.append(x)
+            z_masks.append(z)
+            coefficients.append(c)
+        return cls.from_masks(
+            nqubits, x_masks, z_masks, coefficients, backend=hamiltonian.backend
+        )
+
+    @staticmethod
+    def _product(x1, z1, c1, x2, z2, c2):
+        """Product of two Pauli strings given by their masks and coefficients."""
+        # X^x1 Z^z1 X^x2 Z^z2 = (-1)^popcount(z1 & x2) X^(x1^x2) Z^(z1^z2)
+        # and each string carries a phase 1j for every Y
+        x, z = x1 ^ x2, z1 ^ z2
+        ny = bin(x1 & z1).count("1") + bin(x2 & z2).count("1") - bin(x & z).count("1")
+        sign = -1 if bin(z1 & x2).count("1") % 2 else 1
+        return x, z, c1 * c2 * sign * 1j ** (ny % 4)
+
+    @property
+    def nterms(self):
+        return len(self.coefficients)
+
+    def _restrict(self, mask, qubits):
+        """Restricts a mask to the given qubits, in the order of the qubits."""
+        n, k = self.nqubits, len(qubits)
+        bits = ((mask >> (n - q - 1)) & 1 for q in qubits)
+        return sum(b << (k - i - 1) for i, b in enumerate(bits))
+
+    @property
+    def diagonal(self):
+        """Diagonal of the terms that do not contain ``X`` or ``Y`` operators.
+
+        This is an array of shape ``(2 ** nqubits,)`` that is calculated
+        once and cached.
+        """
+        if self._diagonal is None:
+            n = self.nqubits
+            terms = np.nonzero(self.x_masks == 0)[0]
+            factors = self.coefficients[terms] * self.phases[terms]
+            dtype = np.float64 if np.all(np.imag(factors) == 0) else np.complex128
+            diagonal = np.zeros(2**n, dtype=dtype)
+            for z, factor in zip(self.z_masks[terms], factors):
+                if dtype == np.float64:
+                    factor = factor.real
+                qubits = [q for q in range(n) if (z >> (n - q - 1)) & 1]
+                if not qubits:
+                    diagonal += factor
+                    continue
+                shape, axes = kernels.merged_shape(qubits, n)
+                signs = np.ones(len(shape) * [1])
+                for q in qubits:
+                    sign_shape = len(shape) * [1]
+                    sign_shape[axes[q]] = 2
+                    signs = signs * np.reshape([1, -1], sign_shape)
+                tensor = np.reshape(diagonal, shape)
+                tensor += factor * signs
+            self._diagonal = diagonal
+        return self._diagonal
+
+    @property
+    def groups(self):
+        """Terms that contain ``X`` or ``Y`` operators grouped by their ``x`` mask.
+
+        For groups that act on at most ``MAX_GROUP_QUBITS`` qubits, the
+        state is viewed as a tensor in which these qubits have their own
+        index and the group is represented by the shape of this tensor, the
+        indices of the amplitudes for all configurations of its qubits, the
+        ``x`` mask restricted to its qubits and the weight of each
+        configuration. Larger groups are represented by their full ``x``
+        mask and the indices of their terms, and they are evaluated by
+        gathering the amplitudes ``k ^ x`` of the state.
+        """
+        if self._groups is None:
+            n = self.nqubits
+            masks = {}
+            for i, x in enumerate(self.x_masks):
+                if x != 0:
+                    masks.setdefault(int(x), []).append(i)
+            groups = []
+            for x, terms in masks.items():
+                support = x
+                for i in terms:
+                    support |= int(self.z_masks[i])
+                qubits = [q for q in range(n) if (support >> (n - q - 1)) & 1]
+                if len(qubits) > self.MAX_GROUP_QUBITS:
+                    groups.append((None, terms, x, None))
+                    continue
+                shape, axes = kernels.merged_shape(qubits, n)
+                configurations = np.arange(2 ** len(qubits))
+                weights = self._weights(configurations, terms, qubits)
+                indices = []
+                for b in configurations:
+                    index = len(shape) * [slice(None)]
+                    for i, q in enumerate(qubits):
+                        index[axes[q]] = (int(b) >> (len(qubits) - i - 1)) & 1
+                    indices.append(tuple(index))
+                groups.append((shape, indices, self._restrict(x, qubits), weights))
+            self._groups = groups
+        return self._groups
+
+    def _weights(self, configurations, terms, qubits=None):
+        """Sum of the terms of a group for each configuration of its qubits.
+
+        The weight of configuration ``k`` is the sum of
+        ``(-1) ** popcount(k & z) * phase * coefficient`` over the terms.
+        """
+        weights = np.zeros(len(configurations), dtype=np.complex128)
+        for i in terms:
+            z = int(self.z_masks[i])
+            if qubits is not None:
+                z = self._restrict(z, qubits)
+            signs = 1 - 2 * _parity(configurations, z)
+            weights += self.coefficients[i] * self.phases[i] * signs
+        return weights
+
+    def _expectation_state(self, state):
+        total = np.dot(np.abs(state) ** 2, self.diagonal)
+        for shape, indices, x, weights in self.groups:
+            if shape is None:
+                rows = np.arange(len(state))
+                weights = self._weights(rows, indices)
+                total += np.vdot(state[rows ^ x], weights * state)
+                continue
+            tensor = np.reshape(state, shape)
+            # the imaginary parts of the products are not needed if the
+            # weights are real, and the real parts are calculated without
+            # copying the views when they are not contiguous
+            real = not np.any(np.imag(weights))
+            products = np.zeros(len(indices), dtype=np.complex128)
+            for b, index in enumerate(indices):
+                if b ^ x < b:
+                    # pairs are conjugate to each other
+                    products[b] = np.conj(products[b ^ x])
+                    continue
+                view1, view2 = tensor[indices[b ^ x]], tensor[index]
+                contiguous = view1.flags.c_contiguous and view2.flags.c_contiguous
+                strided = view1.ndim > 0 and view1.strides[-1] == view1.itemsize
+                if real and strided and not contiguous:
+                    products[b] = _real_vdot(view1, view2)
+                else:
+                    products[b] = np.vdot(view1, view2)
+            total += np.dot(weights, products)
+        return total
+
+    def _expectation_density_matrix(self, state):
+        total = np.dot(np.diagonal(state), self.diagonal)
+        for shape, indices, x, weights in self.groups:
+            # Tr(P rho) is the sum of s_z(k) rho[k, k ^ x] over all k
+            if shape is None:
+                rows = np.arange(len(state))
+                weights = self._weights(rows, indices)
+                total += np.dot(weights, state[rows, rows ^ x])
+                continue
+            # rows and columns are indexed one after the other, so that the
+            # number of dimensions stays within the numpy limit of 32
+            tensor = np.reshape(state, tuple(shape) + (len(state),))
+            for b, index in enumerate(indices):
+                rows = tensor[index]
+                block = np.reshape(rows, rows.shape[:-1] + tuple(shape))
+                free = (rows.ndim - 1) * (slice(None),)
+                block = block[free + indices[b ^ x]]
+                axes = list(range(block.ndim // 2))
+                total += weights[b] * np.einsum(block, 2 * axes, [])
+        return total
+
+    def apply(self, state):
+        """Multiplies the Hamiltonian with a state vector or a matrix.
+
+        Args:
+            state (np.ndarray): State vector of shape ``(2 ** nqubits,)`` or
+                matrix of shape ``(2 ** nqubits, m)``, such as a density
+                matrix, which is multiplied from the left.
+
+        Returns:
+            The product as a new array.
+        """
+        state = np.asarray(state)
+        trailing = tuple(state.shape[1:])
+        expand = (slice(None),) + len(trailing) * (np.newaxis,)
+        result = self.diagonal[expand] * state
+        result = result.astype(np.result_type(result, np.complex128), copy=False)
+        for shape, indices, x, weights in self.groups:
+            if shape is None:
+                rows = np.arange(len(state))
+                weights = self._weights(rows, indices)
+                result += (weights[expand] * state)[rows ^ x]
+                continue
+            tensor = np.reshape(state, tuple(shape) + trailing)
+            output = np.reshape(result, tuple(shape) + trailing)
+            for b, index in enumerate(indices):
+                weight = weights[b ^ x]
+                if weight != 0:
+                    output[index] += weight * tensor[indices[b ^ x]]
+        return result
+
+    def expectation(self, state, normalize=False):
+        if not isinstance(state, self.backend.tensor_types):
+            raise_error(
+                TypeError,
+                "Cannot calculate Hamiltonian expectation "
+                "value for state of type {}."
+                "".format(type(state)),
+            )
+        state = self.backend.to_numpy(state)
+        rank = len(state.shape)
+        if rank == 1:
+            value = self._expectation_state(state)
+            norm = np.sum(np.abs(state) ** 2)
+        elif rank == 2:
+            value = self._expectation_density_matrix(state)
+            norm = np.trace(state)
+        else:
+            raise_error(
+                ValueError,
+                "Cannot calculate Hamiltonian "
+                "expectation value for state of shape "
+                "{}.".format(tuple(state.shape)),
+            )
+        value = np.real(value)
+        if normalize:
+            value /= np.real(norm)
+        return value
+
+    def calculate_matrix(self, sparse=False):
+        """Constructs the matrix of the Hamiltonian from the masks of its terms.
+
+        The non-zero elements are written directly from bit operations on
+        the indices of the computational basis: column ``k`` has one element
+        in row ``k ^ x`` for every distinct ``x`` mask. Columns are processed
+        in chunks of ``kernels.CHUNK_SIZE`` indices to bound the size of the
+        temporary arrays.
+
+        Args:
+            sparse (bool): If ``True`` the matrix is returned as a
+                ``scipy.sparse.csr_matrix``, otherwise as a dense array.
+
+        Returns:
+            The ``(2 ** nqubits, 2 ** nqubits)`` matrix of the Hamiltonian.
+        """
+        n = 2**self.nqubits
+        masks = {}
+        for i, x in enumerate(self.x_masks):
+            masks.setdefault(int(x), []).append(i)
+        if sparse:
+            rows, columns, values = [], [], []
+        else:
+            matrix = np.zeros((n, n), dtype=np.complex128)
+        for start in range(0, n, kernels.CHUNK_SIZE):
+            chunk = np.arange(start, min(start + kernels.CHUNK_SIZE, n))
+            for x, terms in masks.items():
+                weights = self._weights(chunk, terms)
+                if sparse:
+                    nonzero = np.nonzero(weights)[0]
+                    rows.append(chunk[nonzero] ^ x)
+                    columns.append(chunk[nonzero])
+                    values.append(weights[nonzero])
+                else:
+                    matrix[chunk ^ x, chunk] = weights
+        if not sparse:
+            return matrix
+
+        from scipy import sparse
+
+        if not values:
+            return sparse.csr_matrix((n, n), dtype=np.complex128)
+        values = np.concatenate(values)
+        indices = (np.concatenate(rows), np.concatenate(columns))
+        return sparse.csr_matrix((values, indices), shape=(n, n))
+
+    @property
+    def matrix(self):
+        """Returns the full ``(2 ** nqubits, 2 ** nqubits)`` matrix representation."""
+        return self.dense.matrix
+
+    @property
+    def dense(self):
+        """Creates the equivalent :class:`qibo.hamiltonians.Hamiltonian`."""
+        if self._dense is None:
+            from qibo.hamiltonians.hamiltonians import Hamiltonian
+
+            log.warning(
+                "Calculating the dense form of a Pauli Hamiltonian. "
+                "This operation is memory inefficient."
+            )
+            matrix = self.calculate_matrix()
+            self._dense = Hamiltonian(self.nqubits, matrix, backend=self.backend)
+        return self._dense
+
+    def eigenvalues(self, k=6):
+        return self.dense.eigenvalues(k)
+
+    def eigenvectors(self, k=6):
+        return self.dense.eigenvectors(k)
+
+    def exp(self, a):
+        return self.dense.exp(a)
+
+    def _combine(self, o, sign=1):
+        """Sum of the terms of this Hamiltonian with the terms of ``o`` times ``sign``."""
+        if isinstance(o, self.__class__):
+            if self.nqubits != o.nqubits:
+                raise_error(
+                    RuntimeError,
+                    "Only hamiltonians with the same number of qubits can be added.",
+                )
+            x_masks, z_masks, coefficients = o.x_masks, o.z_masks, o.coefficients
+        elif isinstance(o, self.backend.numeric_types):
+            x_masks, z_masks, coefficients = [0], [0], [o]
+        else:
+            raise_error(
+                NotImplementedError,
+                "Pauli Hamiltonian addition to {} not implemented.".format(type(o)),
+            )
+        return self.from_masks(
+            self.nqubits,
+            np.concatenate([self.x_masks, x_masks]),
+            np.concatenate([self.z_masks, z_masks]),
+            np.concatenate([self.coefficients, sign * np.asarray(coefficients)]),
+            backend=self.backend,
+        )
+
+    def __add__(self, o):
+        return self._combine(o)
+
+    def __sub__(self, o):
+        return self._combine(o, sign=-1)
+
+    def __rsub__(self, o):
+        return (-1) * self._combine(o, sign=-1)
+
+    def __mul__(self, o):
+        if isinstance(o, self.backend.tensor_types):
+            o = complex(o)
+        elif not isinstance(o, self.backend.numeric_types):
+            raise_error(
+                NotImplementedError,
+                "Hamiltonian multiplication to {} " "not implemented.".format(type(o)),
+            )
+        return self.from_masks(
+            self.nqubits,
+            self.x_masks,
+            self.z_masks,
+            o * self.coefficients,
+            backend=self.backend,
+        )
+
+    def __matmul__(self, o):
+        if isinstance(o, self.__class__):
+            if self.nqubits != o.nqubits:
+                raise_error(
+                    RuntimeError,
+                    "Only hamiltonians with the same number of qubits can be "
+                    "multiplied.",
+                )
+            terms = [
+                self._product(int(x1), int(z1), c1, int(x2), int(z2), c2)
+                for x1, z1, c1 in zip(self.x_masks, self.z_masks, self.coefficients)
+                for x2, z2, c2 in zip(o.x_masks, o.z_masks, o.coefficients)
+            ]
+            x_masks, z_masks, coefficients = zip(*terms) if terms else ([], [], [])
+            return self.from_masks(
+                self.nqubits, x_masks, z_masks, coefficients, backend=self.backend
+            )
+
+        if isinstance(o, self.backend.tensor_types):
+            rank = len(tuple(o.shape))
+            if rank not in (1, 2):
+                raise_error(
+                    NotImplementedError,
+                    "Cannot multiply Hamiltonian with " "rank-{} tensor.".format(rank),
+                )
+            return self.backend.cast(self.apply(self.backend.to_numpy(o)))
+
+        raise_error(
+            NotImplementedError,
+            "Hamiltonian matmul to {} not " "implemented.".format(type(o)),
+        )
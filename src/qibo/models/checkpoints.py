@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+import collections
+
+import numpy as np
+
+from qibo import gates
+from qibo.config import CHECKPOINT_MEMORY, raise_error
+
+
+class StateCheckpoints:
+    """Intermediate states of circuit executions that are reused by later executions.
+
+    The queue of the circuit is split after the given ``positions`` and,
+    when the circuit is executed from the default initial state, the state
+    reached at the end of each part is stored together with the parameters
+    of the gates that produced it. Later executions resume from the last
+    stored state whose preceding parameters did not change, so that
+    changing only the parameters of the last gates requires simulating only
+    the end of the circuit. Stored states are removed in least recently used
+    order when their total size exceeds the ``memory`` budget.
+
+    Gates are not fused across checkpoint positions. Checkpoints are not
+    used when the circuit contains callbacks or gates with symbolic
+    parameters. States restored from checkpoints are not tracked by
+    Tensorflow for backpropagation.
+
+    Example:
+        .. testcode::
+
+            import numpy as np
+            from qibo import gates, models
+            c = models.Circuit(4)
+            c.add(gates.RY(q, theta=0) for q in range(4))
+            c.add(gates.CZ(q, q + 1) for q in range(3))
+            c.add(gates.RY(q, theta=0) for q in range(4))
+            # store the state after the first seven gates
+            c.set_checkpoints([7])
+            params = np.random.random(8)
+            c.set_parameters(params)
+            state = c()
+            # only the last four gates are applied
+            params[-1] = 0.5
+            c.set_parameters(params)
+            state = c()
+
+    Args:
+        positions (list): Numbers of gates, counted from the beginning of
+            the queue, after which the state is stored.
+        memory (int): Memory budget in bytes for the stored states.
+            If ``None`` the value of ``qibo.config.CHECKPOINT_MEMORY`` is used.
+    """
+
+    def __init__(self, positions, memory=None):
+        positions = sorted({int(p) for p in positions})
+        if not positions or positions[0] < 1:
+            raise_error(ValueError, "Checkpoint positions must be positive.")
+        if memory is None:
+            memory = CHECKPOINT_MEMORY
+        self.positions = positions
+        self.memory = memory
+        self.states = collections.OrderedDict()
+        self.nbytes = 0
+        self._segments = None
+
+    def __getstate__(self):
+        # stored states are not sent when the circuit is pickled,
+        # for example to the processes of parallel executions
+        state = dict(self.__dict__)
+        state.update(states=collections.OrderedDict(), nbytes=0, _segments=None)
+        return state
+
+    def clear(self):
+        """Removes all stored states."""
+        self.states.clear()
+        self.nbytes = 0
+
+    @staticmethod
+    def applicable(circuit):
+        """Checks if the states of a circuit execution can be reused."""
+        for gate in circuit.queue:
+            if isinstance(gate, gates.CallbackGate) or gate.symbolic_parameters:
+                return False
+        return True
+
+    def segments(self, circuit):
+        """Splits the circuit queue in circuits that end at the checkpoint positions.
+
+        The result is cached and calculated again only when the queue of the
+        circuit changes, which also removes the stored states.
+        """
+        from qibo.models.circuit import Circuit
+
+        if self._segments is not None:
+            queue, version, segments = self._segments
+            if queue is circuit.queue and version == circuit.queue.version:
+                return segments
+
+        self.clear()
+        nqubits = circuit.nqubits
+        bounds = [p for p in self.positions if p < len(circuit.queue)]
+        bounds = [0] + bounds + [len(circuit.queue)]
+        segments = []
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            segment = Circuit(nqubits, density_matrix=circuit.density_matrix)
+            for gate in circuit.queue[start:stop]:
+                segment.add(gate)
+            segments.append(segment)
+        self._segments = (circuit.queue, circuit.queue.version, segments)
+        return segments
+
+    @staticmethod
+    def _parameters(circuit):
+        """Hashable representation of the parameters of all gates in a circuit."""
+        return tuple(
+            np.asarray(p).tobytes()
+            for gate in circuit.parametrized_gates
+            for p in gate.parameters
+        )
+
+    def _store(self, key, state, backend):
+        if key in self.states:
+            self.states.move_to_end(key)
+            return
+        nbytes = np.dtype(backend.dtype).itemsize * int(np.prod(tuple(state.shape)))
+        if nbytes > self.memory:
+            return
+        while self.states and self.nbytes + nbytes > self.memory:
+            _, (_, removed) = self.states.popitem(last=False)
+            self.nbytes -= removed
+        # the execution continues updating the state in place so a copy is stored
+        self.states[key] = (backend.cast(state, copy=True), nbytes)
+        self.nbytes += nbytes
+
+    def execute(self, backend, circuit):
+        """Executes a circuit from the default initial state reusing stored states.
+
+        Args:
+            backend (:class:`qibo.backends.abstract.Backend`): Backend used
+                for applying the gates.
+            circuit (:class:`qibo.models.circuit.Circuit`): Circuit to execute.
+
+        Returns:
+            The final state vector or density matrix.
+        """
+        nqubits = circuit.nqubits
+        density_matrix = circuit.density_matrix
+        if self.applicable(circuit):
+            segments = self.segments(circuit)
+            keys = []
+            for segment in segments[:-1]:
+                previous = keys[-1] if keys else ()
+                keys.append(previous + (self._parameters(segment),))
+        else:
+            segments = [circuit]
+            keys = []
+
+        start, state = 0, None
+        for i in reversed(range(len(keys))):
+            if keys[i] in self.states:
+                self.states.move_to_end(keys[i])
+                state = backend.cast(self.states[keys[i]][0], copy=True)
+                start = i + 1
+                break
+        if state is None:
+            if density_matrix:
+                state = backend.zero_density_matrix(nqubits)
+            else:
+                state = backend.zero_state(nqubits)
+
+        for i in range(start, len(segments)):
+            if backend.planner is None:
+                queue = segments[i].queue
+            else:
+                queue = segments[i].plan(backend.planner)
+            for gate in queue:
+                if density_matrix:
+                    state = gate.apply_density_matrix(
+                        backend, state, nqubits, inplace=True
+                    )
+                else:
+                    state = gate.apply(backend, state, nqubits, inplace=True)
+            if i < len(keys):
+                self._store(keys[i], state, backend)
+        return state
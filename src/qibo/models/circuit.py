@@ -6,7 +6,9 @@ import numpy as np
 
 from qibo import gates
 from qibo import gates as gate_module
+from qibo.backends.matrices import Matrices
 from qibo.config import raise_error
+from qibo.gates.abstract import ParametrizedGate
 
 NoiseMapType = Union[Tuple[int, int, int], Dict[int, Tuple[int, int, int]]]
 
@@ -21,13 +23,94 @@ class _ParametrizedGates(list):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.set = set()
-        self.nparams = 0
+        self.set = set(self)
+        self.nparams = sum(gate.nparams for gate in self)
+        self._layout = None
 
     def append(self, gate):
         super().append(gate)
         self.set.add(gate)
         self.nparams += gate.nparams
+        self._layout = None
+
+    @property
+    def layout(self):
+        """:class:`qibo.models.circuit._ParameterLayout` of the gates in the list.
+
+        Calculated again only after new gates are appended.
+        """
+        if self._layout is None:
+            self._layout = _ParameterLayout(self)
+        return self._layout
+
+
+class _ParameterLayout:
+    """Positions of the parameters of a list of gates in a flat parameter vector.
+
+    Used by ``circuit.set_parameters()`` to update the parameters of all gates
+    from a flat ``np.ndarray`` without validating each update separately.
+    The matrices of the ``RX``, ``RY``, ``RZ`` and ``U3`` gates are calculated
+    for all gates of the same type with a single vectorized call and are
+    stored in the gates, so that they are not calculated again during
+    execution.
+    """
+
+    BATCHED_GATES = {"RX", "RY", "RZ", "U3"}
+    matrices = Matrices(np.complex128)
+
+    def __init__(self, gates):
+        self.entries = []
+        groups = collections.defaultdict(list)
+        start = 0
+        for gate in gates:
+            stop = start + gate.nparams
+            name = gate.__class__.__name__
+            if (
+                name in self.BATCHED_GATES
+                and type(gate) is getattr(gate_module, name)
+                and not gate.is_controlled_by
+            ):
+                index = len(groups[name])
+                groups[name].append(range(start, stop))
+            else:
+                name, index = None, None
+            self.entries.append((gate, start, stop, self._direct(gate), name, index))
+            start = stop
+        self.nparams = start
+        self.groups = {name: np.array(idx) for name, idx in groups.items()}
+
+    @staticmethod
+    def _direct(gate):
+        """Checks if the parameters of a gate can be set without validation."""
+        if type(gate).parameters.fset is not ParametrizedGate.parameters.fset:
+            return False
+        if isinstance(gate.parameter_names, str):
+            return gate.nparams == 1
+        return len(gate.parameter_names) == gate.nparams
+
+    def set(self, values):
+        """Updates the parameters of all gates.
+
+        Args:
+            values (np.ndarray): One dimensional real array with length equal
+                to the total number of parameters of the gates.
+        """
+        matrices = {
+            name: list(self.matrices.batched(name, values[index]))
+            for name, index in self.groups.items()
+        }
+        flat = values.tolist()
+        for gate, start, stop, direct, name, index in self.entries:
+            if direct and not gate.symbolic_parameters and not gate.device_gates:
+                gate._parameters = tuple(flat[start:stop])
+                gate.parameters_version += 1
+                if name is not None:
+                    matrix = matrices[name][index]
+                    gate.cached_matrix = (gate.parameters_version, matrix)
+            elif stop - start == 1:
+                gate.parameters = values[start]
+            else:
+                gate.parameters = values[start:stop]
 
 
 class _Queue(list):
@@ -35,6 +118,8 @@ class _Queue(list):
 
     In addition to the queue, it holds a list of gate moments, where each gate
     is placed in the earliest possible position depending for the qubits it acts.
+    The ``version`` counter is increased every time a gate is added and is
+    used to invalidate cached execution plans.
     """
 
     def __init__(self, nqubits):
@@ -42,6 +127,7 @@ class _Queue(list):
         self.nqubits = nqubits
         self.moments = [nqubits * [None]]
         self.moment_index = nqubits * [0]
+        self.version = 0
 
     def to_fused(self):
         """Transforms all gates in queue to :class:`qibo.gates.FusedGate`."""
@@ -77,6 +163,7 @@ class _Queue(list):
 
     def append(self, gate: gates.Gate):
         super().append(gate)
+        self.version += 1
         if gate.qubits:
             qubits = gate.qubits
         else:  # special gate acting on all qubits
@@ -131,6 +218,8 @@ class Circuit:
         self._final_state = None
         self.compiled = None
         self.repeated_execution = False
+        self._plan = None
+        self.checkpoints = None
 
         self.density_matrix = density_matrix
 
@@ -686,7 +775,15 @@ class Circuit:
 
         Also works if ``parameters`` is ``np.ndarray`` or ``tf.Tensor``.
         """
-        if n == len(self.trainable_gates):
+        if (
+            isinstance(parameters, np.ndarray)
+            and parameters.ndim == 1
+            and parameters.dtype.kind in "iuf"
+            and n == self.trainable_gates.layout.nparams
+        ):
+            # flat real vectors are the common case in optimization loops
+            self.trainable_gates.layout.set(parameters)
+        elif n == len(self.trainable_gates):
             for i, gate in enumerate(self.trainable_gates):
                 gate.parameters = parameters[i]
         elif n == self.trainable_gates.nparams:
@@ -724,6 +821,10 @@ class Circuit:
                 parameters in the circuit.
                 A backend supported tensor (for example ``np.ndarray`` or
                 ``tf.Tensor``) may also be given instead of a flat list.
+                Flat real ``np.ndarray`` vectors are the fastest option, as
+                the parameters are then assigned without validating each
+                gate update and the matrices of ``RX``, ``RY``, ``RZ`` and
+                ``U3`` gates are calculated together.
 
 
         Example:
@@ -928,6 +1029,56 @@ class Circuit:
         circuit.queue = queue.from_fused()
         return circuit
 
+    def plan(self, planner=None):
+        """Queue of gates that is used for executing the circuit.
+
+        The queue is created by an
+        :class:`qibo.models.planner.ExecutionPlanner`, which fuses groups of
+        gates when this reduces the estimated simulation cost. The result is
+        cached on the circuit and calculated again only when the queue of the
+        circuit or the planner configuration changes.
+
+        Args:
+            planner (:class:`qibo.models.planner.ExecutionPlanner`): Planner
+                used to create the queue. If ``None`` a planner with the
+                default configuration is used.
+
+        Returns:
+            List of gates to be applied to the state.
+        """
+        if planner is None:
+            from qibo.models.planner import ExecutionPlanner
+
+            planner = ExecutionPlanner()
+        key = (planner.key, self.queue.version, len(self.queue))
+        if self._plan is not None:
+            queue, cached_key, planned_queue = self._plan
+            if queue is self.queue and cached_key == key:
+                return planned_queue
+        planned_queue = planner.plan(self)
+        self._plan = (self.queue, key, planned_queue)
+        return planned_queue
+
+    def set_checkpoints(self, positions=None, memory=None):
+        """Stores intermediate states so that later executions can skip gates.
+
+        See :class:`qibo.models.checkpoints.StateCheckpoints` for details.
+
+        Args:
+            positions (list): Numbers of gates, counted from the beginning of
+                the queue, after which the state is stored. If ``None`` the
+                checkpoints are removed.
+            memory (int): Memory budget in bytes for the stored states.
+                If ``None`` the value of ``qibo.config.CHECKPOINT_MEMORY`` is
+                used.
+        """
+        if positions is None:
+            self.checkpoints = None
+        else:
+            from qibo.models.checkpoints import StateCheckpoints
+
+            self.checkpoints = StateCheckpoints(positions, memory)
+
     def unitary(self, backend=None):
         """Creates the unitary matrix corresponding to all circuit gates.
 
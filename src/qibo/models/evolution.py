@@ -28,10 +28,19 @@ class StateEvolution:
             matrix will be exponentiated to obtain the exact evolution operator.
             Runge-Kutta solvers use simple matrix multiplications of the
             Hamiltonian to the state and no exponentiation is involved.
+            The 'adaptive-rk45' solver adapts the Runge-Kutta step size to
+            keep the error of each step within a tolerance, and ``dt`` is
+            then only the interval of the times at which callbacks are
+            calculated.
+            The 'krylov' solver applies the exact evolution operator using a
+            Krylov subspace built from Hamiltonian products with the state,
+            without constructing the Hamiltonian matrix.
         callbacks (list): List of callbacks to calculate during evolution.
         accelerators (dict): Dictionary of devices to use for distributed
             execution. This option is available only when the Trotter
             decomposition is used for the time evolution.
+        tolerance (float): Error tolerance of the 'adaptive-rk45' and 'krylov'
+            solvers. If ``None`` the default tolerance of the solver is used.
 
     Example:
         .. testcode::
@@ -48,7 +57,15 @@ class StateEvolution:
             final_state2 = evolve(final_time=2, initial_state=initial_state)
     """
 
-    def __init__(self, hamiltonian, dt, solver="exp", callbacks=[], accelerators=None):
+    def __init__(
+        self,
+        hamiltonian,
+        dt,
+        solver="exp",
+        callbacks=[],
+        accelerators=None,
+        tolerance=None,
+    ):
         hamtypes = (AbstractHamiltonian, BaseAdiabaticHamiltonian)
         if isinstance(hamiltonian, hamtypes):
             ham = hamiltonian
@@ -74,7 +91,7 @@ class StateEvolution:
                     "exponential solver.",
                 )
             ham.circuit(dt, accelerators)
-        self.solver = solvers.get_solver(solver, self.dt, hamiltonian)
+        self.solver = solvers.get_solver(solver, self.dt, hamiltonian, tolerance)
         self.callbacks = callbacks
         self.accelerators = accelerators
         self.normalize_state = self._create_normalize_state(solver)
@@ -123,8 +140,27 @@ class StateEvolution:
             )
         state = self.backend.cast(initial_state)
         self.solver.t = start_time
-        nsteps = int((final_time - start_time) / self.solver.dt)
         self.calculate_callbacks(state)
+        if isinstance(self.solver, solvers.AdaptiveRungeKutta45):
+            # the solver chooses its own steps and ``dt`` is the interval
+            # of the times at which callbacks are calculated
+            self.solver.dt = self.dt
+            # the evolution always ends at the final time, even if it is not
+            # a multiple of ``dt``, but callbacks are calculated only at the
+            # multiples of ``dt``
+            eps = 1e-12 * max(1, abs(final_time))
+            nsteps = int((final_time - start_time + eps) / self.dt)
+            times = [start_time + (i + 1) * self.dt for i in range(nsteps)]
+            if final_time > start_time + eps and (
+                not times or final_time - times[-1] > eps
+            ):
+                times.append(final_time)
+            for i, state in enumerate(self.solver.evolve(state, times)):
+                if self.callbacks and i < nsteps:
+                    self.calculate_callbacks(self.normalize_state(state))
+            return self.normalize_state(state)
+
+        nsteps = int((final_time - start_time) / self.solver.dt)
         for _ in range(nsteps):
             state = self.solver(state)
             if self.callbacks:
@@ -166,17 +202,38 @@ class AdiabaticEvolution(StateEvolution):
             matrix will be exponentiated to obtain the exact evolution operator.
             Runge-Kutta solvers use simple matrix multiplications of the
             Hamiltonian to the state and no exponentiation is involved.
+            The 'adaptive-rk45' solver adapts the Runge-Kutta step size to
+            keep the error of each step within a tolerance, and ``dt`` is
+            then only the interval of the times at which callbacks are
+            calculated.
+            The 'krylov' solver applies the exact evolution operator using a
+            Krylov subspace built from Hamiltonian products with the state,
+            without constructing the Hamiltonian matrix.
         callbacks (list): List of callbacks to calculate during evolution.
         accelerators (dict): Dictionary of devices to use for distributed
             execution. This option is available only when the Trotter
             decomposition is used for the time evolution.
+        tolerance (float): Error tolerance of the 'adaptive-rk45' and 'krylov'
+            solvers. If ``None`` the default tolerance of the solver is used.
     """
 
     ATOL = 1e-7  # Tolerance for checking s(0) = 0 and s(T) = 1.
 
-    def __init__(self, h0, h1, s, dt, solver="exp", callbacks=[], accelerators=None):
+    def __init__(
+        self,
+        h0,
+        h1,
+        s,
+        dt,
+        solver="exp",
+        callbacks=[],
+        accelerators=None,
+        tolerance=None,
+    ):
         self.hamiltonian = AdiabaticHamiltonian(h0, h1)  # pylint: disable=E0110
-        super().__init__(self.hamiltonian, dt, solver, callbacks, accelerators)
+        super().__init__(
+            self.hamiltonian, dt, solver, callbacks, accelerators, tolerance
+        )
 
         # Set evolution model to "Gap" callback if one exists
         for callback in self.callbacks:
@@ -55,6 +55,9 @@ class Grover:
             solution, iterations = grover()
     """
 
+    MAX_CHECKPOINTS = 8
+    """Maximum number of intermediate states kept by the iterative approach."""
+
     def __init__(
         self,
         oracle,
@@ -115,6 +118,10 @@ class Grover:
             self.nqubits - 1
         ]
 
+        self._step_circuit = None
+        self._checkpoints = {}
+        self._checkpoints_backend = None
+
     def initialize(self):
         """Initialize the Grover algorithm with the superposition and Grover ancilla."""
         c = Circuit(self.nqubits)
@@ -175,6 +182,58 @@ class Grover:
         c.add(gates.M(*range(self.sup_qubits)))
         return c
 
+    def iteration_state(self, iterations, backend):
+        """Calculates the state after a given number of Grover iterations.
+
+        States reached by previous calls are kept as checkpoints, so that the
+        evolution resumes from the checkpoint with the largest number of
+        iterations not exceeding ``iterations``. The Grover step is fused once
+        and reused for all calls.
+
+        Args:
+            iterations (int): number of times to repeat the Grover step.
+            backend (:class:`qibo.backends.abstract.Backend`): Backend to use for circuit execution.
+
+        Returns:
+            State vector after ``iterations`` Grover steps, before measurement.
+        """
+        if self._checkpoints_backend is not backend:
+            self._checkpoints = {}
+            self._checkpoints_backend = backend
+        if self._step_circuit is None:
+            self._step_circuit = self.step().fuse()
+
+        completed = [k for k in self._checkpoints if k <= iterations]
+        if completed:
+            start = max(completed)
+            state = self._checkpoints.get(start)
+        else:
+            start = 0
+            state = backend.execute_circuit(self.initialize(), return_array=True)
+            self._store_checkpoint(0, state)
+        for _ in range(iterations - start):
+            # execution copies the initial state so checkpoints are not modified
+            state = backend.execute_circuit(
+                self._step_circuit, initial_state=state, return_array=True
+            )
+        self._store_checkpoint(iterations, state)
+        return state
+
+    def _store_checkpoint(self, iterations, state):
+        if iterations in self._checkpoints:
+            return
+        if len(self._checkpoints) >= self.MAX_CHECKPOINTS:
+            # drop the oldest checkpoint
+            self._checkpoints.pop(next(iter(self._checkpoints)))
+        self._checkpoints[iterations] = state
+
+    def _sample(self, state, backend):
+        """Samples a single bitstring of the superposition qubits."""
+        qubits = tuple(range(self.sup_qubits))
+        probabilities = backend.calculate_probabilities(state, qubits, self.nqubits)
+        sample = backend.sample_shots(probabilities, 1)[0]
+        return format(int(sample), f"0{self.sup_qubits}b")
+
     def iterative_grover(self, lamda_value=6 / 5, backend=None):
         """Iterative approach of Grover for when the number of solutions is not known.
 
@@ -199,9 +258,8 @@ class Grover:
             it = np.random.randint(k + 1)
             if it != 0:
                 total_iterations += it
-                circuit = self.circuit(it)
-                result = backend.execute_circuit(circuit, nshots=1)
-                measured = result.frequencies(binary=True).most_common(1)[0][0]
+                state = self.iteration_state(it, backend)
+                measured = self._sample(state, backend)
                 if self.check(measured, *self.check_args):
                     return measured, total_iterations
             k = min(lamda * k, np.sqrt(self.sup_size))
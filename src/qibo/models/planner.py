@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+from qibo import gates
+from qibo.config import PLANNER_MAX_QUBITS, raise_error
+
+
+class ExecutionPlanner:
+    """Chooses which gates of a circuit are fused before simulation.
+
+    The planner fuses the circuit with the algorithm of
+    :meth:`qibo.models.circuit.Circuit.fuse` for every width up to
+    ``max_qubits``, keeping only fused gates that reduce the estimated cost
+    of the execution, and selects the width with the lowest total cost.
+    The cost of applying a gate is modeled as the time needed for a sweep
+    over the state vector (or density matrix) plus a fixed overhead per gate.
+    The model takes into account the following:
+
+    - Dense gates on ``k`` qubits cost ``SWEEP + DENSE * 2 ** k`` per
+      amplitude, diagonal and permutation gates cost ``DIAGONAL`` and
+      ``PERMUTATION`` respectively.
+    - Controlled gates, including gates such as ``CNOT`` and ``CZ`` whose
+      matrix is a permutation or diagonal, only update the amplitudes in
+      which all controls are in the 1 state.
+    - Fused gates are dense unless all their gates are diagonal or
+      permutations. Their matrix is cached, but it is recalculated when
+      the parameters of a trainable gate they contain change, which costs
+      ``MATRIX`` for each gate they contain. Fused gates that do not contain
+      trainable gates are assumed to be calculated only once.
+    - Special gates, channels and measurements are not fused and cost a
+      full sweep.
+
+    The constants are given in nanoseconds per amplitude and were
+    calibrated for :class:`qibo.backends.numpy.NumpyBackend`.
+
+    Args:
+        max_qubits (int): Maximum number of qubits in the fused gates.
+            If ``None`` the value of ``qibo.config.PLANNER_MAX_QUBITS`` is
+            used.
+    """
+
+    OVERHEAD = 20000
+    SWEEP = 8
+    DENSE = 0.5
+    DIAGONAL = 1.5
+    PERMUTATION = 4
+    MATRIX = 30000
+
+    def __init__(self, max_qubits=None):
+        if max_qubits is None:
+            max_qubits = PLANNER_MAX_QUBITS
+        if max_qubits < 1:
+            raise_error(ValueError, "Maximum number of fused qubits must be positive.")
+        self.max_qubits = max_qubits
+
+    @property
+    def key(self):
+        """Identifier of the planner configuration used for caching plans."""
+        return (self.__class__, self.max_qubits)
+
+    @staticmethod
+    def fusible(gate):
+        """Checks if a gate may participate in fusion."""
+        if isinstance(gate, gates.FusedGate):
+            return all(ExecutionPlanner.fusible(g) for g in gate.gates)
+        if isinstance(gate, (gates.SpecialGate, gates.Channel, gates.M)):
+            return False
+        # gates with symbolic parameters are updated during execution
+        return not gate.symbolic_parameters
+
+    @staticmethod
+    def trainable(gate):
+        """Checks if the parameters of a gate may be updated between executions."""
+        return isinstance(gate, gates.ParametrizedGate) and gate.trainable
+
+    def sweep(self, structure, ntargets, ncontrols, nstates):
+        """Estimated cost of applying a matrix to a state.
+
+        Args:
+            structure (str): Structure of the matrix, as in
+                :attr:`qibo.gates.abstract.Gate.structure`.
+            ntargets (int): Number of qubits that the matrix acts on.
+            ncontrols (int): Number of control qubits that reduce the part
+                of the state that is updated.
+            nstates (int): Number of qubits of the state. For density
+                matrices this is twice the number of qubits.
+        """
+        if structure == "diagonal":
+            cost = self.DIAGONAL
+        elif structure == "permutation":
+            cost = self.PERMUTATION
+        else:
+            cost = self.SWEEP + self.DENSE * 2**ntargets
+        return self.OVERHEAD + cost * 2 ** (nstates - ncontrols)
+
+    def cost(self, gate, nqubits, density_matrix=False):
+        """Estimated cost of applying a gate during circuit execution.
+
+        Args:
+            gate (:class:`qibo.gates.abstract.Gate`): Gate to apply.
+            nqubits (int): Number of qubits in the circuit.
+            density_matrix (bool): If ``True`` the gate is applied to a
+                density matrix.
+        """
+        nstates = 2 * nqubits if density_matrix else nqubits
+        if isinstance(gate, gates.FusedGate) and len(gate.gates) == 1:
+            gate = gate.gates[0]
+        if not self.fusible(gate):
+            return self.OVERHEAD + self.SWEEP * 2**nstates
+
+        if isinstance(gate, gates.FusedGate):
+            ntargets, ncontrols = len(gate.qubits), 0
+            if any(self.trainable(g) for g in gate.gates):
+                matrix = self.MATRIX * len(gate.gates)
+            else:
+                matrix = 0
+        elif gate.is_controlled_by or gate.structure != "dense":
+            ntargets = len(gate.target_qubits)
+            ncontrols = len(gate.control_qubits)
+            matrix = 0
+        else:
+            ntargets, ncontrols = len(gate.qubits), 0
+            matrix = 0
+        cost = self.sweep(gate.structure, ntargets, ncontrols, nstates)
+        if density_matrix:
+            # the matrix is applied to both sides of the density matrix
+            cost *= 2
+        return cost + matrix
+
+    def can_fuse(self, gate1, gate2, max_qubits):
+        """Checks if two :class:`qibo.gates.special.FusedGate` may be fused."""
+        if gate1 is None or not gate1.can_fuse(gate2, max_qubits):
+            return False
+        return self.fusible(gate1) and self.fusible(gate2)
+
+    def fuse(self, circuit, max_qubits):
+        """Fuses the gates of a circuit up to the given number of qubits.
+
+        Fused gates that are estimated to be more expensive than applying
+        the gates they contain one by one are replaced by these gates.
+
+        Args:
+            circuit (:class:`qibo.models.circuit.Circuit`): Circuit to fuse.
+            max_qubits (int): Maximum number of qubits in the fused gates.
+
+        Returns:
+            The queue of gates after fusion.
+        """
+        nqubits, density_matrix = circuit.nqubits, circuit.density_matrix
+        queue = circuit.queue.to_fused()
+        for gate in queue:
+            if not gate.marked:
+                for q in gate.qubits:
+                    # fuse nearest neighbors forth in time
+                    neighbor = gate.right_neighbors.get(q)
+                    if self.can_fuse(gate, neighbor, max_qubits):
+                        gate.fuse(neighbor)
+                    # fuse nearest neighbors back in time
+                    neighbor = gate.left_neighbors.get(q)
+                    if self.can_fuse(neighbor, gate, max_qubits):
+                        neighbor.fuse(gate)
+
+        fused_queue = queue.__class__(nqubits)
+        for gate in queue.from_fused():
+            if isinstance(gate, gates.FusedGate):
+                cost = self.cost(gate, nqubits, density_matrix)
+                separate_cost = self.queue_cost(gate.gates, nqubits, density_matrix)
+                if separate_cost <= cost:
+                    for g in gate.gates:
+                        fused_queue.append(g)
+                    continue
+            fused_queue.append(gate)
+        return fused_queue
+
+    def plan(self, circuit):
+        """Creates the queue of gates used for executing a circuit.
+
+        The circuit is fused for all widths up to ``max_qubits`` and the
+        queue with the lowest estimated cost is selected. If fusion does not
+        reduce the cost the original queue of the circuit is returned.
+
+        Args:
+            circuit (:class:`qibo.models.circuit.Circuit`): Circuit to plan.
+
+        Returns:
+            List of gates to be applied to the state.
+        """
+        nqubits, density_matrix = circuit.nqubits, circuit.density_matrix
+        best_queue = circuit.queue
+        # planning is skipped if applying any of the gates is cheaper than
+        # calculating the matrix of a fused gate, as the reduction of the
+        # cost would be small compared to the time needed for planning
+        width = max((len(gate.qubits) for gate in best_queue), default=0)
+        nstates = 2 * nqubits if density_matrix else nqubits
+        cost = self.sweep("dense", width, 0, nstates)
+        if density_matrix:
+            cost *= 2
+        if cost <= self.MATRIX:
+            return best_queue
+
+        best_cost = self.queue_cost(best_queue, nqubits, density_matrix)
+        for max_qubits in range(1, self.max_qubits + 1):
+            queue = self.fuse(circuit, max_qubits)
+            cost = self.queue_cost(queue, nqubits, density_matrix)
+            if cost < best_cost:
+                best_queue, best_cost = queue, cost
+        return best_queue
+
+    def queue_cost(self, queue, nqubits, density_matrix=False):
+        """Estimated cost of applying all gates of a queue."""
+        return sum(self.cost(gate, nqubits, density_matrix) for gate in queue)
@@ -156,36 +156,43 @@ class StyleQGAN:
         model.compile(loss="binary_crossentropy", optimizer=opt, metrics=["accuracy"])
         return model
 
-    def set_params(self, circuit, params, x_input, i):
-        """Set the parameters for the quantum generator circuit."""
-        p = []
-        index = 0
+    def _noise_indices(self):
+        """Latent dimension used by each parameter of the default generator."""
+        indices = []
         noise = 0
         for l in range(self.layers):
             for q in range(self.nqubits):
-                p.append(params[index] * x_input[noise][i] + params[index + 1])
-                index += 2
-                noise = (noise + 1) % self.latent_dim
-                p.append(params[index] * x_input[noise][i] + params[index + 1])
-                index += 2
-                p.append(params[index] * x_input[noise][i] + params[index + 1])
-                index += 2
-                noise = (noise + 1) % self.latent_dim
-                p.append(params[index] * x_input[noise][i] + params[index + 1])
-                index += 2
-                noise = (noise + 1) % self.latent_dim
-            for i in range(0, self.nqubits - 1):
-                p.append(params[index] * x_input[noise][i] + params[index + 1])
-                index += 2
-                noise = (noise + 1) % self.latent_dim
-            p.append(params[index] * x_input[noise][i] + params[index + 1])
-            index += 2
-            noise = (noise + 1) % self.latent_dim
-        for q in range(self.nqubits):
-            p.append(params[index] * x_input[noise][i] + params[index + 1])
-            index += 2
-            noise = (noise + 1) % self.latent_dim
-        circuit.set_parameters(p)
+                # RY and RZ share the second latent dimension
+                indices.extend([noise, noise + 1, noise + 1, noise + 2])
+                noise += 3
+            # controlled rotations between neighbouring qubits
+            indices.extend(range(noise, noise + self.nqubits))
+            noise += self.nqubits
+        indices.extend(range(noise, noise + self.nqubits))
+        return [i % self.latent_dim for i in indices]
+
+    def generator_parameters(self, params, x_input):
+        """Calculates the default generator parameters for a batch of latent points.
+
+        Each parameter of the circuit is an affine function ``w * x + b`` of
+        one latent dimension ``x``, with weight ``w`` and bias ``b`` given by
+        consecutive elements of ``params``.
+
+        Args:
+            params: Array with the weights and biases of the generator.
+            x_input (np.ndarray): Latent points of shape ``(latent_dim, samples)``.
+
+        Returns:
+            Array of shape ``(samples, nparams)`` with the circuit parameters
+            of each sample.
+        """
+        x = np.transpose(x_input)[:, self._noise_indices()]
+        return params[0::2] * x + params[1::2]
+
+    def set_params(self, circuit, params, x_input, i):
+        """Set the parameters for the quantum generator circuit."""
+        parameters = self.generator_parameters(params, x_input[:, i : i + 1])
+        circuit.set_parameters(parameters[0])
 
     def generate_latent_points(self, samples):
         """Generate points in latent space as input for the quantum generator."""
@@ -202,18 +209,32 @@ class StyleQGAN:
         # generate points in latent space
         x_input = self.generate_latent_points(samples)
         x_input = np.transpose(x_input)
-        # generator outputs
-        X = []
-        for i in range(self.nqubits):
-            X.append([])
-        # quantum generator circuit
-        for i in range(samples):
-            self.set_parameters(circuit, params, x_input, i)
-            final_state = self.backend.execute_circuit(circuit, return_array=True)
-            for ii in range(self.nqubits):
-                X[ii].append(hamiltonians_list[ii].expectation(final_state))
-        # shape array
-        X = tf.stack([X[i] for i in range(len(X))], axis=1)
+        if self.set_parameters == self.set_params:
+            # the circuit is executed for all samples simultaneously and the
+            # Z expectation of each qubit is calculated from the probabilities
+            parameters = self.generator_parameters(params, x_input)
+            result = self.backend.execute_circuit_batched(
+                circuit, parameters=parameters
+            )
+            probabilities = result.probabilities()
+            # qubits in reverse order to match the order of ``hamiltonians_list``
+            basis = np.arange(2**self.nqubits)[:, np.newaxis]
+            signs = 1 - 2 * ((basis >> np.arange(self.nqubits)) & 1)
+            signs = tf.constant(signs, dtype=probabilities.dtype)
+            X = tf.matmul(probabilities, signs)
+        else:
+            # generator outputs
+            X = []
+            for i in range(self.nqubits):
+                X.append([])
+            # quantum generator circuit
+            for i in range(samples):
+                self.set_parameters(circuit, params, x_input, i)
+                final_state = self.backend.execute_circuit(circuit, return_array=True)
+                for ii in range(self.nqubits):
+                    X[ii].append(hamiltonians_list[ii].expectation(final_state))
+            # shape array
+            X = tf.stack([X[i] for i in range(len(X))], axis=1)
         # create class labels
         y = np.zeros((samples, 1))
         return X, y
@@ -2,7 +2,7 @@
 import numpy as np
 
 from qibo import gates
-from qibo.hamiltonians import SymbolicHamiltonian
+from qibo.hamiltonians import DiagonalHamiltonian, SymbolicHamiltonian
 from qibo.models.circuit import Circuit
 from qibo.symbols import X, Y, Z
 
@@ -11,7 +11,7 @@ def calculate_two_to_one(num_cities):
     return np.arange(num_cities**2).reshape(num_cities, num_cities)
 
 
-def tsp_phaser(distance_matrix, backend=None):
+def tsp_phaser(distance_matrix, backend=None, diagonal=False):
     num_cities = distance_matrix.shape[0]
     two_to_one = calculate_two_to_one(num_cities)
     form = 0
@@ -25,6 +25,8 @@ def tsp_phaser(distance_matrix, backend=None):
                         * Z(int(two_to_one[v, (i + 1) % num_cities]))
                     )
     ham = SymbolicHamiltonian(form, backend=backend)
+    if diagonal:
+        return DiagonalHamiltonian.from_hamiltonian(ham)
     return ham
 
 
@@ -146,15 +148,19 @@ class TSP:
         self.num_cities = distance_matrix.shape[0]
         self.two_to_one = calculate_two_to_one(self.num_cities)
 
-    def hamiltonians(self):
+    def hamiltonians(self, diagonal=False):
         """
+        Args:
+            diagonal (bool): If ``True`` the phaser is returned as a
+                :class:`qibo.hamiltonians.DiagonalHamiltonian`.
+
         Returns:
             The pair of Hamiltonian describes the phaser hamiltonian
             and the mixer hamiltonian.
 
         """
         return (
-            tsp_phaser(self.distance_matrix, backend=self.backend),
+            tsp_phaser(self.distance_matrix, backend=self.backend, diagonal=diagonal),
             tsp_mixer(self.num_cities, backend=self.backend),
         )
 
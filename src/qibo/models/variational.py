@@ -29,7 +29,22 @@ class VQE:
             vqe.minimize(initial_parameters)
     """
 
-    from qibo import optimizers
+    from qibo import derivative, optimizers
+
+    GRADIENT_METHODS = {
+        "CG",
+        "BFGS",
+        "Newton-CG",
+        "L-BFGS-B",
+        "TNC",
+        "SLSQP",
+        "dogleg",
+        "trust-ncg",
+        "trust-krylov",
+        "trust-exact",
+        "trust-constr",
+    }
+    """Scipy methods that use the gradient vector."""
 
     def __init__(self, circuit, hamiltonian):
         """Initialize circuit ansatz and hamiltonian."""
@@ -60,6 +75,12 @@ class VQE:
                 See :meth:`qibo.optimizers.optimize` for available optimization
                 methods.
             jac (dict): Method for computing the gradient vector for scipy optimizers.
+                ``'adjoint'`` and ``'parameter_shift'`` calculate the gradient
+                using :meth:`qibo.derivative.adjoint` and
+                :meth:`qibo.derivative.parameter_shift` respectively.
+                If ``None``, the adjoint method is used for the methods in
+                ``VQE.GRADIENT_METHODS`` when the circuit supports it and the
+                backend is not tensorflow.
             hess (dict): Method for computing the hessian matrix for scipy optimizers.
             hessp (callable): Hessian of objective function times an arbitrary
                 vector for scipy optimizers.
@@ -98,6 +119,20 @@ class VQE:
         elif method != "sgd":
             loss = lambda p, c, h: self.hamiltonian.backend.to_numpy(_loss(p, c, h))
 
+        if (
+            jac is None
+            and method in self.GRADIENT_METHODS
+            and self.hamiltonian.backend.name != "tensorflow"
+            and self.derivative.is_differentiable(self.circuit)
+        ):
+            jac = "adjoint"
+        if isinstance(jac, str) and jac in ("adjoint", "parameter_shift"):
+            gradient_method = jac
+
+            def jac(params, circuit, hamiltonian):
+                circuit.set_parameters(params)
+                return self.derivative.gradient(circuit, hamiltonian, gradient_method)
+
         result, parameters, extra = self.optimizers.optimize(
             loss,
             initial_state,
@@ -310,7 +345,8 @@ class QAOA:
         hamiltonian (:class:`qibo.hamiltonians.Hamiltonian`): problem Hamiltonian
             whose ground state is sought.
         mixer (:class:`qibo.hamiltonians.Hamiltonian`): mixer Hamiltonian.
-            Must be of the same type and act on the same number of qubits as ``hamiltonian``.
+            Must be of the same type and act on the same number of qubits as ``hamiltonian``,
+            unless ``hamiltonian`` is a :class:`qibo.hamiltonians.DiagonalHamiltonian`.
             If ``None``, :class:`qibo.hamiltonians.X` is used.
         solver (str): solver used to apply the exponential operators.
             Default solver is 'exp' (:class:`qibo.solvers.Exponential`).
@@ -319,6 +355,14 @@ class QAOA:
             execution. This option is available only when ``hamiltonian``
             is a :class:`qibo.hamiltonians.SymbolicHamiltonian`.
 
+    Dense Hamiltonians that are diagonal in the computational basis are
+    detected and evolved using their diagonal, so that the exponential
+    operators are elementwise phases instead of matrix exponentials. Cost
+    Hamiltonians can also be given directly as
+    :class:`qibo.hamiltonians.DiagonalHamiltonian`, in which case the
+    default mixer is the :class:`qibo.hamiltonians.SymbolicHamiltonian`
+    form of :class:`qibo.hamiltonians.X` that is applied as a circuit.
+
     Example:
         .. testcode::
 
@@ -350,16 +394,17 @@ class QAOA:
             )
         self.hamiltonian = hamiltonian
         self.nqubits = hamiltonian.nqubits
+        diagonal = isinstance(hamiltonian, self.hamiltonians.DiagonalHamiltonian)
         # mixer hamiltonian (default = -sum(sigma_x))
         if mixer is None:
-            trotter = isinstance(
+            trotter = diagonal or isinstance(
                 self.hamiltonian, self.hamiltonians.SymbolicHamiltonian
             )
             self.mixer = self.hamiltonians.X(
                 self.nqubits, dense=not trotter, backend=self.hamiltonian.backend
             )
         else:
-            if type(mixer) != type(hamiltonian):
+            if not diagonal and type(mixer) != type(hamiltonian):
                 raise_error(
                     TypeError,
                     "Given Hamiltonian is of type {} "
@@ -386,14 +431,23 @@ class QAOA:
                 "only with SymbolicHamiltonian and "
                 "exponential solver.",
             )
-        if isinstance(self.hamiltonian, self.hamiltonians.SymbolicHamiltonian):
-            self.hamiltonian.circuit(1e-2, accelerators)
-            self.mixer.circuit(1e-2, accelerators)
+        for ham in (self.hamiltonian, self.mixer):
+            if isinstance(ham, self.hamiltonians.SymbolicHamiltonian):
+                ham.circuit(1e-2, accelerators)
+
+        # dense diagonal Hamiltonians are evolved using their diagonal
+        if isinstance(self.hamiltonian, self.hamiltonians.Hamiltonian):
+            try:
+                hamiltonian = self.hamiltonians.DiagonalHamiltonian.from_hamiltonian(
+                    self.hamiltonian
+                )
+            except ValueError:
+                pass
 
         # evolution solvers
         from qibo.solvers import get_solver
 
-        self.ham_solver = get_solver(solver, 1e-2, self.hamiltonian)
+        self.ham_solver = get_solver(solver, 1e-2, hamiltonian)
         self.mix_solver = get_solver(solver, 1e-2, self.mixer)
 
         self.callbacks = callbacks
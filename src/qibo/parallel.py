@@ -2,6 +2,318 @@
 """
 Resources for parallel circuit evaluation.
 """
+import collections
+import concurrent.futures
+import itertools
+import os
+import pickle
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+# circuit, backend and shared memory blocks of each worker process
+_WORKER = {}
+
+
+def _backend_payload(backend):
+    """Pickled backend, or its settings if the backend cannot be pickled."""
+    try:
+        return pickle.dumps(backend)
+    except (TypeError, AttributeError, pickle.PicklingError):
+        return {
+            "type": type(backend),
+            "name": backend.name,
+            "platform": backend.platform,
+            "precision": backend.precision,
+            "device": backend.device,
+            "planner": getattr(backend, "planner", None),
+        }
+
+
+def _load_backend(payload):
+    """Creates the backend described by :meth:`qibo.parallel._backend_payload`."""
+    if isinstance(payload, bytes):
+        return pickle.loads(payload)
+    if payload["platform"] is None:
+        # also works for backends that are not available in ``construct_backend``
+        backend = payload["type"]()
+    else:  # pragma: no cover
+        from qibo.backends import construct_backend
+
+        backend = construct_backend(payload["name"], platform=payload["platform"])
+    backend.set_precision(payload["precision"])
+    backend.set_device(payload["device"])
+    if payload["planner"] is not None:
+        backend.planner = payload["planner"]
+    return backend
+
+
+def _initialize_worker(payload, backend_payload):
+    """Loads the circuit and the backend once in each worker process."""
+    backend = _load_backend(backend_payload)
+    # the processes already use all cores
+    if backend.nthreads != 1:  # pragma: no cover
+        backend.set_threads(1)
+    circuit, initial_state = pickle.loads(payload)
+    _WORKER.update(
+        circuit=circuit,
+        backend=backend,
+        initial_state=initial_state,
+        parameters=circuit.get_parameters(),
+        buffers={},
+    )
+
+
+def _buffers(*keys):
+    """Views of shared memory blocks, attached once in each worker process."""
+    buffers = _WORKER["buffers"]
+    names = {key[0] for key in keys if key is not None}
+    # blocks of previous calls are not used anymore
+    for name in set(buffers) - names:
+        memory, array = buffers.pop(name)
+        del array
+        memory.close()
+    views = []
+    for key in keys:
+        if key is None:
+            views.append(None)
+            continue
+        name, shape, dtype = key
+        if name not in buffers:
+            memory = shared_memory.SharedMemory(name=name)
+            array = np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+            buffers[name] = (memory, array)
+        views.append(buffers[name][1])
+    return views
+
+
+def _execute_chunk(output, slot, size, parameters=None, states=None):
+    """Executes the circuit for a chunk of inputs in a worker process.
+
+    Final states are written to the given ``slot`` of the ``output``
+    shared memory block, so that they are not pickled. If ``parameters``
+    are not given, the circuit is executed with its parameters at the time
+    it was sent to the workers.
+    """
+    circuit, backend = _WORKER["circuit"], _WORKER["backend"]
+    if parameters is None:
+        circuit.set_parameters(_WORKER["parameters"])
+    results, inputs = _buffers(output, states)
+    results = results[slot]
+    if inputs is not None:
+        inputs = inputs[slot]
+    for k in range(size):
+        if parameters is not None:
+            circuit.set_parameters(parameters[k])
+        state = _WORKER["initial_state"] if inputs is None else inputs[k]
+        if state is not None:
+            state = backend.cast(state, copy=True)
+        result = backend.execute_circuit(circuit, state)
+        results[k] = backend.to_numpy(result.state())
+    return size
+
+
+class SharedBuffer:
+    """Array in a shared memory block that is released when closed."""
+
+    def __init__(self, shape, dtype):
+        dtype = np.dtype(dtype)
+        size = max(1, int(np.prod(shape)) * dtype.itemsize)
+        self.memory = shared_memory.SharedMemory(create=True, size=size)
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self.memory.buf)
+        self.key = (self.memory.name, shape, dtype.str)
+
+    def close(self):
+        """Releases the shared memory block."""
+        del self.array
+        self.memory.close()
+        self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class ParallelExecutor:
+    """Executes a circuit for many parameters or initial states in worker processes.
+
+    The worker processes are started once when the executor is created and
+    receive a pickled copy of the circuit, which is reused for all
+    subsequent executions. Only parameter vectors are sent to the workers
+    for each task, while initial states and final states are exchanged
+    through shared memory buffers instead of being pickled.
+
+    Inputs are sent to the workers in chunks. At most two chunks per
+    process are executed or waiting at any time, so that the memory used
+    for the final states does not grow with the number of inputs.
+
+    Example:
+        .. code-block:: python
+
+            import numpy as np
+            from qibo import models, gates
+            from qibo.parallel import ParallelExecutor
+            # create circuit
+            circuit = models.Circuit(4)
+            circuit.add(gates.RY(q, theta=0) for q in range(4))
+            circuit.add(gates.CZ(q, q + 1) for q in range(3))
+            # sweep over random parameters
+            parameters = np.random.uniform(0, 2 * np.pi, (1000, 4))
+            with ParallelExecutor(circuit, processes=2) as executor:
+                states = executor.map(parameters, chunksize=50)
+
+    Args:
+        circuit (qibo.models.Circuit): the circuit to execute.
+        initial_state (np.array): initial state used for the executions when
+            initial states are not given. If ``None`` the zero state is used.
+        processes (int): number of worker processes. If ``None`` the number
+            of logical cores is used.
+        backend (qibo.backends.abstract.Backend): backend used by the workers.
+            If ``None`` the global backend is used.
+    """
+
+    def __init__(self, circuit, initial_state=None, processes=None, backend=None):
+        if backend is None:  # pragma: no cover
+            from qibo.backends import GlobalBackend
+
+            backend = GlobalBackend()
+        if initial_state is not None:
+            initial_state = backend.to_numpy(initial_state)
+        self.backend = backend
+        self.processes = processes or os.cpu_count() or 1
+        nstates = 2**circuit.nqubits
+        self.shape = (nstates, nstates) if circuit.density_matrix else (nstates,)
+        # the copy does not hold the results of previous executions
+        payload = pickle.dumps((circuit.copy(), initial_state))
+        # start the resource tracker before the workers so that they share it
+        # and do not release the shared memory blocks of the parent
+        resource_tracker.ensure_running()
+        self.pool = concurrent.futures.ProcessPoolExecutor(
+            self.processes,
+            initializer=_initialize_worker,
+            initargs=(payload, _backend_payload(backend)),
+        )
+
+    def close(self):
+        """Stops the worker processes."""
+        self.pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def imap(self, parameters=None, states=None, chunksize=1):
+        """Executes the circuit and yields the final states in the order of the inputs.
+
+        Args:
+            parameters (iterable): parameters of the circuit for each execution,
+                in any format accepted by
+                :meth:`qibo.models.circuit.Circuit.set_parameters`.
+            states (iterable): initial states for each execution. If both
+                ``parameters`` and ``states`` are given they are paired.
+            chunksize (int): number of inputs sent to a worker in each task.
+
+        Yields:
+            Final state vectors, or density matrices, as numpy arrays.
+        """
+        if parameters is None and states is None:  # pragma: no cover
+            from qibo.config import raise_error
+
+            raise_error(ValueError, "Parameters or initial states should be given.")
+        if chunksize < 1:
+            from qibo.config import raise_error
+
+            raise_error(ValueError, "Chunk size must be positive.")
+
+        nslots = 2 * self.processes
+        shape = (nslots, chunksize) + self.shape
+        dtype = self.backend.dtype
+        with SharedBuffer(shape, dtype) as output:
+            inputs = SharedBuffer(shape, dtype) if states is not None else None
+            free = list(range(nslots))
+            pending = collections.deque()
+            try:
+                for chunk_parameters, chunk_states in self._chunks(
+                    parameters, states, chunksize
+                ):
+                    if not free:
+                        yield from self._collect(pending.popleft(), output, free)
+                    slot = free.pop()
+                    if chunk_states is None:
+                        size = len(chunk_parameters)
+                    else:
+                        size = len(chunk_states)
+                        for k, state in enumerate(chunk_states):
+                            inputs.array[slot, k] = self.backend.to_numpy(state)
+                    future = self.pool.submit(
+                        _execute_chunk,
+                        output.key,
+                        slot,
+                        size,
+                        chunk_parameters,
+                        None if inputs is None else inputs.key,
+                    )
+                    pending.append((future, slot))
+                while pending:
+                    yield from self._collect(pending.popleft(), output, free)
+            finally:
+                for future, _ in pending:
+                    future.cancel()
+                concurrent.futures.wait([future for future, _ in pending])
+                if inputs is not None:
+                    inputs.close()
+
+    def map(self, parameters=None, states=None, chunksize=None):
+        """Executes the circuit for all inputs.
+
+        Arguments are the same as in :meth:`qibo.parallel.ParallelExecutor.imap`.
+        If ``chunksize`` is ``None`` the inputs are split evenly to four
+        chunks per process.
+
+        Returns:
+            List with the final states.
+        """
+        if parameters is not None:
+            parameters = list(parameters)
+        if states is not None:
+            states = list(states)
+        if chunksize is None:
+            size = len(states) if parameters is None else len(parameters)
+            chunksize = max(1, -(-size // (4 * self.processes)))
+        return list(self.imap(parameters, states, chunksize))
+
+    @staticmethod
+    def _chunks(parameters, states, chunksize):
+        """Generator of the parameter and state chunks sent to the workers."""
+        if parameters is None:
+            inputs = ((None, state) for state in states)
+        elif states is None:
+            inputs = ((params, None) for params in parameters)
+        else:
+            inputs = zip(parameters, states)
+        inputs = iter(inputs)
+        while True:
+            chunk = list(itertools.islice(inputs, chunksize))
+            if not chunk:
+                return
+            chunk_parameters, chunk_states = zip(*chunk)
+            yield (
+                None if parameters is None else list(chunk_parameters),
+                None if states is None else chunk_states,
+            )
+
+    @staticmethod
+    def _collect(task, output, free):
+        """Yields copies of the final states of a completed task and frees its slot."""
+        future, slot = task
+        size = future.result()
+        for k in range(size):
+            yield np.copy(output.array[slot, k])
+        free.append(slot)
 
 
 def parallel_execution(circuit, states, processes=None, backend=None):
@@ -45,16 +357,11 @@ def parallel_execution(circuit, states, processes=None, backend=None):
 
         raise_error(RuntimeError, "states must be a list.")
 
-    def operation(state, circuit):
-        return backend.execute_circuit(circuit, state)
+    from qibo.states import CircuitResult
 
-    from joblib import Parallel, delayed
-
-    results = Parallel(n_jobs=processes, prefer="threads")(
-        delayed(operation)(state, circuit) for state in states
-    )
-
-    return results
+    with ParallelExecutor(circuit, processes=processes, backend=backend) as executor:
+        results = executor.map(states=states)
+    return [CircuitResult(backend, circuit, backend.cast(x)) for x in results]
 
 
 def parallel_parametrized_execution(
@@ -110,17 +417,8 @@ def parallel_parametrized_execution(
 
         raise_error(RuntimeError, "parameters must be a list.")
 
-    def operation(params, circuit, state):
-        if state is not None:
-            state = backend.cast(state, copy=True)
-        circuit.set_parameters(params)
-        return backend.execute_circuit(circuit, state)
-
-    from joblib import Parallel, delayed
-
-    results = Parallel(n_jobs=processes, prefer="threads")(
-        delayed(operation)(param, circuit.copy(deep=True), initial_state)
-        for param in parameters
-    )
+    from qibo.states import CircuitResult
 
-    return results
+    with ParallelExecutor(circuit, initial_state, processes, backend) as executor:
+        results = executor.map(parameters)
+    return [CircuitResult(backend, circuit, backend.cast(x)) for x in results]
@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+import numpy as np
+
 from qibo.config import raise_error
 from qibo.hamiltonians.abstract import AbstractHamiltonian
 from qibo.hamiltonians.adiabatic import BaseAdiabaticHamiltonian
@@ -69,13 +71,15 @@ class Exponential(BaseSolver):
         U(t) = e^{-i H(t) \\delta t}
 
     Calculates the evolution operator in every step and thus is compatible with
-    time-dependent Hamiltonians.
+    time-dependent Hamiltonians. For :class:`qibo.hamiltonians.DiagonalHamiltonian`
+    the evolution operator is a vector of phases that multiplies the state
+    elementwise.
     """
 
     def __call__(self, state):
-        propagator = self.current_hamiltonian.exp(self.dt)
+        state = self.current_hamiltonian.exp_matmul(self.dt, state)
         self.t += self.dt
-        return (propagator @ state[:, self.backend.np.newaxis])[:, 0]
+        return state
 
 
 class RungeKutta4(BaseSolver):
@@ -85,10 +89,12 @@ class RungeKutta4(BaseSolver):
         ham1 = self.current_hamiltonian
         ham2 = self.hamiltonian(self.t + self.dt / 2.0)
         ham3 = self.hamiltonian(self.t + self.dt)
+        # the derivative of the state is ``-1j`` times the products ``k``
+        dt = -1j * self.dt
         k1 = ham1 @ state
-        k2 = ham2 @ (state + self.dt * k1 / 2.0)
-        k3 = ham2 @ (state + self.dt * k2 / 2.0)
-        k4 = ham3 @ (state + self.dt * k3)
+        k2 = ham2 @ (state + dt * k1 / 2.0)
+        k3 = ham2 @ (state + dt * k2 / 2.0)
+        k4 = ham3 @ (state + dt * k3)
         self.t += self.dt
         return state - 1j * self.dt * (k1 + 2 * k2 + 2 * k3 + k4) / 6.0
 
@@ -103,18 +109,19 @@ class RungeKutta45(BaseSolver):
         ham4 = self.hamiltonian(self.t + 12 * self.dt / 13.0)
         ham5 = self.hamiltonian(self.t + self.dt)
         ham6 = self.hamiltonian(self.t + self.dt / 2.0)
+        # the derivative of the state is ``-1j`` times the products ``k``
+        dt = -1j * self.dt
         k1 = ham1 @ state
-        k2 = ham2 @ (state + self.dt * k1 / 4.0)
-        k3 = ham3 @ (state + self.dt * (3 * k1 + 9 * k2) / 32.0)
-        k4 = ham4 @ (state + self.dt * (1932 * k1 - 7200 * k2 + 7296 * k3) / 2197.0)
+        k2 = ham2 @ (state + dt * k1 / 4.0)
+        k3 = ham3 @ (state + dt * (3 * k1 + 9 * k2) / 32.0)
+        k4 = ham4 @ (state + dt * (1932 * k1 - 7200 * k2 + 7296 * k3) / 2197.0)
         k5 = ham5 @ (
             state
-            + self.dt
-            * (439 * k1 / 216.0 - 8 * k2 + 3680 * k3 / 513.0 - 845 * k4 / 4104.0)
+            + dt * (439 * k1 / 216.0 - 8 * k2 + 3680 * k3 / 513.0 - 845 * k4 / 4104.0)
         )
         k6 = ham6 @ (
             state
-            + self.dt
+            + dt
             * (
                 -8 * k1 / 27.0
                 + 2 * k2
@@ -133,7 +140,275 @@ class RungeKutta45(BaseSolver):
         )
 
 
-def get_solver(solver_name, dt, hamiltonian):
+class AdaptiveRungeKutta45(BaseSolver):
+    """Solver based on the Dormand-Prince 5th order Runge-Kutta method with adaptive step size.
+
+    The difference between the 5th and the embedded 4th order solutions is
+    used as an estimate of the error of each step. Steps with error larger
+    than ``tolerance`` are rejected and repeated with a smaller ``dt``, while
+    the ``dt`` of the next step is grown or shrunk so that its estimated
+    error is close to ``tolerance``.
+
+    States at the times requested by :meth:`qibo.solvers.AdaptiveRungeKutta45.evolve`
+    are calculated with the 4th order dense output of the method from the
+    step that contains them, so that output times do not restrict the size
+    of the steps.
+
+    Args:
+        dt (float): Initial time step size.
+        hamiltonian (:class:`qibo.hamiltonians.abstract.AbstractHamiltonian`): Hamiltonian object
+            that the state evolves under.
+        tolerance (float): Maximum error of each step, relative to the norm
+            of the state.
+    """
+
+    # bounds of the factor that multiplies ``dt`` after each step
+    MIN_FACTOR = 0.2
+    MAX_FACTOR = 5.0
+
+    def __init__(self, dt, hamiltonian, tolerance=1e-8):
+        super().__init__(dt, hamiltonian)
+        self.tolerance = tolerance
+        # stages of the last step that are used for the dense output
+        self.stages = None
+
+    def _stages(self, state, k1):
+        """Products of the Hamiltonian with the states of the seven stages.
+
+        The last stage is the product with the state at the end of the step,
+        which is also the first stage of the next step.
+        """
+        t, h = self.t, self.dt
+        # the derivative of the state is ``-1j`` times the products ``k``
+        dt = -1j * h
+        k2 = self.hamiltonian(t + h / 5.0) @ (state + dt * k1 / 5.0)
+        k3 = self.hamiltonian(t + 3 * h / 10.0) @ (
+            state + dt * (3 * k1 + 9 * k2) / 40.0
+        )
+        k4 = self.hamiltonian(t + 4 * h / 5.0) @ (
+            state + dt * (44 * k1 / 45.0 - 56 * k2 / 15.0 + 32 * k3 / 9.0)
+        )
+        k5 = self.hamiltonian(t + 8 * h / 9.0) @ (
+            state
+            + dt
+            * (
+                19372 * k1 / 6561.0
+                - 25360 * k2 / 2187.0
+                + 64448 * k3 / 6561.0
+                - 212 * k4 / 729.0
+            )
+        )
+        ham = self.hamiltonian(t + h)
+        k6 = ham @ (
+            state
+            + dt
+            * (
+                9017 * k1 / 3168.0
+                - 355 * k2 / 33.0
+                + 46732 * k3 / 5247.0
+                + 49 * k4 / 176.0
+                - 5103 * k5 / 18656.0
+            )
+        )
+        new_state = state + dt * (
+            35 * k1 / 384.0
+            + 500 * k3 / 1113.0
+            + 125 * k4 / 192.0
+            - 2187 * k5 / 6784.0
+            + 11 * k6 / 84.0
+        )
+        k7 = ham @ new_state
+        return new_state, (k1, k2, k3, k4, k5, k6, k7)
+
+    def __call__(self, state, k1=None):
+        """Performs a single step with error below the tolerance.
+
+        The ``dt`` of the solver is updated to the size proposed for the next
+        step, so that the step that was performed is the difference of ``t``
+        after and before the call.
+
+        Args:
+            state (np.ndarray): State at the current time ``t`` of the solver.
+            k1 (np.ndarray): Product of the current Hamiltonian with ``state``.
+                It is calculated if it is not given.
+        """
+        backend = self.backend
+        norm = backend.to_numpy(backend.calculate_norm(state))
+        if k1 is None:
+            k1 = self.current_hamiltonian @ state
+        while True:
+            new_state, stages = self._stages(state, k1)
+            k1, k2, k3, k4, k5, k6, k7 = stages
+            # difference between the 5th and the 4th order updates
+            difference = self.dt * (
+                71 * k1 / 57600.0
+                - 71 * k3 / 16695.0
+                + 71 * k4 / 1920.0
+                - 17253 * k5 / 339200.0
+                + 22 * k6 / 525.0
+                - k7 / 40.0
+            )
+            error = backend.to_numpy(backend.calculate_norm(difference)) / norm
+            if error == 0:
+                factor = self.MAX_FACTOR
+            else:
+                factor = 0.9 * (self.tolerance / error) ** 0.2
+                factor = min(self.MAX_FACTOR, max(self.MIN_FACTOR, factor))
+            if error <= self.tolerance:
+                break
+            self.dt = self.dt * factor
+
+        self.stages = (self.t, self.dt, state, new_state, stages)
+        self.t += self.dt
+        self.dt = self.dt * factor
+        return new_state
+
+    def interpolate(self, time):
+        """State at a time within the last step, using the dense output."""
+        t, h, state0, state1, (k1, _, k3, k4, k5, k6, k7) = self.stages
+        theta = (time - t) / h
+        dt = -1j * h
+        difference = state1 - state0
+        r3 = dt * k1 - difference
+        r4 = difference - dt * k7 - r3
+        r5 = dt * (
+            -12715105075 * k1 / 11282082432.0
+            + 87487479700 * k3 / 32700410799.0
+            - 10690763975 * k4 / 1880347072.0
+            + 701980252875 * k5 / 199316789632.0
+            - 1453857185 * k6 / 822651844.0
+            + 69997945 * k7 / 29380423.0
+        )
+        return state0 + theta * (
+            difference + (1 - theta) * (r3 + theta * (r4 + (1 - theta) * r5))
+        )
+
+    def evolve(self, state, times):
+        """Generator of the states at the given times.
+
+        Steps of adaptive size are performed until the last time. The states
+        at intermediate times are calculated using the dense output of the
+        step that contains them, while the last step is shortened to end
+        exactly at the last time.
+
+        Args:
+            state (np.ndarray): State at the current time ``t`` of the solver.
+            times (list): Increasing times after ``t``.
+
+        Yields:
+            The state at each of the given times.
+        """
+        if not times:
+            return
+        k1 = self.current_hamiltonian @ state
+        final_time = times[-1]
+        for time in times:
+            # guard against rounding errors when steps end at ``time``
+            eps = 1e-12 * max(1, abs(time))
+            while self.t < time - eps:
+                if self.t + self.dt > final_time:
+                    self.dt = final_time - self.t
+                state = self(state, k1)
+                # the last stage is the first stage of the next step
+                k1 = self.stages[-1][-1]
+            if abs(self.t - time) <= eps:
+                yield state
+            else:
+                yield self.interpolate(time)
+
+
+class Krylov(BaseSolver):
+    """Solver that applies the evolution operator using a Krylov subspace.
+
+    The action of :math:`e^{-i H(t) \\delta t}` on the state is approximated
+    in the Krylov subspace spanned by :math:`H^k |\\psi \\rangle` for
+    :math:`k < m`. The subspace is built with the Lanczos algorithm, which
+    uses only products of the Hamiltonian with states, so that neither the
+    matrix of the Hamiltonian nor the evolution operator is constructed.
+    The dimension :math:`m` of the subspace is increased until the estimated
+    error of the step is smaller than ``tolerance``. If this does not happen
+    within ``max_dimension`` vectors, the step is split to smaller substeps.
+
+    Args:
+        dt (float): Time step size.
+        hamiltonian (:class:`qibo.hamiltonians.abstract.AbstractHamiltonian`): Hamiltonian object
+            that the state evolves under.
+        tolerance (float): Maximum error of each step, relative to the norm
+            of the state.
+        max_dimension (int): Maximum dimension of the Krylov subspace.
+    """
+
+    def __init__(self, dt, hamiltonian, tolerance=1e-10, max_dimension=30):
+        super().__init__(dt, hamiltonian)
+        self.tolerance = tolerance
+        self.max_dimension = max_dimension
+
+    @staticmethod
+    def _coefficients(alpha, beta, dt):
+        """Coefficients of ``exp(-1j * dt * T) e_0`` in the Lanczos basis.
+
+        ``T`` is the tridiagonal projection of the Hamiltonian to the Krylov
+        subspace, with diagonal ``alpha`` and off-diagonal ``beta``.
+        """
+        matrix = np.diag(alpha) + np.diag(beta, 1) + np.diag(beta, -1)
+        eigenvalues, eigenvectors = np.linalg.eigh(matrix)
+        phases = np.exp(-1j * dt * eigenvalues) * eigenvectors[0]
+        return eigenvectors @ phases
+
+    def _step(self, hamiltonian, state, dt):
+        """Applies the evolution operator for time ``dt`` or a fraction of it.
+
+        Returns:
+            The evolved state and the time step that was applied.
+        """
+        backend = self.backend
+        norm = float(backend.to_numpy(backend.calculate_norm(state)))
+        if norm == 0:
+            return state, dt
+        basis = [state / norm]
+        alpha, beta = [], []
+        for j in range(self.max_dimension):
+            vector = hamiltonian @ basis[j]
+            # for Hermitian Hamiltonians the new vector needs to be
+            # orthogonalized only to the two last vectors of the basis
+            if j > 0:
+                vector = vector - beta[j - 1] * basis[j - 1]
+            overlap = backend.np.vdot(basis[j], vector)
+            vector = vector - overlap * basis[j]
+            alpha.append(float(np.real(backend.to_numpy(overlap))))
+            norm_vector = float(backend.to_numpy(backend.calculate_norm(vector)))
+            coefficients = self._coefficients(alpha, beta, dt)
+            error = norm_vector * abs(coefficients[-1])
+            if error < self.tolerance:
+                break
+            beta.append(norm_vector)
+            basis.append(vector / norm_vector)
+        else:
+            # the subspace is not large enough for the whole step
+            beta = beta[:-1]
+            while error >= self.tolerance:
+                dt = dt / 2
+                coefficients = self._coefficients(alpha, beta, dt)
+                error = norm_vector * abs(coefficients[-1])
+
+        result = 0
+        for coefficient, vector in zip(coefficients, basis):
+            result = result + (norm * coefficient) * vector
+        return result, dt
+
+    def __call__(self, state):
+        hamiltonian = self.current_hamiltonian
+        remaining = self.dt
+        while abs(remaining) > 1e-14 * abs(self.dt):
+            state, step = self._step(hamiltonian, state, remaining)
+            remaining -= step
+        self.t += self.dt
+        return state
+
+
+def get_solver(solver_name, dt, hamiltonian, tolerance=None):
+    # the default tolerance of each solver is used if it is not given
+    kwargs = {} if tolerance is None else {"tolerance": tolerance}
     if solver_name == "exp":
         if isinstance(hamiltonian, AbstractHamiltonian):
             h0 = hamiltonian
@@ -153,5 +428,11 @@ def get_solver(solver_name, dt, hamiltonian):
     elif solver_name == "rk45":
         return RungeKutta45(dt, hamiltonian)
 
+    elif solver_name == "adaptive-rk45":
+        return AdaptiveRungeKutta45(dt, hamiltonian, **kwargs)
+
+    elif solver_name == "krylov":
+        return Krylov(dt, hamiltonian, **kwargs)
+
     else:  # pragma: no cover
         raise_error(ValueError, f"Unknown solver {solver_name}.")
@@ -15,6 +15,8 @@ class CircuitResult:
 
         self._samples = None
         self._frequencies = None
+        self._sampler = None
+        self._marginals = {}
         self._bitflip_p0 = None
         self._bitflip_p1 = None
 
@@ -85,10 +87,64 @@ class CircuitResult:
     def probabilities(self, qubits=None):
         """Calculates measurement probabilities by tracing out qubits.
 
+        The probabilities of all basis states are calculated once and kept
+        in memory. Marginal distributions are also kept and are calculated
+        from the smallest marginal already calculated for a superset of
+        ``qubits``, so that querying many subsets of qubits does not require
+        a pass over the full state for each of them.
+
         Args:
-            qubits (list, set): Set of qubits that are measured.
+            qubits (list, set): Set of qubits that are measured. If ``None``
+                the qubits of the circuit's measurement gate are used.
+        """
+        if qubits is None:
+            qubits = self.circuit.measurement_gate.qubits
+        qubits = tuple(qubits)
+        key = tuple(sorted(qubits))
+        if key not in self._marginals:
+            if not self._marginals:
+                all_qubits = tuple(range(self.nqubits))
+                self._marginals[all_qubits] = self.backend.circuit_result_probabilities(
+                    self, all_qubits
+                )
+            supersets = (k for k in self._marginals if set(key).issubset(k))
+            source = min(supersets, key=len)
+            self._marginals[key] = self.backend.calculate_marginal_probabilities(
+                self._marginals[source], source, key
+            )
+        if qubits == key:
+            return self._marginals[key]
+        return self.backend.calculate_marginal_probabilities(
+            self._marginals[key], key, qubits
+        )
+
+    def sampler(self):
+        """Sampler of the measured qubits' outcomes.
+
+        The :class:`qibo.backends.sampling.Sampler` is created the first time
+        it is requested and reused for all subsequent draws from this result.
         """
-        return self.backend.circuit_result_probabilities(self, qubits)
+        if self._sampler is None:
+            probs = self.probabilities(self.circuit.measurement_gate.qubits)
+            self._sampler = self.backend.sampler(probs)
+        return self._sampler
+
+    def _apply_bitflip_noise(self, samples):
+        """Applies the bitflip noise of the measurement gate to decimal samples."""
+        mgate = self.circuit.measurement_gate
+        if not mgate.has_bitflip_noise():
+            return samples
+        qubits = mgate.qubits
+        p0, p1 = mgate.bitflip_map
+        bitflip_probabilities = [
+            [p0.get(q) for q in qubits],
+            [p1.get(q) for q in qubits],
+        ]
+        noiseless_samples = self.backend.samples_to_binary(samples, len(qubits))
+        noisy_samples = self.backend.apply_bitflips(
+            noiseless_samples, bitflip_probabilities
+        )
+        return self.backend.samples_to_decimal(noisy_samples, len(qubits))
 
     def samples(self, binary=True, registers=False):
         """Returns raw measurement samples.
@@ -114,22 +170,8 @@ class CircuitResult:
         qubits = self.circuit.measurement_gate.qubits
         if self._samples is None:
             probs = self.probabilities(qubits)
-            self._samples = self.backend.sample_shots(probs, self.nshots)
-            if self.circuit.measurement_gate.has_bitflip_noise():
-                p0, p1 = self.circuit.measurement_gate.bitflip_map
-                bitflip_probabilities = [
-                    [p0.get(q) for q in qubits],
-                    [p1.get(q) for q in qubits],
-                ]
-                noiseless_samples = self.backend.samples_to_binary(
-                    self._samples, len(qubits)
-                )
-                noisy_samples = self.backend.apply_bitflips(
-                    noiseless_samples, bitflip_probabilities
-                )
-                self._samples = self.backend.samples_to_decimal(
-                    noisy_samples, len(qubits)
-                )
+            samples = self.backend.sample_shots(probs, self.nshots)
+            self._samples = self._apply_bitflip_noise(samples)
 
         if registers:
             qubit_map = {q: i for i, q in enumerate(qubits)}
@@ -151,6 +193,34 @@ class CircuitResult:
         else:
             return self._samples
 
+    def stream_samples(self, nshots=None, batch_size=None, binary=True):
+        """Generator of measurement samples drawn in batches.
+
+        Unlike :meth:`qibo.states.CircuitResult.samples` the samples are
+        not stored, so that arbitrarily many shots can be processed with
+        bounded memory.
+
+        Args:
+            nshots (int): Total number of shots. If ``None`` the number of
+                shots of the result is used.
+            batch_size (int): Maximum number of shots in each batch. If
+                ``None`` the value of ``qibo.config.SHOT_BATCH_SIZE`` is used.
+            binary (bool): Return samples in binary or decimal form.
+
+        Yields:
+            Tensors with the samples of each batch, with the shapes described
+            in :meth:`qibo.states.CircuitResult.samples`.
+        """
+        if nshots is None:
+            nshots = self.nshots
+        nqubits = len(self.circuit.measurement_gate.qubits)
+        for samples in self.sampler().batches(nshots, batch_size):
+            samples = self._apply_bitflip_noise(samples)
+            if binary:
+                yield self.backend.samples_to_binary(samples, nqubits)
+            else:
+                yield samples
+
     @staticmethod
     def _frequencies_to_binary(frequencies, nqubits):
         return collections.Counter(
@@ -232,3 +302,83 @@ class CircuitResult:
             )
         noiseless_samples = self.samples()
         return self.backend.apply_bitflips(noiseless_samples, probs)
+
+
+class BatchedCircuitResult:
+    """Result of a batched circuit execution.
+
+    Holds the final state vectors of all the elements of a batch that were
+    simulated simultaneously using
+    :meth:`qibo.backends.abstract.Backend.execute_circuit_batched`.
+    Indexing or iterating the object gives the
+    :class:`qibo.states.CircuitResult` of each element, which can then be
+    used for sampling.
+
+    Args:
+        backend (:class:`qibo.backends.abstract.Backend`): Backend used for
+            the execution.
+        circuit (:class:`qibo.models.circuit.Circuit`): Circuit that was
+            executed.
+        execution_result: Tensor of shape ``(batch, 2 ** nqubits)`` holding
+            the final state vectors.
+        nshots (int): Number of measurement shots for each element.
+    """
+
+    def __init__(self, backend, circuit, execution_result, nshots=None):
+        self.backend = backend
+        self.circuit = circuit
+        self.nqubits = circuit.nqubits
+        self.density_matrix = False
+        self.execution_result = execution_result
+        self.nshots = nshots
+        self._results = len(self) * [None]
+
+    def __len__(self):
+        return int(self.execution_result.shape[0])
+
+    def __getitem__(self, i):
+        if self._results[i] is None:
+            self._results[i] = CircuitResult(
+                self.backend, self.circuit, self.execution_result[i], self.nshots
+            )
+        return self._results[i]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def state(self, numpy=False):
+        """Final state vectors as a tensor of shape ``(batch, 2 ** nqubits)``.
+
+        Args:
+            numpy (bool): If ``True`` the returned tensor will be a numpy array,
+                otherwise it will follow the backend tensor type.
+                Default is ``False``.
+        """
+        if numpy:
+            return self.backend.to_numpy(self.execution_result)
+        return self.execution_result
+
+    def __array__(self):
+        """Final state vectors as an array."""
+        return self.state(numpy=True)
+
+    def probabilities(self, qubits=None):
+        """Calculates measurement probabilities for all elements of the batch.
+
+        Args:
+            qubits (list, set): Set of qubits that are measured. If ``None``
+                the qubits of the circuit's measurement gate are used, or all
+                qubits if the circuit contains no measurements.
+
+        Returns:
+            Tensor of shape ``(batch, 2 ** len(qubits))``.
+        """
+        if qubits is None:
+            if self.circuit.measurement_gate is None:
+                qubits = tuple(range(self.nqubits))
+            else:
+                qubits = self.circuit.measurement_gate.qubits
+        return self.backend.calculate_probabilities_batched(
+            self.execution_result, qubits, self.nqubits
+        )
@@ -11,8 +11,15 @@ import pytest
 from qibo.backends import construct_backend
 
 # backends to be tested
-BACKENDS = ["numpy", "tensorflow", "qibojit-numba", "qibojit-cupy", "qibojit-cuquantum"]
-# multigpu configurations to be tested (only with qibojit-cupy)
+BACKENDS = [
+    "numpy",
+    "memmap",
+    "tensorflow",
+    "qibojit-numba",
+    "qibojit-cupy",
+    "qibojit-cuquantum",
+]
+# multigpu configurations to be tested (with backends that support multigpu)
 ACCELERATORS = [
     {"/GPU:0": 1, "/GPU:1": 1},
     {"/GPU:0": 2, "/GPU:1": 2},
@@ -2,7 +2,7 @@
 import numpy as np
 import pytest
 
-from qibo import gates
+from qibo import gates, matrices
 
 ####################### Test `asmatrix` #######################
 GATES = [
@@ -123,3 +123,290 @@ def test_plus_density_matrix(backend):
     matrix = backend.plus_density_matrix(4)
     target_matrix = np.ones((16, 16)) / 16
     backend.assert_allclose(matrix, target_matrix)
+
+
+def test_einsum_plan_cache():
+    from qibo.backends.einsum_utils import EinsumPlanCache
+
+    cache = EinsumPlanCache(maxsize=2)
+    plan = cache.get((0,), (), 3)
+    assert plan.opstring == "abc,da->dbc"
+    assert cache.get((0,), (), 3) is plan
+    assert (cache.hits, cache.misses) == (1, 1)
+    cplan = cache.get((2,), (0,), 3)
+    assert cplan.order == [0, 1, 2]
+    assert cplan.reduced_targets == (1,)
+    assert cplan.state_shape == (2, 2, 2)
+    # creating a third plan evicts the least recently used
+    cache.get((1,), (), 3, density_matrix=True)
+    assert len(cache) == 2
+    assert cache.get((0,), (), 3) is not plan
+    assert (cache.hits, cache.misses) == (1, 4)
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+    with pytest.raises(ValueError):
+        cache = EinsumPlanCache(maxsize=0)
+
+
+def test_einsum_plan_path():
+    from qibo.backends.einsum_utils import EinsumPlan
+
+    state = np.zeros(16 * (2,))
+    matrix = np.zeros(4 * (2,))
+    plan = EinsumPlan((0, 1), (), 16)
+    assert plan.path(plan.opstring, state, matrix)[0] == "einsum_path"
+    plan = EinsumPlan((5, 6), (), 16)
+    assert plan.path(plan.opstring, state, matrix) is False
+    plan = EinsumPlan((0, 1), (), 4)
+    state = np.zeros(4 * (2,))
+    assert plan.path(plan.opstring, state, matrix) is False
+
+
+def test_apply_gate_uses_plan_cache(backend):
+    from qibo.tests.utils import random_state
+
+    backend.einsum_plans.clear()
+    state = random_state(3)
+    target_state = backend.apply_gate(gates.H(1), np.copy(state), 3)
+    for _ in range(3):
+        final_state = backend.apply_gate(gates.H(1), np.copy(state), 3)
+        backend.assert_allclose(final_state, target_state)
+    assert backend.einsum_plans.misses == 1
+    assert backend.einsum_plans.hits == 3
+
+
+@pytest.mark.parametrize(
+    "gate",
+    [
+        gates.H(3),
+        gates.CNOT(12, 1),
+        gates.RZ(5, theta=0.3),
+        gates.fSim(0, 7, theta=0.1, phi=0.2),
+        gates.RY(2, theta=0.4).controlled_by(0, 10),
+        gates.U1(9, theta=0.5).controlled_by(4, 13),
+        gates.Y(6),
+        gates.FSWAP(2, 11),
+        gates.TOFFOLI(0, 5, 3),
+        gates.X(1).controlled_by(0, 2, 3),
+        gates.RZZ(4, 1, theta=0.2),
+    ],
+)
+@pytest.mark.parametrize("density_matrix", [False, True])
+def test_apply_gate_kernels(backend, gate, density_matrix):
+    from qibo.backends import kernels
+    from qibo.tests.utils import random_density_matrix, random_state
+
+    nqubits = 14 if not density_matrix else 7
+    if max(gate.qubits) >= nqubits:
+        pytest.skip("Gate does not fit in the density matrix.")
+    if density_matrix and backend.name == "tensorflow" and len(gate.qubits) > 3:
+        pytest.skip("Tensorflow does not support slicing more than eight dimensions.")
+    if density_matrix:
+        state = random_density_matrix(nqubits)
+        target_state = backend._apply_gate_density_matrix_einsum(
+            gate, np.copy(state), nqubits
+        )
+        apply_gate = backend.apply_gate_density_matrix
+    else:
+        state = random_state(nqubits)
+        target_state = backend._apply_gate_einsum(gate, np.copy(state), nqubits)
+        apply_gate = backend.apply_gate
+    initial_state = np.copy(state)
+    final_state = apply_gate(gate, state, nqubits)
+    assert 2 * nqubits >= kernels.MIN_QUBITS
+    backend.assert_allclose(final_state, target_state)
+    # the given state is modified only when requested
+    backend.assert_allclose(state, initial_state)
+    final_state = apply_gate(gate, backend.cast(state), nqubits, inplace=True)
+    backend.assert_allclose(final_state, target_state)
+
+
+def test_kernels_chunks():
+    from qibo.backends import kernels
+    from qibo.tests.utils import random_state
+
+    nqubits = 18
+    state = random_state(nqubits)
+    matrix = np.array([[0, 1j], [1, 0]])
+    target_state = np.reshape(np.copy(state), (2, 2, -1))
+    target_state = np.stack([1j * target_state[:, 1], target_state[:, 0]], axis=1)
+    scratch = kernels.Scratch()
+    final_state = kernels.apply_matrix(state, matrix, (1,), (), nqubits, scratch)
+    assert final_state is state
+    np.testing.assert_allclose(final_state, target_state.ravel())
+    shape, block_shape, blocks = kernels.plan((1,), (), nqubits)
+    assert shape == (2, 2, 2 ** (nqubits - 2))
+    assert block_shape == (2, 1, kernels.CHUNK_SIZE)
+    assert len(blocks) == 3
+    permutation, phases = kernels.permutation(matrix)
+    assert permutation == [1, 0]
+    np.testing.assert_allclose(phases, [1j, 1])
+
+
+@pytest.mark.parametrize(
+    "matrix,structure",
+    [
+        (np.diag([1, -1j, 2, 0.5]), "diagonal"),
+        (np.kron(matrices.Y, matrices.Z), "permutation"),
+        (np.array([[1, 0, 0, 0], [0, 0, 1, 0], [0, 1j, 0, 0], [0, 0, 0, -1]]), None),
+        (np.kron(matrices.X + matrices.Z, matrices.X) + np.eye(4), "dense"),
+    ],
+)
+@pytest.mark.parametrize("targets", [(3, 1), (0, 5), (8, 9)])
+def test_kernels_accumulate(matrix, structure, targets):
+    from qibo.backends import NumpyBackend, kernels
+    from qibo.tests.utils import random_state
+
+    if structure is None:
+        # permutation that is not of the form ``i -> i ^ x``
+        structure = "permutation"
+    nqubits = 10
+    assert kernels.matrix_structure(matrix) == structure
+    state = random_state(nqubits)
+    result = random_state(nqubits)
+    target = np.copy(result)
+    target += NumpyBackend().apply_gate(
+        gates.Unitary(matrix, *targets), np.copy(state), nqubits
+    )
+    original = np.copy(state)
+    scratch = kernels.Scratch()
+    final = kernels.accumulate(
+        result, state, matrix, targets, nqubits, structure, scratch
+    )
+    assert final is result
+    np.testing.assert_allclose(final, target)
+    np.testing.assert_allclose(state, original)
+
+
+def test_kernels_accumulate_scratch_size():
+    """Check that the flipped product is accumulated in blocks."""
+    from qibo.backends import NumpyBackend, kernels
+    from qibo.tests.utils import random_state
+
+    nqubits = 19
+    matrix = np.kron(matrices.Y, matrices.Z)
+    state = random_state(nqubits)
+    result = np.zeros_like(state)
+    target = NumpyBackend().apply_gate(gates.Unitary(matrix, 3, 15), state, nqubits)
+    scratch = kernels.Scratch()
+    kernels.accumulate(result, state, matrix, (3, 15), nqubits, "permutation", scratch)
+    np.testing.assert_allclose(result, target)
+    # two buffers with all target configurations of a block
+    assert scratch._buffers[state.dtype].size == 2 * 4 * kernels.CHUNK_SIZE
+
+
+@pytest.mark.parametrize("density_matrix", [False, True])
+def test_default_hamiltonian_terms_product(backend, density_matrix):
+    """Check the default product that applies every term as a gate."""
+    from qibo.backends.abstract import Backend
+    from qibo.models import Circuit
+    from qibo.tests.utils import random_density_matrix, random_state
+
+    nqubits = 4
+    terms = [
+        ((0, 2), np.kron(matrices.X, matrices.Z), "permutation"),
+        ((1,), matrices.Y, "permutation"),
+        ((3, 1), np.kron(matrices.X + matrices.Z, matrices.X), "dense"),
+    ]
+    if density_matrix:
+        state = backend.cast(random_density_matrix(nqubits))
+    else:
+        state = backend.cast(random_state(nqubits))
+    original = backend.to_numpy(state).copy()
+    target = 0.5 * original
+    for targets, matrix, _ in terms:
+        c = Circuit(nqubits)
+        c.add(gates.Unitary(matrix, *targets))
+        target += backend.to_numpy(c.unitary(backend)) @ original
+    result = Backend.calculate_hamiltonian_terms_product(
+        backend, terms, state, nqubits, 0.5, density_matrix
+    )
+    backend.assert_allclose(result, target)
+    backend.assert_allclose(state, original)
+
+
+@pytest.mark.parametrize("memory", [2**6, 2**9, None])
+@pytest.mark.parametrize("density_matrix", [False, True])
+def test_memmap_backend_execution(memory, density_matrix):
+    from qibo.backends import NumpyBackend
+    from qibo.backends.memmap import MemmapBackend, StateMemmap
+    from qibo.models import Circuit
+    from qibo.tests.utils import random_density_matrix, random_state
+
+    nqubits = 4 if density_matrix else 8
+    c = Circuit(nqubits, density_matrix=density_matrix)
+    for q in range(nqubits):
+        c.add(gates.H(q))
+        c.add(gates.CNOT(q, (q + 3) % nqubits))
+        c.add(gates.RY((q + 1) % nqubits, theta=0.1 * q))
+        c.add(gates.fSim(q, (q + 2) % nqubits, theta=0.3, phi=0.2))
+        c.add(gates.U3(q, 0.1, 0.2, 0.3).controlled_by((q + 1) % nqubits))
+        c.add(gates.CZ(q, (q + 1) % nqubits))
+    if density_matrix:
+        state = random_density_matrix(nqubits)
+    else:
+        state = random_state(nqubits)
+
+    backend = MemmapBackend(memory=memory)
+    result = backend.execute_circuit(c, initial_state=np.copy(state))
+    target = NumpyBackend().execute_circuit(c, initial_state=np.copy(state))
+    assert isinstance(result.state(), StateMemmap)
+    backend.assert_allclose(result.state(), target.state())
+    backend.assert_allclose(result.probabilities((2, 0)), target.probabilities((2, 0)))
+    backend.assert_allclose(
+        result.probabilities(range(nqubits)), target.probabilities(range(nqubits))
+    )
+
+
+def test_memmap_backend_swaps():
+    from qibo.backends.kernels import Scratch
+    from qibo.backends.memmap import BlockedState
+    from qibo.tests.utils import random_state
+
+    nqubits = 6
+    state = random_state(nqubits)
+    blocked = BlockedState(np.copy(state), nqubits, 3, Scratch())
+    target = np.reshape(state, nqubits * (2,))
+    # global-local, global-global and local-local swaps
+    for position1, position2 in [(0, 4), (1, 2), (3, 5)]:
+        blocked.swap(position1, position2)
+        target = np.swapaxes(target, position1, position2)
+        np.testing.assert_allclose(blocked.state, target.ravel())
+    assert blocked.layout == [4, 2, 1, 5, 0, 3]
+    blocked.restore()
+    assert blocked.layout == list(range(nqubits))
+    np.testing.assert_allclose(blocked.state, state)
+
+
+def test_numpy_backend_distributed_execution():
+    import dill
+
+    from qibo import callbacks
+    from qibo.backends import NumpyBackend
+    from qibo.models import Circuit
+    from qibo.tests.utils import random_state
+
+    backend = NumpyBackend()
+    nqubits = 6
+    entropy = callbacks.EntanglementEntropy([0])
+    circuits = [Circuit(nqubits, {"/CPU:0": 4}), Circuit(nqubits)]
+    for c in circuits:
+        c.add(gates.H(i) for i in range(nqubits))
+        c.add(gates.CNOT(i, i + 1) for i in range(nqubits - 1))
+        c.add(gates.RX(i, theta=0.1 * i) for i in range(nqubits))
+        c.add(gates.CallbackGate(entropy))
+        c.add(gates.Z(3).controlled_by(0, 1))
+        c.add(gates.SWAP(0, nqubits - 1))
+    initial_state = random_state(nqubits)
+    result = backend.execute_circuit(circuits[0], np.copy(initial_state))
+    target = backend.execute_circuit(circuits[1], np.copy(initial_state))
+    backend.assert_allclose(result.state(), target.state())
+    backend.assert_allclose(entropy[0], entropy[1])
+    # re-execution reuses the worker processes, which are not pickled
+    assert backend.workers._executor is not None
+    result = backend.execute_circuit(circuits[0], result)
+    target = backend.execute_circuit(circuits[1], target)
+    backend.assert_allclose(result.state(), target.state())
+    assert dill.loads(dill.dumps(backend)).workers._executor is None
+    backend.workers.shutdown()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""Test gradient methods defined in `qibo/derivative.py`."""
+import numpy as np
+import pytest
+
+from qibo import derivative, gates, hamiltonians, models
+
+
+def finite_differences(backend, circuit, hamiltonian, parameters, eps=1e-6):
+    def expectation(x):
+        circuit.set_parameters(x)
+        state = backend.execute_circuit(circuit).state()
+        return np.real(backend.to_numpy(hamiltonian.expectation(state)))
+
+    gradient = []
+    for shift in eps * np.eye(len(parameters)):
+        forward = expectation(parameters + shift)
+        backward = expectation(parameters - shift)
+        gradient.append((forward - backward) / (2 * eps))
+    circuit.set_parameters(parameters)
+    return np.array(gradient)
+
+
+def test_adjoint(backend):
+    nqubits = 4
+    c = models.Circuit(nqubits)
+    c.add(gates.H(q) for q in range(nqubits))
+    c.add(gates.RX(q, theta=0) for q in range(nqubits))
+    c.add(gates.CRY(0, 1, theta=0))
+    c.add(gates.CU3(1, 2, theta=0, phi=0, lam=0))
+    c.add(gates.fSim(2, 3, theta=0, phi=0))
+    c.add(gates.RZ(3, theta=0).controlled_by(0, 1))
+    c.add(gates.CNOT(0, 3))
+    c.add(gates.RXX(0, 2, theta=0))
+    c.add(gates.U1(1, theta=0, trainable=False))
+    c.add(gates.U2(2, phi=0, lam=0))
+    hamiltonian = hamiltonians.XXZ(nqubits, backend=backend)
+    np.random.seed(123)
+    parameters = np.random.uniform(0, 2 * np.pi, c.trainable_gates.nparams)
+    c.set_parameters(parameters)
+    gradient = derivative.adjoint(c, hamiltonian)
+    target = finite_differences(backend, c, hamiltonian, parameters)
+    np.testing.assert_allclose(gradient, target, atol=1e-7)
+
+
+@pytest.mark.parametrize("dense", [False, True])
+def test_parameter_shift(backend, dense):
+    nqubits = 3
+    c = models.Circuit(nqubits)
+    c.add(gates.RY(q, theta=0) for q in range(nqubits))
+    c.add(gates.U3(q, theta=0, phi=0, lam=0) for q in range(nqubits))
+    c.add(gates.CZ(0, 1))
+    c.add(gates.RZZ(1, 2, theta=0))
+    c.add(gates.CU1(0, 2, theta=0))
+    hamiltonian = hamiltonians.TFIM(nqubits, h=0.5, dense=dense, backend=backend)
+    np.random.seed(123)
+    parameters = np.random.uniform(0, 2 * np.pi, c.trainable_gates.nparams)
+    c.set_parameters(parameters)
+    gradient = derivative.parameter_shift(c, hamiltonian)
+    target = finite_differences(backend, c, hamiltonian, parameters)
+    np.testing.assert_allclose(gradient, target, atol=1e-7)
+    np.testing.assert_allclose(c.get_parameters("flatlist"), parameters)
+    gradient = derivative.gradient(c, hamiltonian, method="adjoint")
+    np.testing.assert_allclose(gradient, target, atol=1e-7)
+
+
+def test_gradient_errors(backend):
+    hamiltonian = hamiltonians.Z(2, backend=backend)
+    c = models.Circuit(2)
+    c.add(gates.CRX(0, 1, theta=0.1))
+    assert derivative.is_differentiable(c)
+    with pytest.raises(NotImplementedError):
+        derivative.parameter_shift(c, hamiltonian)
+    with pytest.raises(ValueError):
+        derivative.gradient(c, hamiltonian, method="test")
+
+    c = models.Circuit(2)
+    c.add(gates.Unitary(np.eye(4), 0, 1))
+    assert not derivative.is_differentiable(c)
+    with pytest.raises(NotImplementedError):
+        derivative.adjoint(c, hamiltonian)
+
+    c = models.Circuit(2, density_matrix=True)
+    c.add(gates.RX(0, theta=0.1))
+    assert not derivative.is_differentiable(c)
+    c = models.Circuit(2)
+    c.add(gates.RX(0, theta=0.1))
+    c.add(gates.PauliNoiseChannel(1, px=0.1))
+    assert not derivative.is_differentiable(c)
+
+
+@pytest.mark.parametrize("jac", [None, "adjoint", "parameter_shift"])
+def test_vqe_gradient(backend, jac):
+    nqubits = 3
+    c = models.Circuit(nqubits)
+    c.add(gates.RY(q, theta=0) for q in range(nqubits))
+    c.add(gates.CZ(q, q + 1) for q in range(nqubits - 1))
+    c.add(gates.RY(q, theta=0) for q in range(nqubits))
+    hamiltonian = hamiltonians.XXZ(nqubits, backend=backend)
+    np.random.seed(0)
+    initial_parameters = np.random.uniform(0, 2 * np.pi, 2 * nqubits)
+    vqe = models.VQE(c, hamiltonian)
+    best, _, _ = vqe.minimize(initial_parameters, method="BFGS", jac=jac)
+    target, _, _ = vqe.minimize(initial_parameters, method="BFGS", jac="2-point")
+    np.testing.assert_allclose(best, target, atol=1e-5)
@@ -339,3 +339,39 @@ def test_fused_gate():
     assert gate.qubits == (0, 1, 2)
     assert len(gate.gates) == 3
     assert isinstance(gate.gates[0], gates.TOFFOLI)
+
+
+@pytest.mark.parametrize(
+    "gate,structure",
+    [
+        (gates.H(0), "dense"),
+        (gates.X(0), "permutation"),
+        (gates.Y(0), "permutation"),
+        (gates.Z(0), "diagonal"),
+        (gates.T(0).dagger(), "diagonal"),
+        (gates.RZ(0, theta=0.1), "diagonal"),
+        (gates.U1(0, theta=0.1), "diagonal"),
+        (gates.RX(0, theta=0.1), "dense"),
+        (gates.CNOT(0, 1), "permutation"),
+        (gates.CZ(0, 1), "diagonal"),
+        (gates.CRZ(0, 1, theta=0.1), "diagonal"),
+        (gates.CU1(0, 1, theta=0.1), "diagonal"),
+        (gates.RZZ(0, 1, theta=0.1), "diagonal"),
+        (gates.SWAP(0, 1), "permutation"),
+        (gates.FSWAP(0, 1), "permutation"),
+        (gates.TOFFOLI(0, 1, 2), "permutation"),
+        (gates.Z(0).controlled_by(1, 2), "diagonal"),
+        (gates.fSim(0, 1, theta=0.1, phi=0.2), "dense"),
+    ],
+)
+def test_gate_structure(backend, gate, structure):
+    import numpy as np
+
+    assert gate.structure == structure
+    matrix = backend.to_numpy(gate.asmatrix(backend))
+    nonzero = np.count_nonzero(matrix, axis=1)
+    if structure == "diagonal":
+        np.testing.assert_allclose(matrix, np.diag(np.diagonal(matrix)))
+    elif structure == "permutation":
+        assert (nonzero == 1).all()
+        assert (np.count_nonzero(matrix, axis=0) == 1).all()
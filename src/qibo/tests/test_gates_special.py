@@ -31,3 +31,53 @@ def test_fused_gate_construct_unitary(backend, nqubits):
         toffoli[-2:, -2:] = np.array([[0, 1], [1, 0]])
         target_matrix = toffoli @ np.kron(target_matrix, np.eye(2))
     backend.assert_allclose(gate.asmatrix(backend), target_matrix)
+
+
+def test_fused_gate_structure():
+    gate = gates.FusedGate(0, 1)
+    assert gate.structure == "diagonal"
+    gate.append(gates.Z(0))
+    gate.append(gates.CZ(0, 1))
+    assert gate.structure == "diagonal"
+    gate.prepend(gates.CNOT(1, 0))
+    assert gate.structure == "permutation"
+    gate.append(gates.H(1))
+    assert gate.structure == "dense"
+    gate.append(gates.Z(1))
+    assert gate.structure == "dense"
+
+
+def test_fused_gate_matrix_cache(backend):
+    if backend.name == "tensorflow":  # pragma: no cover
+        pytest.skip("Tensorflow backend does not cache fused matrices.")
+    gate = gates.FusedGate(0, 1)
+    gate.append(gates.H(0))
+    gate.append(gates.CNOT(0, 1))
+    matrix = gate.asmatrix(backend)
+    assert gate.asmatrix(backend) is matrix
+
+    rx = gates.RX(1, theta=0.1)
+    gate.append(rx)
+    assert gate.cached_matrix is None
+    matrix = gate.asmatrix(backend)
+    assert gate.asmatrix(backend) is matrix
+    rx.parameters = 0.2
+    new_matrix = gate.asmatrix(backend)
+    assert new_matrix is not matrix
+    target_matrix = backend._asmatrix_fused(gate)
+    backend.assert_allclose(new_matrix, target_matrix)
+
+
+def test_fused_gate_matrix_cache_set_parameters(backend):
+    c = Circuit(4)
+    c.add(gates.H(0))
+    c.add(gates.CNOT(0, 1))
+    c.add(gates.RY(2, theta=0.1))
+    c.add(gates.CZ(2, 3))
+    fused_c = c.fuse(max_qubits=2)
+    assert fused_c.queue[0].parameters_versions == ()
+    assert fused_c.queue[1].parameters_versions == (1,)
+    for theta in [0.2, 0.3]:
+        c.set_parameters([theta])
+        fused_c.set_parameters([theta])
+        backend.assert_circuitclose(fused_c, c)
@@ -385,3 +385,44 @@ def test_hamiltonian_exponentiation(backend, sparse_type, dense):
 
     backend.assert_allclose(H.exp(0.5), target_matrix)
     backend.assert_allclose(H1.exp(0.5), target_matrix)
+
+
+def test_hamiltonian_sparse_dense_operations(backend):
+    """Test operations between Hamiltonians with sparse and dense matrices."""
+    if backend.name == "tensorflow":
+        pytest.skip("Tensorflow does not support operations with sparse matrices.")
+    H1 = hamiltonians.TFIM(4, h=0.5, sparse=True, backend=backend)
+    H2 = hamiltonians.XXZ(4, delta=0.3, backend=backend)
+    m1 = H1.matrix.toarray()
+    m2 = backend.to_numpy(H2.matrix)
+    backend.assert_allclose((H1 + H2).matrix, m1 + m2)
+    backend.assert_allclose((H2 - H1).matrix, m2 - m1)
+    backend.assert_allclose((H1 @ H2).matrix, m1 @ m2)
+    # operations with scalars keep the matrix sparse
+    H3 = 2 - H1 + 0.5
+    assert backend.issparse(H3.matrix)
+    backend.assert_allclose(H3.matrix.toarray(), 2.5 * np.eye(16) - m1)
+    H4 = H1 @ H1
+    assert backend.issparse(H4.matrix)
+    backend.assert_allclose(H4.matrix.toarray(), m1 @ m1)
+
+
+def test_hamiltonian_sparse_ground_state_and_exp(backend):
+    """Test ground state and exponential of Hamiltonians with sparse matrices."""
+    from scipy.linalg import expm
+
+    if backend.name == "tensorflow":
+        pytest.skip("Tensorflow does not support operations with sparse matrices.")
+    H = hamiltonians.TFIM(6, h=1.5, sparse=True, backend=backend)
+    target = hamiltonians.TFIM(6, h=1.5, backend=backend)
+    backend.assert_allclose(H.eigenvalues(k=3), target.eigenvalues()[:3])
+    overlap = np.vdot(target.ground_state(), H.ground_state())
+    backend.assert_allclose(np.abs(overlap), 1.0)
+
+    target_matrix = expm(-0.3j * backend.to_numpy(target.matrix))
+    assert backend.issparse(H.exp(0.3))
+    backend.assert_allclose((H.exp(0.1) @ H.exp(0.2)).toarray(), target_matrix)
+    state = random_complex((2**6,))
+    target_state = target_matrix @ state
+    backend.assert_allclose(H.exp_matmul(0.3, backend.cast(state)), target_state)
+    backend.assert_allclose(target.exp_matmul(0.3, backend.cast(state)), target_state)
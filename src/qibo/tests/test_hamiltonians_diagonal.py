@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""Test methods of :class:`qibo.hamiltonians.DiagonalHamiltonian`."""
+import numpy as np
+import pytest
+
+from qibo import hamiltonians
+from qibo.tests.utils import random_complex, random_density_matrix, random_state
+
+
+def test_diagonal_hamiltonian_errors(backend):
+    with pytest.raises(ValueError):
+        ham = hamiltonians.DiagonalHamiltonian(2, np.ones(8), backend=backend)
+    with pytest.raises(ValueError):
+        ham = hamiltonians.DiagonalHamiltonian(1, [1j, 1], backend=backend)
+    with pytest.raises(ValueError):
+        ham = hamiltonians.DiagonalHamiltonian.from_hamiltonian(
+            hamiltonians.X(3, backend=backend)
+        )
+    with pytest.raises(ValueError):
+        ham = hamiltonians.DiagonalHamiltonian.from_hamiltonian(
+            hamiltonians.X(3, dense=False, backend=backend)
+        )
+    with pytest.raises(ValueError):
+        ham = hamiltonians.DiagonalHamiltonian.from_hamiltonian(
+            hamiltonians.X(3, pauli=True, backend=backend)
+        )
+    with pytest.raises(TypeError):
+        ham = hamiltonians.DiagonalHamiltonian.from_hamiltonian("test")
+    ham = hamiltonians.DiagonalHamiltonian(2, np.arange(4), backend=backend)
+    with pytest.raises(TypeError):
+        ham.expectation("test")
+    with pytest.raises(ValueError):
+        ham.expectation(backend.cast(np.ones((2, 2, 2))))
+    with pytest.raises(NotImplementedError):
+        ham @ backend.cast(np.ones((2, 2, 2)))
+    with pytest.raises(NotImplementedError):
+        ham + "test"
+    with pytest.raises(RuntimeError):
+        ham + hamiltonians.DiagonalHamiltonian(1, np.ones(2), backend=backend)
+
+
+@pytest.mark.parametrize("form", ["dense", "sparse", "symbolic", "pauli"])
+def test_diagonal_hamiltonian_from_hamiltonian(backend, form):
+    from qibo.symbols import Z
+
+    nqubits = 4
+    target = hamiltonians.MaxCut(nqubits, backend=backend)
+    if form == "dense":
+        ham = target
+    elif form == "sparse":
+        if backend.name == "tensorflow":
+            pytest.skip("Tensorflow does not support operations with sparse matrices.")
+        from scipy import sparse
+
+        matrix = sparse.csr_matrix(backend.to_numpy(target.matrix))
+        ham = hamiltonians.Hamiltonian(nqubits, matrix, backend=backend)
+    elif form == "symbolic":
+        ham = hamiltonians.MaxCut(nqubits, dense=False, backend=backend)
+    else:
+        ham = hamiltonians.MaxCut(nqubits, pauli=True, backend=backend)
+    ham = hamiltonians.DiagonalHamiltonian.from_hamiltonian(ham)
+    backend.assert_allclose(ham.matrix, target.matrix)
+    # products of non-diagonal matrices may be diagonal
+    from qibo.symbols import X
+
+    sham = hamiltonians.SymbolicHamiltonian(
+        X(0) * X(0) + 0.5 * Z(0) * Z(2) - 1, backend=backend
+    )
+    ham = hamiltonians.DiagonalHamiltonian.from_hamiltonian(sham)
+    backend.assert_allclose(ham.matrix, sham.matrix)
+
+
+@pytest.mark.parametrize("density_matrix", [False, True])
+def test_diagonal_hamiltonian_expectation(backend, density_matrix):
+    nqubits = 4
+    target = hamiltonians.MaxCut(nqubits, backend=backend)
+    ham = hamiltonians.MaxCut(nqubits, diagonal=True, backend=backend)
+    if density_matrix:
+        state = backend.cast(random_density_matrix(nqubits))
+    else:
+        state = backend.cast(random_state(nqubits))
+    backend.assert_allclose(ham.expectation(state), target.expectation(state))
+    backend.assert_allclose(
+        ham.expectation(2 * state, normalize=True), target.expectation(state)
+    )
+
+
+def test_diagonal_hamiltonian_matmul_and_exp(backend):
+    from scipy.linalg import expm
+
+    nqubits = 3
+    ham = hamiltonians.Z(nqubits, diagonal=True, backend=backend)
+    matrix = backend.to_numpy(hamiltonians.Z(nqubits, backend=backend).matrix)
+    state = random_complex((2**nqubits,))
+    backend.assert_allclose(ham @ backend.cast(state), matrix @ state)
+    rho = random_complex((2**nqubits, 2**nqubits))
+    backend.assert_allclose(ham @ backend.cast(rho), matrix @ rho)
+    backend.assert_allclose((ham @ ham).matrix, matrix @ matrix)
+    backend.assert_allclose(np.diag(ham.exp(0.3)), expm(-0.3j * matrix))
+    eigvals = np.linalg.eigvalsh(matrix)
+    backend.assert_allclose(ham.eigenvalues(), eigvals)
+    eigvecs = backend.to_numpy(ham.eigenvectors())
+    backend.assert_allclose(eigvecs.T.conj() @ matrix @ eigvecs, np.diag(eigvals))
+    backend.assert_allclose(ham.ground_state(), eigvecs[:, 0])
+
+
+def test_diagonal_hamiltonian_algebra(backend):
+    nqubits = 3
+    diagonal1 = np.random.random(2**nqubits)
+    diagonal2 = np.random.random(2**nqubits)
+    ham1 = hamiltonians.DiagonalHamiltonian(nqubits, diagonal1, backend=backend)
+    ham2 = hamiltonians.DiagonalHamiltonian(nqubits, diagonal2, backend=backend)
+    backend.assert_allclose((ham1 + ham2).diagonal, diagonal1 + diagonal2)
+    backend.assert_allclose((ham1 - ham2).diagonal, diagonal1 - diagonal2)
+    backend.assert_allclose((ham1 + 2).diagonal, diagonal1 + 2)
+    backend.assert_allclose((ham1 - 2).diagonal, diagonal1 - 2)
+    backend.assert_allclose((2 - ham1).diagonal, 2 - diagonal1)
+    backend.assert_allclose((0.5 * ham1).diagonal, 0.5 * diagonal1)
+
+
+def test_tsp_diagonal_phaser(backend):
+    from qibo.models.tsp import TSP
+
+    distance_matrix = np.array([[0, 0.9, 0.8], [0.4, 0, 0.1], [0, 0.7, 0]])
+    tsp = TSP(distance_matrix, backend=backend)
+    phaser, mixer = tsp.hamiltonians()
+    diagonal_phaser, _ = tsp.hamiltonians(diagonal=True)
+    assert isinstance(diagonal_phaser, hamiltonians.DiagonalHamiltonian)
+    backend.assert_allclose(diagonal_phaser.matrix, phaser.matrix)
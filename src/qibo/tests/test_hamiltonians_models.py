@@ -53,3 +53,14 @@ def test_maxcut(backend, nqubits, dense, calcterms):
     if (not dense) and calcterms:
         _ = final_ham.terms
     backend.assert_allclose(final_ham.matrix, target_ham)
+
+
+@pytest.mark.parametrize(("model", "kwargs", "filename"), models_config)
+def test_hamiltonian_models_sparse(backend, model, kwargs, filename):
+    """Test that sparse Hamiltonian models agree with the dense ones."""
+    if backend.name == "tensorflow":
+        pytest.skip("Tensorflow does not support operations with sparse matrices.")
+    H = getattr(hamiltonians, model)(**kwargs, sparse=True, backend=backend)
+    target = getattr(hamiltonians, model)(**kwargs, backend=backend)
+    assert backend.issparse(H.matrix)
+    backend.assert_allclose(H.matrix.toarray(), target.matrix)
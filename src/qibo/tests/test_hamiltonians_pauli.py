@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""Test methods of :class:`qibo.hamiltonians.PauliHamiltonian`."""
+import numpy as np
+import pytest
+
+from qibo import hamiltonians, matrices
+from qibo.tests.utils import random_complex, random_density_matrix, random_state
+
+
+def pauli_matrix(string):
+    """Dense matrix of a Pauli string."""
+    matrix = np.ones((1, 1))
+    for pauli in string:
+        matrix = np.kron(matrix, getattr(matrices, pauli))
+    return matrix
+
+
+def random_terms(nqubits, nterms, seed=0):
+    """Random Hermitian sum of Pauli strings and its dense matrix."""
+    rng = np.random.default_rng(seed)
+    terms = {}
+    for _ in range(nterms):
+        string = "".join(rng.choice(list("IXYZ"), size=nqubits))
+        terms[string] = rng.normal()
+    matrix = sum(c * pauli_matrix(s) for s, c in terms.items())
+    return terms, matrix
+
+
+def test_pauli_hamiltonian_errors(backend):
+    with pytest.raises(ValueError):
+        ham = hamiltonians.PauliHamiltonian(2, {"XYZ": 1.0}, backend=backend)
+    with pytest.raises(ValueError):
+        ham = hamiltonians.PauliHamiltonian(2, {"XA": 1.0}, backend=backend)
+    with pytest.raises(ValueError):
+        ham = hamiltonians.PauliHamiltonian(63, backend=backend)
+    ham = hamiltonians.PauliHamiltonian(2, {"XZ": 1.0}, backend=backend)
+    with pytest.raises(TypeError):
+        ham.expectation("test")
+    with pytest.raises(ValueError):
+        ham.expectation(backend.cast(np.ones((2, 2, 2))))
+    with pytest.raises(NotImplementedError):
+        ham @ backend.cast(np.ones((2, 2, 2)))
+    with pytest.raises(NotImplementedError):
+        ham + "test"
+    with pytest.raises(RuntimeError):
+        ham + hamiltonians.PauliHamiltonian(3, {"XZI": 1.0}, backend=backend)
+
+
+@pytest.mark.parametrize("nqubits", [3, 6])
+@pytest.mark.parametrize("max_group_qubits", [8, 2])
+@pytest.mark.parametrize("density_matrix", [False, True])
+def test_pauli_hamiltonian_expectation(
+    backend, nqubits, max_group_qubits, density_matrix
+):
+    terms, matrix = random_terms(nqubits, 12)
+    ham = hamiltonians.PauliHamiltonian(nqubits, terms, backend=backend)
+    ham.MAX_GROUP_QUBITS = max_group_qubits
+    if density_matrix:
+        state = random_density_matrix(nqubits)
+        target = np.real(np.trace(matrix @ state))
+    else:
+        state = random_state(nqubits)
+        target = np.real(np.vdot(state, matrix @ state))
+    value = ham.expectation(backend.cast(state))
+    backend.assert_allclose(value, target)
+    # second call uses the cached diagonal and groups
+    value = ham.expectation(backend.cast(2 * state), normalize=True)
+    backend.assert_allclose(value, target)
+
+
+@pytest.mark.parametrize("nqubits", [8, 9])
+def test_pauli_hamiltonian_expectation_large_group(backend, nqubits):
+    """Check density matrices with groups of ``MAX_GROUP_QUBITS`` qubits."""
+    terms = {"XXXXXXXX": 1.0, "YXXXXXXZ": 0.5}
+    terms = {"I" * (nqubits - 8) + string: c for string, c in terms.items()}
+    ham = hamiltonians.PauliHamiltonian(nqubits, terms, backend=backend)
+    matrix = sum(c * pauli_matrix(s) for s, c in terms.items())
+    state = random_density_matrix(nqubits)
+    value = ham.expectation(backend.cast(state))
+    backend.assert_allclose(value, np.real(np.trace(matrix @ state)))
+    identity = np.eye(2**nqubits, dtype=complex) / 2**nqubits
+    backend.assert_allclose(ham.expectation(backend.cast(identity)), 0.0)
+
+
+@pytest.mark.parametrize("max_group_qubits", [8, 2])
+def test_pauli_hamiltonian_matmul(backend, max_group_qubits):
+    nqubits = 4
+    terms, matrix = random_terms(nqubits, 10)
+    ham = hamiltonians.PauliHamiltonian(nqubits, terms, backend=backend)
+    ham.MAX_GROUP_QUBITS = max_group_qubits
+    state = random_complex((2**nqubits,))
+    backend.assert_allclose(ham @ backend.cast(state), matrix @ state)
+    rho = random_complex((2**nqubits, 2**nqubits))
+    backend.assert_allclose(ham @ backend.cast(rho), matrix @ rho)
+    backend.assert_allclose(ham.matrix, matrix)
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_pauli_hamiltonian_calculate_matrix(backend, sparse):
+    nqubits = 4
+    terms, matrix = random_terms(nqubits, 10)
+    ham = hamiltonians.PauliHamiltonian(nqubits, terms, backend=backend)
+    result = ham.calculate_matrix(sparse=sparse)
+    if sparse:
+        # XX + YY terms have vanishing elements that are not stored
+        assert result.nnz == np.count_nonzero(np.round(matrix, 12))
+        result = result.toarray()
+    backend.assert_allclose(result, matrix)
+    empty = hamiltonians.PauliHamiltonian(nqubits, backend=backend)
+    assert empty.calculate_matrix(sparse=sparse).shape == matrix.shape
+
+
+def test_pauli_hamiltonian_algebra(backend):
+    nqubits = 3
+    terms1, matrix1 = random_terms(nqubits, 6, seed=1)
+    terms2, matrix2 = random_terms(nqubits, 6, seed=2)
+    ham1 = hamiltonians.PauliHamiltonian(nqubits, terms1, backend=backend)
+    ham2 = hamiltonians.PauliHamiltonian(nqubits, terms2, backend=backend)
+    eye = np.eye(2**nqubits)
+    backend.assert_allclose((ham1 + ham2).matrix, matrix1 + matrix2)
+    backend.assert_allclose((ham1 - 0.5).matrix, matrix1 - 0.5 * eye)
+    backend.assert_allclose((2 - ham1).matrix, 2 * eye - matrix1)
+    backend.assert_allclose((1.5 * ham1).matrix, 1.5 * matrix1)
+    backend.assert_allclose((ham1 @ ham2).matrix, matrix1 @ matrix2)
+    # terms that cancel are removed
+    assert (ham1 - ham1).nterms == 0
+
+
+def test_pauli_hamiltonian_from_symbolic(backend):
+    from qibo.symbols import X, Y, Z
+
+    form = 0.5 * X(0) * Y(1) - Z(0) * X(0) + 2 * Z(2) + 1.5
+    sham = hamiltonians.SymbolicHamiltonian(form, backend=backend)
+    ham = hamiltonians.PauliHamiltonian.from_symbolic(sham)
+    backend.assert_allclose(ham.matrix, sham.matrix)
+
+
+@pytest.mark.parametrize("nqubits", [3, 4])
+@pytest.mark.parametrize(
+    "model,kwargs",
+    [
+        ("TFIM", {"h": 0.7}),
+        ("XXZ", {"delta": 0.3}),
+        ("X", {}),
+        ("Y", {}),
+        ("Z", {}),
+        ("MaxCut", {}),
+    ],
+)
+def test_pauli_hamiltonian_models(backend, nqubits, model, kwargs):
+    ham = getattr(hamiltonians, model)(nqubits, pauli=True, backend=backend, **kwargs)
+    target = getattr(hamiltonians, model)(nqubits, backend=backend, **kwargs)
+    assert isinstance(ham, hamiltonians.PauliHamiltonian)
+    state = random_state(nqubits)
+    backend.assert_allclose(
+        ham.expectation(backend.cast(state)), target.expectation(backend.cast(state))
+    )
+    backend.assert_allclose(ham.matrix, target.matrix, atol=1e-10)
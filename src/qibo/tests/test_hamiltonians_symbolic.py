@@ -52,6 +52,20 @@ def test_symbolictfim_hamiltonian_to_dense(backend, nqubits, calcterms):
     backend.assert_allclose(final_ham.matrix, target_ham.matrix, atol=1e-15)
 
 
+@pytest.mark.parametrize("nqubits", [3, 4])
+def test_symbolic_hamiltonian_to_sparse(backend, nqubits):
+    from qibo.symbols import X, Y, Z
+
+    if backend.name == "tensorflow":
+        pytest.skip("Tensorflow does not support operations with sparse matrices.")
+    sham = sum(X(i) * Y(i + 1) for i in range(nqubits - 1))
+    sham += 0.5 * Z(nqubits - 1) * X(0) - 2 * Z(1) + 1.5
+    final_ham = hamiltonians.SymbolicHamiltonian(sham, backend=backend)
+    sparse_ham = final_ham.calculate_dense(sparse=True)
+    assert backend.issparse(sparse_ham.matrix)
+    backend.assert_allclose(sparse_ham.matrix.toarray(), final_ham.matrix)
+
+
 @pytest.mark.parametrize("nqubits", [3, 4])
 @pytest.mark.parametrize("calcterms", [False, True])
 def test_symbolicxxz_hamiltonian_to_dense(backend, nqubits, calcterms):
@@ -243,6 +257,23 @@ def test_symbolic_hamiltonian_matmul(backend, nqubits, density_matrix, calcterms
     backend.assert_allclose(local_matmul, target_matmul)
 
 
+@pytest.mark.parametrize("density_matrix", [False, True])
+def test_symbolic_hamiltonian_grouped_terms(backend, density_matrix):
+    from qibo.symbols import X, Y, Z
+
+    nqubits = 5
+    form = symbolic_tfim(nqubits, h=0.5) + 0.3 * X(0) * Y(2) * Z(4) - Y(1) + 2.5
+    ham = hamiltonians.SymbolicHamiltonian(form, backend=backend)
+    # terms acting on subsets of the qubits of other terms are merged
+    assert len(ham.grouped_terms) == nqubits
+    shape = 2 * (2**nqubits,) if density_matrix else (2**nqubits,)
+    state = backend.cast(random_complex(shape))
+    original = np.copy(backend.to_numpy(state))
+    target = backend.to_numpy(ham.matrix) @ original
+    backend.assert_allclose(ham @ state, target)
+    backend.assert_allclose(state, original)
+
+
 @pytest.mark.parametrize("nqubits,normalize", [(3, False), (4, False)])
 @pytest.mark.parametrize("calcterms", [False, True])
 @pytest.mark.parametrize("calcdense", [False, True])
@@ -133,3 +133,81 @@ def test_measurementresult_apply_bitflips(backend, i, p0, p1):
     targets = backend.test_regressions("test_measurementresult_apply_bitflips")
     noisy_samples = backend.samples_to_decimal(noisy_samples, 3)
     backend.assert_allclose(noisy_samples, targets[i])
+
+
+@pytest.mark.parametrize(
+    "probabilities",
+    [
+        np.ones(8) / 8,
+        np.array([0.5, 0, 0, 0.5]),
+        np.array([0.05, 0.1, 0.15, 0.7]),
+        np.random.random(64),
+    ],
+)
+def test_alias_table(probabilities):
+    from qibo.backends.sampling import alias_table
+
+    keep, alias = alias_table(probabilities)
+    nstates = len(probabilities)
+    # the table must reproduce the probability of every outcome
+    reconstructed = np.copy(keep)
+    np.add.at(reconstructed, alias, 1 - keep)
+    target = probabilities / np.sum(probabilities)
+    np.testing.assert_allclose(reconstructed / nstates, target, atol=1e-12)
+    assert np.all(keep >= 0) and np.all(keep <= 1)
+
+
+def test_sampler_frequencies(backend):
+    probabilities = np.array([0.05, 0.1, 0.15, 0.7])
+    sampler = backend.sampler(backend.cast(probabilities, dtype="float64"))
+    backend.set_seed(1234)
+    frequencies = sampler.frequencies(100000, batch_size=1000)
+    assert sum(frequencies.values()) == 100000
+    estimated = np.array([frequencies[i] for i in range(4)]) / 100000
+    np.testing.assert_allclose(estimated, probabilities, atol=1e-2)
+
+
+def test_circuit_result_frequencies_backend(backend, monkeypatch):
+    """Check that frequencies are sampled through the backend method."""
+    c = models.Circuit(2)
+    c.add(gates.H(0))
+    c.add(gates.M(0, 1))
+    result = backend.execute_circuit(c, nshots=100)
+    calls = []
+    sample_frequencies = backend.sample_frequencies
+
+    def hook(probabilities, nshots):
+        calls.append(nshots)
+        return sample_frequencies(probabilities, nshots)
+
+    monkeypatch.setattr(backend, "sample_frequencies", hook)
+    frequencies = result.frequencies(binary=False)
+    assert calls == [100]
+    assert sum(frequencies.values()) == 100
+    assert set(frequencies) <= {0, 2}
+    if backend.name != "tensorflow":
+        # the alias table of the last distribution is reused
+        probabilities = backend.to_numpy(result.probabilities((0, 1)))
+        sampler = backend.sampler(probabilities)
+        assert backend.sampler(np.copy(probabilities)) is sampler
+        assert backend.sampler(probabilities[::-1]) is not sampler
+
+
+@pytest.mark.parametrize("binary", [True, False])
+def test_circuit_result_stream_samples(backend, binary):
+    c = models.Circuit(3)
+    c.add(gates.H(0))
+    c.add(gates.X(2))
+    c.add(gates.M(0, 1, 2))
+    result = backend.execute_circuit(c, nshots=100)
+    batches = list(result.stream_samples(nshots=250, batch_size=100, binary=binary))
+    assert [len(batch) for batch in batches] == [100, 100, 50]
+    samples = np.concatenate([backend.to_numpy(batch) for batch in batches])
+    if binary:
+        np.testing.assert_allclose(samples[:, 1:], [[0, 1]] * 250)
+    else:
+        assert set(samples) <= {1, 5}
+    # the sampler is created once and reused by all draws
+    sampler = result.sampler()
+    _ = result.frequencies()
+    assert result.sampler() is sampler
@@ -64,3 +64,31 @@ def test_two_variables_backpropagation():
     target_grad2 = -np.cos(t[0]) * np.sin(t[1])
     target_grad = np.array([target_grad1, target_grad2]) / 2.0
     backend.assert_allclose(grad, target_grad)
+
+
+def test_symbolic_hamiltonian_backpropagation():
+    backend = construct_tensorflow_backend()
+    import tensorflow as tf
+
+    from qibo import hamiltonians
+    from qibo.symbols import X, Z
+
+    ham = hamiltonians.SymbolicHamiltonian(
+        X(0) * X(1) + 0.5 * Z(0) + 2, backend=backend
+    )
+    theta = tf.Variable([0.1234, 0.4321], dtype="float64")
+    with tf.GradientTape() as tape:
+        c = Circuit(2)
+        c.add(gates.RY(0, theta[0]))
+        c.add(gates.RY(1, theta[1]))
+        result = backend.execute_circuit(c)
+        loss = ham.expectation(result.state())
+    grad = tape.gradient(loss, theta)
+
+    t = np.array([0.1234, 0.4321])
+    target_loss = np.sin(t[0]) * np.sin(t[1]) + 0.5 * np.cos(t[0]) + 2
+    backend.assert_allclose(loss, target_loss)
+
+    target_grad1 = np.cos(t[0]) * np.sin(t[1]) - 0.5 * np.sin(t[0])
+    target_grad2 = np.sin(t[0]) * np.cos(t[1])
+    backend.assert_allclose(grad, [target_grad1, target_grad2])
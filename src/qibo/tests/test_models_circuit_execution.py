@@ -107,3 +107,132 @@ def test_density_matrix_circuit(backend):
     target_rho = m2.dot(target_rho).dot(m2.T.conj())
     target_rho = m3.dot(target_rho).dot(m3.T.conj())
     backend.assert_allclose(final_rho, target_rho)
+
+
+def test_batched_execute_initial_states(backend):
+    from qibo.tests.utils import random_state
+
+    c = Circuit(4)
+    c.add(gates.H(i) for i in range(4))
+    c.add(gates.CNOT(0, 2))
+    c.add(gates.RY(1, theta=0.123))
+    c.add(gates.Z(3).controlled_by(0, 1))
+    c.add(gates.fSim(1, 3, theta=0.1, phi=0.2))
+    initial_states = np.array([random_state(4) for _ in range(5)])
+    result = backend.execute_circuit_batched(c, np.copy(initial_states))
+    assert len(result) == 5
+    for i, initial_state in enumerate(initial_states):
+        target_state = backend.execute_circuit(c, np.copy(initial_state))
+        backend.assert_allclose(result[i], target_state)
+        target_probs = target_state.probabilities(qubits=[2, 0])
+        backend.assert_allclose(result.probabilities([2, 0])[i], target_probs)
+
+
+def test_batched_execute_parameters(backend):
+    c = Circuit(3)
+    c.add(gates.RX(0, theta=0))
+    c.add(gates.RY(1, theta=0))
+    c.add(gates.CRZ(0, 2, theta=0))
+    c.add(gates.H(2))
+    c.add(gates.U3(2, theta=0, phi=0, lam=0))
+    c.add(gates.M(0, 2))
+    parameters = np.random.random((4, 6))
+    result = backend.execute_circuit_batched(c, parameters=parameters, nshots=10)
+    for params, element in zip(parameters, result):
+        c.set_parameters(params)
+        target_state = backend.execute_circuit(c)
+        backend.assert_allclose(element, target_state)
+        assert sum(element.frequencies().values()) == 10
+    # check that original parameters are restored
+    backend.assert_allclose(c.get_parameters(format="flatlist"), parameters[-1])
+
+
+def test_batched_execute_parameters_fused(backend):
+    c = Circuit(3)
+    c.add(gates.RX(0, theta=0.1))
+    c.add(gates.CNOT(0, 1))
+    c.add(gates.RZ(1, theta=0.2))
+    c.add(gates.fSim(1, 2, theta=0.3, phi=0.4))
+    c.add(gates.RY(2, theta=0.5))
+    parameters = np.random.random((3, 5))
+    original = c.get_parameters(format="flatlist")
+    # matrices of fused gates are calculated by setting the parameters
+    fused = c.fuse()
+    for circuit in [c, fused]:
+        result = backend.execute_circuit_batched(circuit, parameters=parameters)
+        backend.assert_allclose(circuit.get_parameters(format="flatlist"), original)
+        for params, element in zip(parameters, result):
+            target = c.copy(deep=True)
+            target.set_parameters(params)
+            backend.assert_allclose(element, backend.execute_circuit(target))
+
+
+def test_batched_execute_errors(backend):
+    c = Circuit(2)
+    c.add(gates.H(0))
+    with pytest.raises(ValueError):
+        backend.execute_circuit_batched(c)
+    with pytest.raises(ValueError):
+        backend.execute_circuit_batched(c, np.ones(4) / 2)
+    c.add(gates.CallbackGate(None))
+    with pytest.raises(NotImplementedError):
+        backend.execute_circuit_batched(c, np.ones((2, 4)) / 2)
+    c = Circuit(2, density_matrix=True)
+    with pytest.raises(NotImplementedError):
+        backend.execute_circuit_batched(c, np.ones((2, 4)) / 2)
+
+
+@pytest.mark.parametrize("density_matrix", [False, True])
+def test_checkpoints_execute(backend, density_matrix):
+    def create_circuit():
+        c = Circuit(4, density_matrix=density_matrix)
+        for _ in range(3):
+            c.add(gates.RY(q, theta=0) for q in range(4))
+            c.add(gates.CZ(q, q + 1) for q in range(3))
+        return c
+
+    target_circuit = create_circuit()
+    c = create_circuit()
+    c.set_checkpoints([7, 14])
+    np.random.seed(123)
+    parameters = np.random.random(12)
+    for i in [11, 10, 5, 11, 0, 11]:
+        parameters[i] = np.random.random()
+        target_circuit.set_parameters(parameters)
+        c.set_parameters(parameters)
+        target_state = backend.execute_circuit(target_circuit).state()
+        backend.assert_allclose(backend.execute_circuit(c).state(), target_state)
+        if backend.name == "numpy":
+            assert len(c.checkpoints.states) > 0
+
+    c.set_checkpoints()
+    assert c.checkpoints is None
+
+
+def test_checkpoints_memory(backend):
+    from qibo import callbacks
+
+    c = Circuit(3)
+    c.add(gates.RX(q, theta=0.1) for q in range(3))
+    c.add(gates.RY(q, theta=0.2) for q in range(3))
+    target_state = backend.execute_circuit(c).state()
+    # only one state vector of three qubits fits in the budget
+    c.set_checkpoints([1, 2, 3], memory=160)
+    backend.execute_circuit(c)
+    backend.assert_allclose(backend.execute_circuit(c).state(), target_state)
+    if backend.name == "numpy":
+        assert len(c.checkpoints.states) == 1
+        assert c.checkpoints.nbytes == 128
+        # the least recently used states were removed
+        assert len(list(c.checkpoints.states.keys())[0]) == 3
+
+    # checkpoints are not used for circuits with callbacks
+    c = Circuit(3)
+    c.add(gates.RX(q, theta=0.1) for q in range(3))
+    c.add(gates.CallbackGate(callbacks.EntanglementEntropy([0])))
+    c.set_checkpoints([1, 2])
+    backend.execute_circuit(c)
+    assert len(c.checkpoints.states) == 0
+
+    with pytest.raises(ValueError):
+        c.set_checkpoints([0, 2])
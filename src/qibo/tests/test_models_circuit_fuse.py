@@ -72,6 +72,33 @@ def test_fusedgate_matrix_calculation(backend):
     backend.assert_allclose(fused_matrix, target_matrix)
 
 
+def test_fusedgate_matrix_controlled_by(backend):
+    queue = [
+        gates.H(0),
+        gates.RX(0, theta=0.1),
+        gates.H(2).controlled_by(0),
+        gates.RY(2, theta=0.2).controlled_by(0),
+        gates.CZ(1, 2),
+        gates.SWAP(0, 1),
+        gates.FSWAP(0, 1),
+        gates.U3(1, theta=0.1, phi=0.2, lam=0.3),
+    ]
+    fused_gate = gates.FusedGate(0, 1, 2)
+    for gate in queue:
+        fused_gate.append(gate)
+
+    # calculate the target matrix by applying the gates to basis states
+    target_matrix = np.zeros((8, 8), dtype=complex)
+    for i in range(8):
+        state = np.zeros(8, dtype=complex)
+        state[i] = 1
+        for gate in queue:
+            state = backend.to_numpy(backend.apply_gate(gate, state, 3))
+        target_matrix[:, i] = state
+    fused_matrix = fused_gate.asmatrix(backend)
+    backend.assert_allclose(fused_matrix, target_matrix, atol=1e-10)
+
+
 def test_fuse_circuit_two_qubit_gates(backend):
     """Check circuit fusion in circuit with two-qubit gates only."""
     c = Circuit(2)
@@ -187,3 +214,80 @@ def test_set_parameters_fusion(backend):
     c.set_parameters(4 * [0.4321])
     fused_c.set_parameters(4 * [0.4321])
     backend.assert_circuitclose(fused_c, c)
+
+
+def test_planner_cost_model():
+    from qibo.models.planner import ExecutionPlanner
+
+    planner = ExecutionPlanner()
+    cost = lambda gate: planner.cost(gate, 20)
+    assert cost(gates.Z(0)) < cost(gates.X(0)) < cost(gates.H(0))
+    assert cost(gates.CZ(0, 1)) < cost(gates.Z(0))
+    assert cost(gates.H(1).controlled_by(0)) < cost(gates.H(1))
+    assert cost(gates.CRX(0, 1, theta=0.1)) > cost(gates.H(1))
+    assert planner.cost(gates.H(0), 10, density_matrix=True) > cost(gates.H(0))
+    assert not planner.fusible(gates.CallbackGate(None))
+    assert not planner.fusible(gates.PauliNoiseChannel(0, px=0.1))
+    fgate = gates.FusedGate(0, 1)
+    fgate.append(gates.H(0))
+    fgate.append(gates.H(1))
+    assert cost(fgate) < cost(gates.H(0)) + cost(gates.H(1))
+    with pytest.raises(ValueError):
+        planner = ExecutionPlanner(max_qubits=0)
+
+
+@pytest.mark.parametrize("density_matrix", [False, True])
+def test_planner_execution(backend, density_matrix):
+    from qibo import callbacks
+    from qibo.models.planner import ExecutionPlanner
+
+    planner = ExecutionPlanner(max_qubits=3)
+    # make fusion favorable for small circuits
+    planner.MATRIX = 0
+    planner.OVERHEAD = 1e6
+
+    entropy = callbacks.EntanglementEntropy([0])
+    c = Circuit(4, density_matrix=density_matrix)
+    c.add(gates.H(i) for i in range(4))
+    c.add(gates.CNOT(0, 1))
+    c.add(gates.RY(2, theta=0.1).controlled_by(1))
+    c.add(gates.CallbackGate(entropy))
+    c.add(gates.CZ(2, 3))
+    c.add(gates.RX(3, theta=0.2))
+    if density_matrix:
+        c.add(gates.PauliNoiseChannel(1, px=0.1, pz=0.2))
+    c.add(gates.SWAP(0, 3))
+    c.add(gates.fSim(1, 2, theta=0.1, phi=0.2))
+
+    queue = c.plan(planner)
+    assert any(isinstance(gate, gates.FusedGate) for gate in queue)
+    assert len(queue) < len(c.queue)
+    target_state = backend.execute_circuit(c.copy(), return_array=True)
+    original_planner, backend.planner = backend.planner, planner
+    try:
+        final_state = backend.execute_circuit(c, return_array=True)
+    finally:
+        backend.planner = original_planner
+    backend.assert_allclose(final_state, target_state)
+
+
+def test_planner_cache():
+    from qibo.models.planner import ExecutionPlanner
+
+    planner = ExecutionPlanner()
+    planner.MATRIX = 0
+    c = Circuit(2)
+    c.add(gates.H(0))
+    c.add(gates.CNOT(0, 1))
+    queue = c.plan(planner)
+    assert len(queue) == 1
+    assert c.plan(planner) is queue
+    c.add(gates.H(1))
+    new_queue = c.plan(planner)
+    assert new_queue is not queue
+    assert len(new_queue) == 1
+    assert len(new_queue[0].gates) == 3
+    # a planner with different configuration creates a new plan
+    assert c.plan(ExecutionPlanner(max_qubits=1)) is not new_queue
+    # without fusion benefits the original queue is executed
+    assert c.plan(ExecutionPlanner()) is c.queue
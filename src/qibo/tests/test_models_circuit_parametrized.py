@@ -2,6 +2,7 @@
 """Test :meth:`qibo.models.circuit.Circuit.get_parameters` and :meth:`qibo.models.circuit.Circuit.set_parameters`."""
 import numpy as np
 import pytest
+import sympy
 
 import qibo
 from qibo import gates
@@ -211,6 +212,43 @@ def test_set_parameters_with_light_cone(backend, trainable):
     backend.assert_allclose(final_state, target_state)
 
 
+def test_set_parameters_with_flat_array(backend):
+    """Check that setting a flat array gives the same gates as a list."""
+
+    def circuit():
+        c = Circuit(3)
+        c.add(gates.RX(q, theta=0) for q in range(3))
+        c.add(gates.U3(q, theta=0, phi=0, lam=0) for q in range(3))
+        c.add(gates.CRX(0, 1, theta=0))
+        c.add(gates.RZ(2, theta=0).controlled_by(0))
+        c.add(gates.Unitary(np.eye(2), 1))
+        c.add(gates.fSim(0, 2, theta=0, phi=0))
+        c.add(gates.RY(1, theta=sympy.Symbol("x")))
+        c.add(gates.RZ(q, theta=0) for q in range(3))
+        return c
+
+    c = circuit()
+    target_c = circuit()
+    for _ in range(2):
+        params = np.random.random(c.trainable_gates.nparams)
+        c.set_parameters(params)
+        target_c.set_parameters(list(params))
+        for gate, target_gate in zip(c.queue, target_c.queue):
+            np.testing.assert_allclose(gate.parameters, target_gate.parameters)
+            matrix = gate.asmatrix(backend)
+            backend.assert_allclose(matrix, target_gate.asmatrix(backend))
+        backend.assert_circuitclose(c, target_c)
+    assert c.queue[1].cached_matrix is not None
+    assert c.queue[6].cached_matrix is None
+
+    # gates added after setting parameters
+    c = circuit()
+    c.set_parameters(np.random.random(c.trainable_gates.nparams))
+    c.add(gates.RY(0, theta=0))
+    c.set_parameters(np.random.random(c.trainable_gates.nparams))
+    assert c.queue[-1].cached_matrix is not None
+
+
 def test_variable_theta():
     """Check that parametrized gates accept `tf.Variable` parameters."""
     try:
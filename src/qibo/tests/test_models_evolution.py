@@ -5,6 +5,7 @@ from scipy.linalg import expm
 
 from qibo import callbacks, hamiltonians, models
 from qibo.config import raise_error
+from qibo.tests.utils import random_state
 
 
 def assert_states_equal(backend, state, target_state, atol=0):
@@ -54,7 +55,14 @@ def test_state_evolution_get_initial_state(backend):
 
 
 @pytest.mark.parametrize(
-    ("solver", "atol"), [("exp", 0), ("rk4", 1e-2), ("rk45", 1e-1)]
+    ("solver", "atol"),
+    [
+        ("exp", 0),
+        ("rk4", 1e-8),
+        ("rk45", 1e-8),
+        ("adaptive-rk45", 1e-6),
+        ("krylov", 1e-8),
+    ],
 )
 def test_state_evolution_constant_hamiltonian(backend, solver, atol):
     nsteps = 200
@@ -70,6 +78,24 @@ def test_state_evolution_constant_hamiltonian(backend, solver, atol):
     final_psi = evolution(final_time=1, initial_state=target_psi[0])
 
 
+@pytest.mark.parametrize("final_time", [0.05, 0.25, 0.3])
+def test_state_evolution_adaptive_final_time(backend, final_time):
+    """Check that adaptive steps end at final times that are not multiples of dt."""
+    ham = hamiltonians.TFIM(3, h=1.0, backend=backend)
+    initial_state = np.ones(8) / np.sqrt(8)
+    matrix = backend.to_numpy(ham.matrix)
+    target_state = expm(-1j * final_time * matrix) @ initial_state
+    checker = callbacks.Norm()
+    evolution = models.StateEvolution(
+        ham, dt=0.1, solver="adaptive-rk45", callbacks=[checker], tolerance=1e-10
+    )
+    assert evolution.solver.tolerance == 1e-10
+    final_state = evolution(final_time=final_time, initial_state=initial_state)
+    assert_states_equal(backend, final_state, target_state, atol=1e-8)
+    # callbacks are calculated at the initial time and the multiples of dt
+    assert len(checker.results) == 1 + int(round(final_time / 0.1, 6))
+
+
 @pytest.mark.parametrize("nqubits,dt", [(2, 1e-2)])
 def test_state_evolution_time_dependent_hamiltonian(backend, nqubits, dt):
     ham = lambda t: np.cos(t) * hamiltonians.Z(nqubits, backend=backend)
@@ -84,8 +110,25 @@ def test_state_evolution_time_dependent_hamiltonian(backend, nqubits, dt):
     final_psi = evolution(final_time=1, initial_state=np.copy(target_psi[0]))
 
 
+@pytest.mark.parametrize("dense", [True, False])
+@pytest.mark.parametrize("dt", [1e-1, 2.0])
+def test_state_evolution_krylov(backend, dense, dt):
+    nqubits = 5
+    ham = hamiltonians.TFIM(nqubits, h=1.0, dense=dense, backend=backend)
+    ham_matrix = backend.to_numpy(
+        hamiltonians.TFIM(nqubits, h=1.0, backend=backend).matrix
+    )
+    initial_state = random_state(nqubits)
+    target_psi = expm(-2j * ham_matrix) @ initial_state
+    evolution = models.StateEvolution(ham, dt, solver="krylov")
+    # large steps are split to substeps with ``max_dimension`` vectors
+    evolution.solver.max_dimension = 10
+    final_psi = evolution(final_time=2, initial_state=np.copy(initial_state))
+    assert_states_equal(backend, final_psi, target_psi, atol=1e-8)
+
+
 @pytest.mark.parametrize("nqubits", [5])
-@pytest.mark.parametrize("solver,dt,atol", [("exp", 1e-1, 1e-2), ("rk45", 1e-2, 1e-1)])
+@pytest.mark.parametrize("solver,dt,atol", [("exp", 1e-1, 1e-2), ("rk45", 1e-2, 1e-8)])
 def test_state_evolution_trotter_hamiltonian(
     backend, accelerators, nqubits, solver, dt, atol
 ):
@@ -202,6 +245,35 @@ def test_adiabatic_evolution_hamiltonian(backend, dense):
         backend.assert_allclose(matrix, ham(t, 2))
 
 
+@pytest.mark.parametrize("dense", [False, True])
+def test_adiabatic_hamiltonian_interpolation(backend, dense):
+    """Test that the adiabatic Hamiltonian is applied without forming its matrix."""
+    h0 = hamiltonians.X(3, dense=dense, backend=backend)
+    h1 = hamiltonians.TFIM(3, h=0.5, dense=dense, backend=backend)
+    adev = models.AdiabaticEvolution(h0, h1, lambda t: t**2, dt=1e-2)
+    adev.hamiltonian.total_time = 2
+    ham = adev.hamiltonian(0.5)
+    assert ham._hamiltonian is None
+    state = random_state(3)
+    m0 = backend.to_numpy(h0.matrix)
+    m1 = backend.to_numpy(h1.matrix)
+    target = (1 - 0.0625) * m0 + 0.0625 * m1
+    backend.assert_allclose(ham @ backend.cast(state), target @ state)
+    backend.assert_allclose(
+        ham.expectation(backend.cast(state)), np.real(np.vdot(state, target @ state))
+    )
+    assert ham._hamiltonian is None
+    # the interpolated Hamiltonian is cached for each time
+    assert adev.hamiltonian(0.5) is ham
+    matrix = ham.matrix if dense else ham.dense.matrix
+    backend.assert_allclose(matrix, target)
+    assert adev.hamiltonian(0.5)._hamiltonian is ham._hamiltonian
+    for t in np.linspace(0.1, 1.9, 20):
+        adev.hamiltonian(t)
+    assert len(adev.hamiltonian._cache) == adev.hamiltonian.CACHE_SIZE
+    assert adev.hamiltonian(0.5) is not ham
+
+
 @pytest.mark.parametrize("dt", [1e-1])
 def test_adiabatic_evolution_execute_exp(backend, dt):
     """Test adiabatic evolution with exponential solver."""
@@ -263,11 +335,46 @@ def test_adiabatic_evolution_execute_rk(backend, solver, dense, dt):
 
     checker = TimeStepChecker(target_psi, atol=dt)
     adev = models.AdiabaticEvolution(
-        h0, h1, lambda t: t, dt, solver="rk4", callbacks=[checker]
+        h0, h1, lambda t: t, dt, solver=solver, callbacks=[checker]
     )
     final_psi = adev(final_time=1, initial_state=np.copy(target_psi[0]))
 
 
+@pytest.mark.parametrize("solver,atol", [("rk4", 1e-7), ("rk45", 1e-9)])
+def test_adiabatic_evolution_rk_accuracy(backend, solver, atol):
+    """Compare Runge-Kutta solvers with a converged time dependent evolution."""
+    h0 = hamiltonians.X(3, backend=backend)
+    h1 = hamiltonians.TFIM(3, backend=backend)
+    adev = models.AdiabaticEvolution(
+        h0, h1, lambda t: t, 1e-1, solver="adaptive-rk45", tolerance=1e-12
+    )
+    target_psi = adev(final_time=1)
+    adev = models.AdiabaticEvolution(h0, h1, lambda t: t, 1e-2, solver=solver)
+    final_psi = adev(final_time=1)
+    assert_states_equal(backend, final_psi, target_psi, atol=atol)
+
+
+@pytest.mark.parametrize("dense", [False, True])
+def test_adiabatic_evolution_execute_adaptive_rk(backend, dense):
+    """Test adiabatic evolution with adaptive Runge-Kutta solver."""
+    h0 = hamiltonians.X(3, dense=dense, backend=backend)
+    h1 = hamiltonians.TFIM(3, dense=dense, backend=backend)
+    target, result = callbacks.Energy(h1), callbacks.Energy(h1)
+    # fixed small steps that are output every 0.1
+    adev = models.AdiabaticEvolution(
+        h0, h1, lambda t: t, 1e-2, solver="rk45", callbacks=[target]
+    )
+    target_psi = adev(final_time=1)
+    adev = models.AdiabaticEvolution(
+        h0, h1, lambda t: t, 1e-1, solver="adaptive-rk45", callbacks=[result]
+    )
+    final_psi = adev(final_time=1)
+    assert_states_equal(backend, final_psi, target_psi, atol=1e-6)
+    target = [backend.to_numpy(x) for x in target][::10]
+    result = [backend.to_numpy(x) for x in result]
+    backend.assert_allclose(result, target, atol=1e-6)
+
+
 def test_adiabatic_evolution_execute_errors(backend):
     h0 = hamiltonians.X(3, backend=backend)
     h1 = hamiltonians.TFIM(3, backend=backend)
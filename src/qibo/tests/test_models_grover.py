@@ -103,6 +103,21 @@ def test_grover_iterative(backend):
     assert solution == "11111"
 
 
+def test_grover_iteration_state(backend):
+    oracle = Circuit(5 + 1)
+    oracle.add(gates.X(5).controlled_by(*range(5)))
+    grover = Grover(oracle, superposition_qubits=5, check=None, iterative=True)
+    grover.MAX_CHECKPOINTS = 2
+    for iterations in [3, 1, 4, 0, 2]:
+        circuit = grover.initialize()
+        for _ in range(iterations):
+            circuit += grover.step()
+        target_state = backend.execute_circuit(circuit).state()
+        final_state = grover.iteration_state(iterations, backend)
+        backend.assert_allclose(final_state, target_state, atol=1e-10)
+        assert len(grover._checkpoints) <= 2
+
+
 @pytest.mark.parametrize("num_sol", [None, 1])
 def test_grover_execute(backend, num_sol):
     def check(result):
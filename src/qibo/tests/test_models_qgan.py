@@ -72,6 +72,77 @@ def test_custom_qgan():
     assert qgan.lr == 0.5
 
 
+def test_qgan_batched_fake_samples():
+    from qibo import hamiltonians
+
+    nqubits = 3
+    qgan = models.StyleQGAN(latent_dim=2, layers=1)
+    qgan.nqubits = nqubits
+    circuit = models.Circuit(nqubits)
+    for q in range(nqubits):
+        circuit.add([gates.RY(q, 0), gates.RZ(q, 0), gates.RY(q, 0), gates.RZ(q, 0)])
+    circuit.add(gates.CRY(q, (q + 1) % nqubits, 0) for q in range(nqubits))
+    circuit.add(gates.RY(q, 0) for q in range(nqubits))
+    # Z matrices on qubits in reverse order, as in ``StyleQGAN.fit``
+    basis = np.arange(2**nqubits)
+    hamiltonians_list = [
+        hamiltonians.Hamiltonian(
+            nqubits, np.diag(1 - 2 * ((basis >> q) & 1)), backend=qgan.backend
+        )
+        for q in range(nqubits)
+    ]
+    params = np.random.uniform(-0.15, 0.15, 10 * nqubits + 2 * nqubits)
+
+    np.random.seed(123)
+    batched, _ = qgan.generate_fake_samples(params, 5, circuit, hamiltonians_list)
+    # a custom parameter function forces the execution of one sample at a time
+    qgan.set_parameters = lambda *args: models.StyleQGAN.set_params(qgan, *args)
+    np.random.seed(123)
+    serial, _ = qgan.generate_fake_samples(params, 5, circuit, hamiltonians_list)
+    np.testing.assert_allclose(batched, serial, atol=1e-10)
+
+
+def test_qgan_batched_fake_samples_gradient():
+    import tensorflow as tf
+
+    from qibo import hamiltonians
+
+    nqubits = 2
+    qgan = models.StyleQGAN(latent_dim=2, layers=1)
+    qgan.nqubits = nqubits
+    circuit = models.Circuit(nqubits)
+    for q in range(nqubits):
+        circuit.add([gates.RY(q, 0), gates.RZ(q, 0), gates.RY(q, 0), gates.RZ(q, 0)])
+    circuit.add(gates.CRY(q, (q + 1) % nqubits, 0) for q in range(nqubits))
+    circuit.add(gates.RY(q, 0) for q in range(nqubits))
+    basis = np.arange(2**nqubits)
+    hamiltonians_list = [
+        hamiltonians.Hamiltonian(
+            nqubits, np.diag(1 - 2 * ((basis >> q) & 1)), backend=qgan.backend
+        )
+        for q in range(nqubits)
+    ]
+    params = tf.Variable(
+        np.random.uniform(-0.15, 0.15, 10 * nqubits + 2 * nqubits), dtype="float64"
+    )
+
+    def gradient():
+        np.random.seed(123)
+        with tf.GradientTape() as tape:
+            samples, _ = qgan.generate_fake_samples(
+                params, 4, circuit, hamiltonians_list
+            )
+            loss = tf.reduce_sum(samples**2)
+        return tape.gradient(loss, params)
+
+    batched = gradient()
+    assert batched is not None
+    # a custom parameter function forces the execution of one sample at a time
+    qgan.set_parameters = lambda *args: models.StyleQGAN.set_params(qgan, *args)
+    serial = gradient()
+    np.testing.assert_allclose(batched, serial, atol=1e-10)
+
+
 def test_qgan_errors():
     with pytest.raises(ValueError):
         qgan = models.StyleQGAN(latent_dim=2)
@@ -152,7 +152,7 @@ def test_qaoa_execution(backend, solver, dense, accel=None):
     state = random_state(6)
     # set absolute test tolerance according to solver
     if "rk" in solver:
-        atol = 1e-2
+        atol = 1e-6
     elif not dense:
         atol = 1e-5
     else:
@@ -174,6 +174,33 @@ def test_qaoa_execution(backend, solver, dense, accel=None):
     backend.assert_allclose(final_state, target_state, atol=atol)
 
 
+@pytest.mark.parametrize("solver", ["exp", "rk4"])
+@pytest.mark.parametrize("diagonal", [False, True])
+def test_qaoa_diagonal_execution(backend, solver, diagonal):
+    h = hamiltonians.MaxCut(5, backend=backend)
+    params = 0.01 * (1 - 2 * np.random.random(4))
+    state = random_state(5)
+    atol = 1e-6 if solver == "rk4" else 1e-7
+
+    target_state = np.copy(state)
+    h_matrix = backend.to_numpy(h.matrix)
+    m_matrix = backend.to_numpy(hamiltonians.X(5, backend=backend).matrix)
+    for i, p in enumerate(params):
+        matrix = m_matrix if i % 2 else h_matrix
+        target_state = expm(-1j * p * matrix) @ target_state
+
+    if diagonal:
+        h = hamiltonians.MaxCut(5, diagonal=True, backend=backend)
+    qaoa = models.QAOA(h, solver=solver)
+    if solver == "exp":
+        assert isinstance(
+            qaoa.ham_solver.current_hamiltonian, hamiltonians.DiagonalHamiltonian
+        )
+    qaoa.set_parameters(params)
+    final_state = qaoa(backend.cast(state, copy=True))
+    backend.assert_allclose(final_state, target_state, atol=atol)
+
+
 def test_qaoa_distributed_execution(backend, accelerators):
     test_qaoa_execution(backend, "exp", False, accelerators)
 
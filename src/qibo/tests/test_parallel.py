@@ -9,8 +9,14 @@ import pytest
 
 import qibo
 from qibo import gates
+from qibo.backends import NumpyBackend
 from qibo.models import QFT, Circuit
-from qibo.parallel import parallel_execution, parallel_parametrized_execution
+from qibo.parallel import (
+    ParallelExecutor,
+    parallel_execution,
+    parallel_parametrized_execution,
+)
+from qibo.tests.utils import random_state
 
 
 def test_parallel_circuit_evaluation(backend):
@@ -60,3 +66,108 @@ def test_parallel_parametrized_circuit(backend):
     r1 = [x.state(numpy=True) for x in r1]
     r2 = [x.state(numpy=True) for x in r2]
     backend.assert_allclose(r1, r2)
+
+
+@pytest.mark.parametrize("chunksize", [None, 1, 3])
+def test_parallel_executor(backend, chunksize):
+    """Execute circuit with the executor for parameters and initial states."""
+    nqubits = 4
+    c = Circuit(nqubits)
+    c.add(gates.RY(q, theta=0) for q in range(nqubits))
+    c.add(gates.CZ(q, q + 1) for q in range(nqubits - 1))
+    c.add(gates.RX(q, theta=0) for q in range(nqubits))
+
+    np.random.seed(0)
+    parameters = np.random.uniform(0, 2 * np.pi, (7, 2 * nqubits))
+    states = [random_state(nqubits) for _ in range(7)]
+    targets = []
+    for params, state in zip(parameters, states):
+        c.set_parameters(params)
+        targets.append(backend.execute_circuit(c, backend.cast(state)).state())
+
+    with ParallelExecutor(c, states[0], processes=2, backend=backend) as executor:
+        results = executor.map(parameters, states, chunksize=chunksize)
+        backend.assert_allclose(results, targets)
+        # executions with the given initial state
+        results = executor.map(parameters[:1], chunksize=chunksize)
+        backend.assert_allclose(results, targets[:1])
+        # executions with the parameters of the circuit sent to the workers
+        results = executor.imap(states=iter(states[:2]), chunksize=chunksize or 1)
+        targets = [
+            backend.execute_circuit(c, backend.cast(state)).state()
+            for state in states[:2]
+        ]
+        backend.assert_allclose(list(results), targets)
+        with pytest.raises(ValueError):
+            next(executor.imap(parameters, chunksize=0))
+
+
+class _CustomBackend(NumpyBackend):
+    """Backend that is not available in ``construct_backend``."""
+
+
+def _worker_backend():
+    from qibo.parallel import _WORKER
+
+    backend = _WORKER["backend"]
+    return type(backend), backend.precision, backend.planner.max_qubits
+
+
+def test_parallel_executor_backend():
+    """Check that workers use a copy of the given backend."""
+    backend = _CustomBackend()
+    backend.set_precision("single")
+    backend.planner.max_qubits = 1
+    c = Circuit(2)
+    c.add(gates.RY(q, theta=0) for q in range(2))
+    c.add(gates.CZ(0, 1))
+    parameters = np.random.uniform(0, 2 * np.pi, (3, 2))
+    targets = []
+    for params in parameters:
+        c.set_parameters(params)
+        targets.append(backend.execute_circuit(c).state())
+    with ParallelExecutor(c, processes=1, backend=backend) as executor:
+        results = executor.map(parameters)
+        info = executor.pool.submit(_worker_backend).result()
+    assert info == (_CustomBackend, "single", 1)
+    assert results[0].dtype == np.complex64
+    np.testing.assert_allclose(results, targets, atol=1e-6)
+
+
+def test_parallel_backend_settings():
+    """Check creating the backend from its settings when it cannot be pickled."""
+    from qibo.parallel import _load_backend
+
+    settings = {
+        "type": _CustomBackend,
+        "name": "numpy",
+        "platform": None,
+        "precision": "single",
+        "device": "/CPU:0",
+        "planner": None,
+    }
+    backend = _load_backend(settings)
+    assert isinstance(backend, _CustomBackend)
+    assert backend.dtype == "complex64"
+    # the default planner of the backend is kept
+    assert backend.planner is not None
+
+
+class _UnpicklableBackend:
+    """Backend with the settings of :class:`qibo.backends.abstract.Backend` only."""
+
+    name = "numpy"
+    platform = None
+    precision = "double"
+    device = "/CPU:0"
+
+    def __init__(self):
+        self.function = lambda x: x
+
+
+def test_parallel_backend_payload_without_planner():
+    from qibo.parallel import _backend_payload
+
+    payload = _backend_payload(_UnpicklableBackend())
+    assert payload["type"] is _UnpicklableBackend
+    assert payload["planner"] is None
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import numpy as np
 import pytest
 
 from qibo import gates
@@ -53,3 +54,49 @@ def test_state_representation_max_terms(backend, density_matrix):
             result.symbolic(max_terms=5)
             == "(0.17678+0j)|00000> + (0.17678+0j)|00001> + (0.17678+0j)|00010> + (0.17678+0j)|00011> + (0.17678+0j)|00100> + ..."
         )
+
+
+@pytest.mark.parametrize("density_matrix", [False, True])
+def test_state_probabilities_marginals(backend, density_matrix):
+    from qibo.tests.utils import random_density_matrix, random_state
+
+    nqubits = 5
+    if density_matrix:
+        state = random_density_matrix(nqubits)
+        full = np.real(np.diag(state))
+    else:
+        state = random_state(nqubits)
+        full = np.abs(state) ** 2
+    c = Circuit(nqubits, density_matrix=density_matrix)
+    result = backend.execute_circuit(c, initial_state=np.copy(state))
+    full = np.reshape(full, nqubits * (2,))
+    for qubits in [(1, 3, 4), (4, 1), (3,), (0, 2, 4), (2, 0), (4, 3, 2, 1, 0)]:
+        traced = tuple(q for q in range(nqubits) if q not in qubits)
+        target = np.sum(full, axis=traced)
+        target = np.transpose(target, np.argsort(np.argsort(qubits))).ravel()
+        backend.assert_allclose(result.probabilities(qubits), target)
+    # marginals are calculated from the smallest cached superset
+    assert set(result._marginals) == {
+        (0, 1, 2, 3, 4),
+        (1, 3, 4),
+        (1, 4),
+        (3,),
+        (0, 2, 4),
+        (0, 2),
+    }
+
+
+def test_default_marginal_probabilities(backend):
+    from qibo.backends.abstract import Backend
+
+    probabilities = np.random.random(32)
+    probabilities = backend.cast(probabilities / np.sum(probabilities), dtype="float64")
+    qubits = (3, 0, 4, 1, 2)
+    for marginal_qubits in [(4, 1), (0,), (2, 3, 0)]:
+        target = backend.calculate_marginal_probabilities(
+            probabilities, qubits, marginal_qubits
+        )
+        result = Backend.calculate_marginal_probabilities(
+            backend, probabilities, qubits, marginal_qubits
+        )
+        backend.assert_allclose(result, target)